@@ -15,8 +15,6 @@ from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserResponse, GoogleAuthData, LoginResponse
 from datetime import datetime
 import functools
-import cv2
-from app.core.pose_detection import PoseDetector
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -156,37 +154,3 @@ def admin_required():
             return fn(*args, **kwargs)
         return wrapper
     return decorator
-
-def process_video(video_path):
-    cap = cv2.VideoCapture(video_path)
-    pose_detector = PoseDetector()
-
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        # Convert the frame to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Detect landmarks
-        landmarks = pose_detector.detect_landmarks(rgb_frame)
-
-        # Validate form (assuming you have a method to validate form)
-        feedback = pose_detector.validate_form(landmarks, "squat")  # or "plank"
-
-        # Display feedback on the frame
-        cv2.putText(frame, feedback["feedback"][0], (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-
-        # Display the frame
-        cv2.imshow('Pose Detection', frame)
-
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
-
-    cap.release()
-    cv2.destroyAllWindows()
-
-# Example usage
-video_path = 'path/to/your/video.mp4'
-process_video(video_path) 
\ No newline at end of file
@@ -1,19 +1,44 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
-import cv2
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, decode_token, get_unverified_jwt_headers
+from flask_jwt_extended.exceptions import UserLookupError
+from flask_jwt_extended.internal_utils import (custom_verification_for_token, has_user_lookup,
+                                              user_lookup, verify_token_not_blocklisted,
+                                              verify_token_type)
+from flask_sock import Sock
 import numpy as np
 import mediapipe as mp
-from app.models.pose_detection import ExerciseFormChecker
-import base64
+from app.core.detector_pool import PoseDetectorPool
+from app.core.landmarks import LandmarkView, landmarks_to_dicts
+from app.core.pose_detection import PoseDetector
+from app.core.pose_session import PoseSession
+from app.core.video_analysis import analyze_video, open_video
+from app.config import Config
+from app.utils.image_decoding import get_request_frame
+from app.utils.feedback_delta import with_feedback_delta
+from app.utils.landmark_encoding import landmark_response
+from app.utils.upload_limits import upload_limit
+import json
+import os
+import shutil
+import tempfile
 
 pose_bp = Blueprint('pose', __name__)
-form_checker = ExerciseFormChecker()
+sock = Sock()
 
-# Initialize MediaPipe Pose
+# Pool of MediaPipe Pose graphs, one per concurrently served request
+# Pooled graphs run side by side on the same cores, so their wall time would measure
+# contention rather than the model: they keep their tier instead of a latency budget
 mp_pose = mp.solutions.pose
-pose = mp_pose.Pose(
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
+pose_detector_pool = PoseDetectorPool(
+    size=Config.POSE_DETECTOR_POOL_SIZE,
+    timeout=Config.POSE_DETECTOR_POOL_TIMEOUT,
+    detector_kwargs={
+        'static_image_mode': True,
+        'min_detection_confidence': Config.MIN_DETECTION_CONFIDENCE,
+        'min_tracking_confidence': Config.MIN_TRACKING_CONFIDENCE,
+        # This blueprint has always run MediaPipe's default model
+        'fallback_tier': 'full'
+    }
 )
 
 def calculate_angle(a, b, c):
@@ -98,61 +123,54 @@ def check_plank_form(landmarks):
 @jwt_required()
 def analyze_pose():
     try:
-        data = request.get_json()
-        exercise_type = data.get('exercise_type')
-        image_data = data.get('image')  # Base64 encoded image
+        # Raw image body (exercise_type in the query string) or JSON with a base64 image
+        try:
+            exercise_type, frame = get_request_frame()
+        except ValueError as e:
+            # An upload that is not a decodable image is the client's mistake
+            return jsonify({
+                'error': str(e)
+            }), 400
         
-        if not image_data or not exercise_type:
+        if frame is None or not exercise_type:
             return jsonify({
                 'error': 'Missing image or exercise type'
             }), 400
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
-        
-        # Convert bytes to numpy array
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Process the frame
-        results = pose.process(rgb_frame)
-        
-        if not results.pose_landmarks:
-            return jsonify({
+        # Process the frame (the detector converts BGR to RGB)
+        try:
+            with pose_detector_pool.detector() as detector:
+                landmarks = detector.detect_landmarks(frame)
+        except ValueError:
+            return landmark_response(with_feedback_delta({
                 'feedback': ['No pose detected. Please make sure your full body is visible.'],
                 'is_correct': False
-            })
-        
-        # Convert landmarks to list for JSON serialization
-        landmarks = []
-        for landmark in results.pose_landmarks.landmark:
-            landmarks.append({
-                'x': landmark.x,
-                'y': landmark.y,
-                'z': landmark.z,
-                'visibility': landmark.visibility
-            })
+            }))
         
         # Check form based on exercise type
+        landmark_view = LandmarkView(landmarks)
         if exercise_type == 'squat':
-            feedback, incorrect_points, is_correct = check_squat_form(results.pose_landmarks.landmark)
+            feedback, incorrect_points, is_correct = check_squat_form(landmark_view)
         elif exercise_type == 'plank':
-            feedback, incorrect_points, is_correct = check_plank_form(results.pose_landmarks.landmark)
+            feedback, incorrect_points, is_correct = check_plank_form(landmark_view)
         else:
             feedback = ['Unsupported exercise type']
             incorrect_points = []
             is_correct = False
         
-        return jsonify({
+        # JSON by default, packed binary or MessagePack on request via Accept;
+        # only feedback changes when the client names a session
+        return landmark_response(with_feedback_delta({
             'landmarks': landmarks,
             'feedback': feedback,
             'incorrect_points': incorrect_points,
             'is_correct': is_correct
-        })
+        }))
         
+    except TimeoutError as e:
+        return jsonify({
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'error': str(e)
@@ -171,31 +189,24 @@ def get_form_feedback():
                 'error': 'Missing landmarks or exercise type'
             }), 400
         
-        # Convert landmarks back to MediaPipe format
-        mp_landmarks = []
-        for landmark in landmarks:
-            mp_landmark = mp.framework.formats.landmark_pb2.NormalizedLandmark()
-            mp_landmark.x = landmark['x']
-            mp_landmark.y = landmark['y']
-            mp_landmark.z = landmark['z']
-            mp_landmark.visibility = landmark['visibility']
-            mp_landmarks.append(mp_landmark)
+        # Wrap the posted landmarks in an attribute-style view over one array
+        landmark_view = LandmarkView(landmarks)
         
         # Check form based on exercise type
         if exercise_type == 'squat':
-            feedback, incorrect_points, is_correct = check_squat_form(mp_landmarks)
+            feedback, incorrect_points, is_correct = check_squat_form(landmark_view)
         elif exercise_type == 'plank':
-            feedback, incorrect_points, is_correct = check_plank_form(mp_landmarks)
+            feedback, incorrect_points, is_correct = check_plank_form(landmark_view)
         else:
             feedback = ['Unsupported exercise type']
             incorrect_points = []
             is_correct = False
         
-        return jsonify({
+        return jsonify(with_feedback_delta({
             'feedback': feedback,
             'incorrect_points': incorrect_points,
             'is_correct': is_correct
-        })
+        }))
         
     except Exception as e:
         return jsonify({
@@ -206,41 +217,185 @@ def get_form_feedback():
 @jwt_required()
 def calibrate_pose():
     try:
-        data = request.get_json()
-        exercise_type = data.get('exercise_type')
-        image_data = data.get('image')
+        # Raw image body (exercise_type in the query string) or JSON with a base64 image
+        try:
+            exercise_type, frame = get_request_frame()
+        except ValueError as e:
+            # An upload that is not a decodable image is the client's mistake
+            return jsonify({
+                'error': str(e)
+            }), 400
         
-        if not image_data or not exercise_type:
+        if frame is None or not exercise_type:
             return jsonify({
                 'error': 'Missing image or exercise type'
             }), 400
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
-        
-        # Convert bytes to numpy array
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Process the frame
-        results = pose.process(rgb_frame)
-        
-        if not results.pose_landmarks:
+        # Process the frame (the detector converts BGR to RGB)
+        try:
+            with pose_detector_pool.detector() as detector:
+                landmarks = detector.detect_landmarks(frame)
+        except ValueError:
             return jsonify({
                 'error': 'No pose detected. Please make sure your full body is visible.'
             }), 400
         
         # Store calibration data
-        form_checker.store_calibration(exercise_type, results.pose_landmarks.landmark)
+        pose_detector_pool.store_calibration(exercise_type, landmarks)
         
         return jsonify({
             'message': 'Calibration successful'
         })
         
+    except TimeoutError as e:
+        return jsonify({
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'error': str(e)
-        }), 500 
\ No newline at end of file
+        }), 500
+
+def _spool_video_upload():
+    """Copy an uploaded video to a temporary file in fixed-size chunks.
+
+    Accepts a multipart upload in the ``video`` field or a raw request body
+    (including chunked transfer encoding), so the whole video never has to be
+    held in memory. Returns the temporary file path.
+    """
+    if request.files:
+        source = request.files.get('video')
+        if source is None:
+            raise ValueError("Missing video file")
+        source = source.stream
+    else:
+        source = request.stream
+
+    upload = tempfile.NamedTemporaryFile(suffix='.mp4', delete=False)
+    try:
+        with upload:
+            shutil.copyfileobj(source, upload, Config.VIDEO_UPLOAD_CHUNK_SIZE)
+        if os.path.getsize(upload.name) == 0:
+            raise ValueError("Missing video file")
+    except Exception:
+        os.remove(upload.name)
+        raise
+    return upload.name
+
+@pose_bp.route('/analyze/video', methods=['POST'])
+@upload_limit('VIDEO_MAX_UPLOAD_BYTES')
+@jwt_required()
+def analyze_video_stream():
+    """Analyze an uploaded video and stream NDJSON feedback, one line per frame."""
+    exercise_type = request.args.get('exercise_type') or request.form.get('exercise_type')
+    if not exercise_type:
+        return jsonify({
+            'error': 'Missing exercise type'
+        }), 400
+
+    try:
+        video_path = _spool_video_upload()
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+
+    try:
+        cap = open_video(video_path)
+    except ValueError:
+        os.remove(video_path)
+        return jsonify({
+            'error': 'Could not decode video'
+        }), 400
+
+    def generate():
+        # Dedicated tracking-mode graph so consecutive frames reuse the pose ROI
+        pose_detector = PoseDetector(
+            static_image_mode=False,
+            min_detection_confidence=Config.MIN_DETECTION_CONFIDENCE,
+            min_tracking_confidence=Config.MIN_TRACKING_CONFIDENCE,
+            use_roi=Config.POSE_ROI_CROP
+        )
+        try:
+            for result in analyze_video(cap, exercise_type, pose_detector):
+                if 'landmarks' in result:
+                    result['landmarks'] = landmarks_to_dicts(result['landmarks'])
+                yield json.dumps(result) + '\n'
+        finally:
+            pose_detector.close()
+
+    def cleanup():
+        cap.release()
+        os.remove(video_path)
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    # Also runs when the client goes away before the first chunk, when the
+    # generator never started and so never reaches its finally
+    response.call_on_close(cleanup)
+    return response
+
+def authenticate_session_token(token):
+    """Decode a WebSocket session token with the checks ``@jwt_required()`` runs.
+
+    Only access tokens are accepted, and the app's blocklist, custom claim
+    and user lookup callbacks apply, so a session is never easier to open
+    than a REST call. Raises on any failure; returns the decoded token.
+    """
+    decoded = decode_token(token)
+    header = get_unverified_jwt_headers(token)
+    verify_token_type(decoded, refresh=False)
+    verify_token_not_blocklisted(header, decoded)
+    custom_verification_for_token(header, decoded)
+    if has_user_lookup() and user_lookup(header, decoded) is None:
+        raise UserLookupError("User not found", header, decoded)
+    return decoded
+
+@sock.route('/session', bp=pose_bp)
+def pose_session(ws):
+    """Live pose feedback over a persistent WebSocket connection.
+
+    The client authenticates once with a JSON text message
+    ``{"token": "<JWT>", "exercise_type": "squat"}``, then sends each camera
+    frame as a binary JPEG message and receives one JSON result per frame.
+    With ``"feedback_deltas": true`` in the first message, results carry a
+    ``feedback_delta`` of added/removed messages instead of the full lists.
+    A later text message ``{"exercise_type": "plank"}`` switches exercise and
+    ``{"reset_reps": true}`` starts a new set. Squat results carry the
+    server-side ``reps``, ``rep_phase`` and ``rep_completed``.
+    """
+    try:
+        hello = json.loads(ws.receive(timeout=Config.POSE_SESSION_AUTH_TIMEOUT) or '{}')
+        authenticate_session_token(hello['token'])
+    except Exception:
+        ws.close(reason=1008, message='Authentication failed')
+        return
+
+    session = PoseSession(
+        exercise_type=hello.get('exercise_type', 'squat'),
+        min_detection_confidence=Config.MIN_DETECTION_CONFIDENCE,
+        min_tracking_confidence=Config.MIN_TRACKING_CONFIDENCE,
+        use_roi=Config.POSE_ROI_CROP,
+        latency_budget_ms=Config.POSE_LATENCY_BUDGET_MS,
+        smooth_landmarks=Config.LANDMARK_SMOOTHING,
+        feedback_deltas=bool(hello.get('feedback_deltas'))
+    )
+    try:
+        ws.send(json.dumps({'type': 'ready', 'exercise_type': session.exercise_type}))
+        while True:
+            message = ws.receive()
+            if isinstance(message, bytes):
+                ws.send(json.dumps(session.process_jpeg(message)))
+                continue
+
+            try:
+                control = json.loads(message)
+            except ValueError:
+                ws.send(json.dumps({'type': 'error', 'error': 'Invalid control message'}))
+                continue
+            if control.get('reset_reps'):
+                session.reset_reps()
+            if 'exercise_type' in control or control.get('reset_reps'):
+                session.set_exercise(control.get('exercise_type', session.exercise_type))
+                ws.send(json.dumps({'type': 'ready', 'exercise_type': session.exercise_type}))
+    finally:
+        session.close()
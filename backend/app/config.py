@@ -43,11 +43,73 @@ class Config:
     MEDIAPIPE_MODEL_PATH = os.getenv('MEDIAPIPE_MODEL_PATH', 'models/pose_landmarker.task')
     MIN_DETECTION_CONFIDENCE = 0.5
     MIN_TRACKING_CONFIDENCE = 0.5
+    # Pose model tier: lite, full, heavy, or auto to benchmark POSE_BENCHMARK_IMAGE
+    # (a photo of a person) at startup and pick the heaviest tier within the budget;
+    # auto without a benchmark image keeps each detector's previous model: heavy
+    # for app/core and app/routes, full for app/api and app/models. Live detectors (camera
+    # tracking and WebSocket sessions) also step down a tier at runtime when their
+    # p95 exceeds the budget, and back up when it has room again.
+    POSE_MODEL_TIER = os.getenv('POSE_MODEL_TIER', 'auto')
+    POSE_LATENCY_BUDGET_MS = float(os.getenv('POSE_LATENCY_BUDGET_MS', '50'))
+    POSE_BENCHMARK_IMAGE = os.getenv('POSE_BENCHMARK_IMAGE')
+    # One MediaPipe graph per concurrently served request; defaults to one per core
+    POSE_DETECTOR_POOL_SIZE = int(os.getenv('POSE_DETECTOR_POOL_SIZE', os.cpu_count() or 1))
+    POSE_DETECTOR_POOL_TIMEOUT = float(os.getenv('POSE_DETECTOR_POOL_TIMEOUT', '5'))
+    # Precision of landmarks in binary (non-JSON) /analyze responses: float16 or float32
+    LANDMARK_BINARY_DTYPE = os.getenv('LANDMARK_BINARY_DTYPE', 'float16')
+    # Live tracking: consecutive frames allowed to reuse extrapolated landmarks,
+    # and the body speed (normalized image units per second) below which they may
+    TRACKING_MAX_SKIP_FRAMES = int(os.getenv('TRACKING_MAX_SKIP_FRAMES', '2'))
+    TRACKING_MOTION_THRESHOLD = float(os.getenv('TRACKING_MOTION_THRESHOLD', '0.1'))
+    # One-Euro landmark smoothing for live tracking and sessions: cutoff (Hz) for a
+    # still joint, and how fast the cutoff rises with speed (per normalized unit/s)
+    LANDMARK_SMOOTHING = os.getenv('LANDMARK_SMOOTHING', 'true').lower() == 'true'
+    LANDMARK_SMOOTHING_MIN_CUTOFF = float(os.getenv('LANDMARK_SMOOTHING_MIN_CUTOFF', '1.0'))
+    LANDMARK_SMOOTHING_BETA = float(os.getenv('LANDMARK_SMOOTHING_BETA', '10.0'))
+    # Feedback deltas: how long a message must persist (or be gone) before it is
+    # pushed, and how many HTTP feedback sessions (session_id) are kept for how long
+    FEEDBACK_MIN_DWELL_MS = float(os.getenv('FEEDBACK_MIN_DWELL_MS', '300'))
+    FEEDBACK_MAX_SESSIONS = int(os.getenv('FEEDBACK_MAX_SESSIONS', '1000'))
+    FEEDBACK_SESSION_TTL = float(os.getenv('FEEDBACK_SESSION_TTL', '300'))
+    # Rep counting: consecutive frames a joint angle must stay past a threshold to count
+    REP_DEBOUNCE_FRAMES = int(os.getenv('REP_DEBOUNCE_FRAMES', '2'))
+    # Crop live and video frames to the previously tracked person before inference
+    POSE_ROI_CROP = os.getenv('POSE_ROI_CROP', 'true').lower() == 'true'
+
+    # Live camera capture: a device index, video file or stream URL (e.g. rtsp://...),
+    # and what to request from the device. MJPG lets USB cameras deliver 720p at 30 FPS
+    # where raw YUYV cannot; a one-frame driver buffer keeps frames from going stale.
+    CAMERA_SOURCE = os.getenv('CAMERA_SOURCE', '0')
+    CAMERA_BACKEND = os.getenv('CAMERA_BACKEND', 'any')  # any, v4l2, dshow, msmf, avfoundation, gstreamer, ffmpeg
+    CAMERA_WIDTH = int(os.getenv('CAMERA_WIDTH', '1280'))
+    CAMERA_HEIGHT = int(os.getenv('CAMERA_HEIGHT', '720'))
+    CAMERA_FPS = float(os.getenv('CAMERA_FPS', '30'))
+    CAMERA_FOURCC = os.getenv('CAMERA_FOURCC', 'MJPG')
+    CAMERA_BUFFER_SIZE = int(os.getenv('CAMERA_BUFFER_SIZE', '1'))
+    # Decode files and streams on the GPU/media engine where OpenCV supports it
+    CAMERA_HW_ACCELERATION = os.getenv('CAMERA_HW_ACCELERATION', 'true').lower() == 'true'
     
     # File Upload
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    # Video uploads to /api/pose/analyze/video are spooled to disk, so they get their own limit
+    VIDEO_MAX_UPLOAD_BYTES = int(os.getenv('VIDEO_MAX_UPLOAD_BYTES', str(1024 * 1024 * 1024)))
+    VIDEO_UPLOAD_CHUNK_SIZE = 64 * 1024  # bytes copied per read when spooling video uploads
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
     
+    # WebSocket pose sessions
+    SOCK_SERVER_OPTIONS = {'ping_interval': 25, 'max_message_size': 2 * 1024 * 1024}
+    POSE_SESSION_AUTH_TIMEOUT = 10  # seconds to wait for the authentication message
+    
+    # Exercise classifier: versioned weights plus manifest.json (see scripts/register_model.py)
+    MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR',
+                                   os.path.join(os.path.dirname(os.path.dirname(__file__)), 'model_registry'))
+    # Landmark-sequence classifier behind identify_exercise (see scripts/train_exercise_classifier.py);
+    # without the file, exercises are identified with angle thresholds
+    EXERCISE_CLASSIFIER_PATH = os.getenv('EXERCISE_CLASSIFIER_PATH',
+                                         os.path.join(MODEL_REGISTRY_DIR, 'exercise_sequence_classifier.npz'))
+    EXERCISE_WINDOW_FRAMES = int(os.getenv('EXERCISE_WINDOW_FRAMES', '30'))
+    EXERCISE_MIN_CONFIDENCE = float(os.getenv('EXERCISE_MIN_CONFIDENCE', '0.6'))
+    
     @staticmethod
     def init_app(app):
         # Create upload folder if it doesn't exist
@@ -0,0 +1,152 @@
+import threading
+import cv2
+from app.config import Config
+
+BACKENDS = {
+    'any': cv2.CAP_ANY,
+    'v4l2': cv2.CAP_V4L2,
+    'dshow': cv2.CAP_DSHOW,
+    'msmf': cv2.CAP_MSMF,
+    'avfoundation': cv2.CAP_AVFOUNDATION,
+    'gstreamer': cv2.CAP_GSTREAMER,
+    'ffmpeg': cv2.CAP_FFMPEG,
+}
+
+STREAM_PREFIXES = ('rtsp://', 'rtmp://', 'http://', 'https://', 'udp://', 'tcp://')
+
+def parse_source(source):
+    """A camera index for digit strings such as '0', the path or URL unchanged otherwise."""
+    if isinstance(source, str) and source.strip().isdigit():
+        return int(source)
+    return source
+
+def is_stream(source):
+    return isinstance(source, str) and source.lower().startswith(STREAM_PREFIXES)
+
+class CameraCapture:
+    """``cv2.VideoCapture`` configured from Config, optionally read on a grab thread.
+
+    ``source`` is a device index, a video file or a stream URL (default
+    Config.CAMERA_SOURCE). Devices are asked for the configured FOURCC,
+    resolution, FPS and driver buffer size; the driver may pick something
+    else, see ``settings()``. Files and streams are opened with hardware
+    decoding when Config.CAMERA_HW_ACCELERATION is on.
+
+    When ``threaded`` (the default for devices and streams), a background
+    thread grabs frames as fast as the source delivers them and keeps only
+    the newest, so ``read`` never returns a stale buffered frame; frames
+    replaced before they were read are counted in ``dropped``. Files default
+    to unthreaded reads, which return every frame in order.
+    """
+
+    def __init__(self, source=None, width=None, height=None, fps=None, fourcc=None,
+                 buffer_size=None, backend=None, threaded=None):
+        self.source = parse_source(Config.CAMERA_SOURCE if source is None else source)
+        backend = (backend or Config.CAMERA_BACKEND).lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown camera backend: {backend}")
+        is_device = isinstance(self.source, int)
+        buffer_size = Config.CAMERA_BUFFER_SIZE if buffer_size is None else buffer_size
+
+        if is_device:
+            self._cap = cv2.VideoCapture(self.source, BACKENDS[backend])
+            # FOURCC first: the resolutions and rates a camera offers depend on the format
+            fourcc = Config.CAMERA_FOURCC if fourcc is None else fourcc
+            if fourcc:
+                self._cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            for prop, value in ((cv2.CAP_PROP_FRAME_WIDTH, width or Config.CAMERA_WIDTH),
+                                (cv2.CAP_PROP_FRAME_HEIGHT, height or Config.CAMERA_HEIGHT),
+                                (cv2.CAP_PROP_FPS, fps or Config.CAMERA_FPS),
+                                (cv2.CAP_PROP_BUFFERSIZE, buffer_size)):
+                if value:
+                    self._cap.set(prop, value)
+        else:
+            params = []
+            if Config.CAMERA_HW_ACCELERATION:
+                params = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            self._cap = cv2.VideoCapture(self.source, BACKENDS[backend], params)
+            if is_stream(self.source) and buffer_size:
+                self._cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+        if not self._cap.isOpened():
+            self._cap.release()
+            raise ValueError(f"Could not open camera source: {self.source}")
+
+        self.threaded = (is_device or is_stream(self.source)) if threaded is None else threaded
+        self.dropped = 0
+        self._frame = None
+        self._sequence = 0  # Frames grabbed so far
+        self._returned = 0  # Sequence number of the last frame read
+        self._finished = False
+        self._condition = threading.Condition()
+        self._thread = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._grab_loop, name='camera-grab', daemon=True)
+            self._thread.start()
+
+    def _grab_loop(self):
+        while not self._finished:
+            ret, frame = self._cap.read()
+            with self._condition:
+                if not ret:
+                    self._finished = True
+                else:
+                    if self._sequence > self._returned:
+                        self.dropped += 1
+                    self._frame = frame
+                    self._sequence += 1
+                self._condition.notify_all()
+
+    def read(self):
+        """Return ``(ok, frame)`` like ``cv2.VideoCapture.read``.
+
+        Threaded, this waits for a frame newer than the last one returned,
+        however long the source stalls, and gives ``(False, None)`` only once
+        the source has ended or the capture was released.
+        """
+        if not self.threaded:
+            return self._cap.read()
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence > self._returned or self._finished)
+            if self._sequence == self._returned:
+                return False, None
+            self._returned = self._sequence
+            return True, self._frame
+
+    def isOpened(self):
+        return self._cap.isOpened() and not (self.threaded and self._finished and
+                                             self._sequence == self._returned)
+
+    def get(self, prop):
+        return self._cap.get(prop)
+
+    def settings(self):
+        """The format the source actually delivers, which may differ from the one asked for."""
+        fourcc = int(self._cap.get(cv2.CAP_PROP_FOURCC))
+        return {
+            'source': self.source,
+            'backend': self._cap.getBackendName(),
+            'width': int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self._cap.get(cv2.CAP_PROP_FPS),
+            'fourcc': ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00'),
+            'buffer_size': int(self._cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+            'hw_acceleration': int(self._cap.get(cv2.CAP_PROP_HW_ACCELERATION)),
+            'threaded': self.threaded,
+        }
+
+    def release(self):
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            # A grab stuck on a stalled source must not hold up shutdown;
+            # releasing the capture makes that read return
+            self._thread.join(timeout=1.0)
+        self._cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,95 @@
+import queue
+import threading
+from contextlib import contextmanager
+from .pose_detection import PoseDetector
+
+class PoseDetectorPool:
+    """Bounded pool of PoseDetector instances shared by request handlers.
+
+    A MediaPipe graph is stateful and must not be used by two threads at once,
+    so each request checks a detector out, uses it exclusively and checks it
+    back in. Detectors are created lazily up to ``size`` and warmed up before
+    they are handed out for the first time.
+    """
+
+    def __init__(self, size, timeout=None, detector_kwargs=None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.timeout = timeout
+        # Independent HTTP requests must not inherit each other's tracking ROI
+        self.detector_kwargs = detector_kwargs or {'static_image_mode': True}
+        # Calibration is per exercise, not per graph, so all detectors share it
+        self.calibration_data = {}
+        self._available = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create_detector(self):
+        """Create and warm up a new detector."""
+        detector = PoseDetector(**self.detector_kwargs)
+        detector.calibration_data = self.calibration_data
+        detector.warmup()
+        return detector
+
+    def checkout(self, timeout=None):
+        """Take a detector from the pool, creating one if the pool is not full yet."""
+        try:
+            return self._available.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self._create_detector()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._available.get(timeout=timeout if timeout is not None else self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No pose detector available, try again later")
+
+    def checkin(self, detector):
+        """Return a detector to the pool."""
+        self._available.put_nowait(detector)
+
+    @contextmanager
+    def detector(self, timeout=None):
+        """Check out a detector for the duration of a ``with`` block."""
+        detector = self.checkout(timeout)
+        try:
+            yield detector
+        finally:
+            self.checkin(detector)
+
+    def warmup(self):
+        """Eagerly create and warm up every detector in the pool."""
+        detectors = [self.checkout() for _ in range(self.size)]
+        for detector in detectors:
+            self.checkin(detector)
+
+    def store_calibration(self, exercise_type, landmarks):
+        """Store calibration data shared by all detectors in the pool."""
+        self.calibration_data[exercise_type] = landmarks
+
+    def get_calibration(self, exercise_type):
+        """Get calibration data for an exercise."""
+        return self.calibration_data.get(exercise_type)
+
+    def close(self):
+        """Release every idle detector in the pool."""
+        while True:
+            try:
+                detector = self._available.get_nowait()
+            except queue.Empty:
+                break
+            detector.close()
+            with self._lock:
+                self._created -= 1
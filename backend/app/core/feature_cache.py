@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+from .landmarks import as_landmark_array
+from .joint_angles import compute_joint_angles, angles_to_dict
+
+class FrameFeatureCache:
+    """Per-frame cache of features derived from a landmark array.
+
+    Entries are keyed on the raw bytes of the (33, 4) landmark buffer, so two
+    consumers looking at the same frame (e.g. identify_exercise followed by
+    validate_form) share one computation, and a reused or mutated buffer can
+    never return stale features. Only the most recent ``maxsize`` frames are
+    kept. Returned values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, landmarks, feature, compute):
+        """Return ``feature`` for this frame, computing it with ``compute(landmarks)`` on a miss."""
+        landmarks = as_landmark_array(landmarks)
+        key = (landmarks.shape, landmarks.tobytes())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if feature in entry:
+                    return entry[feature]
+
+        value = compute(landmarks)
+
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry[feature] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def angles(self, landmarks):
+        """Return every joint angle for the frame as {name: degrees}."""
+        return self.get(landmarks, 'angles',
+                        lambda array: angles_to_dict(compute_joint_angles(array)))
+
+    def clear(self):
+        """Drop all cached frames."""
+        with self._lock:
+            self._entries.clear()
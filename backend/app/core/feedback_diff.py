@@ -0,0 +1,97 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from app.config import Config
+
+def feedback_id(message):
+    """Stable ID of a feedback message: 'Try going lower' -> 'try-going-lower'."""
+    return re.sub(r'[^a-z0-9]+', '-', message.lower()).strip('-')
+
+class FeedbackDiffer:
+    """Turn per-frame feedback lists into changes with stable IDs.
+
+    A message is emitted as added once it has been present for
+    ``min_dwell_ms`` (default Config.FEEDBACK_MIN_DWELL_MS), and as removed
+    once it has been absent as long, so a message that flickers for a frame
+    or two is never sent. ``incorrect_points`` are only sent along with a
+    change, since they describe the active messages.
+    """
+
+    def __init__(self, min_dwell_ms=None):
+        self.min_dwell = (Config.FEEDBACK_MIN_DWELL_MS if min_dwell_ms is None else min_dwell_ms) / 1000
+        self.reset()
+
+    def reset(self):
+        self.active = OrderedDict()  # id -> message, as last emitted
+        self._appeared = {}  # id -> time first seen, for messages not yet emitted
+        self._vanished = {}  # id -> time last missing, for emitted messages not yet removed
+
+    def messages(self):
+        """The currently emitted messages, in the order they were added."""
+        return list(self.active.values())
+
+    def update(self, feedback, incorrect_points=(), timestamp=None):
+        """Feed one frame's feedback and return ``{'changed', 'added', 'removed'[, 'incorrect_points']}``."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        current = OrderedDict((feedback_id(message), message) for message in feedback)
+
+        added = []
+        for message_id, message in current.items():
+            self._vanished.pop(message_id, None)
+            if message_id in self.active:
+                continue
+            first_seen = self._appeared.setdefault(message_id, timestamp)
+            if timestamp - first_seen >= self.min_dwell:
+                del self._appeared[message_id]
+                self.active[message_id] = message
+                added.append({'id': message_id, 'message': message})
+        for message_id in list(self._appeared):
+            if message_id not in current:
+                del self._appeared[message_id]
+
+        removed = []
+        for message_id in list(self.active):
+            if message_id in current:
+                continue
+            last_seen = self._vanished.setdefault(message_id, timestamp)
+            if timestamp - last_seen >= self.min_dwell:
+                del self._vanished[message_id]
+                del self.active[message_id]
+                removed.append(message_id)
+
+        delta = {'changed': bool(added or removed), 'added': added, 'removed': removed}
+        if delta['changed']:
+            delta['incorrect_points'] = list(incorrect_points)
+        return delta
+
+class FeedbackSessionStore:
+    """FeedbackDiffers for stateless HTTP clients, keyed by user and session ID.
+
+    Sessions unused for ``ttl_s`` seconds are dropped, as are the least
+    recently used ones beyond ``max_sessions``. The store lives in the
+    process, so a client's requests must reach the same server process.
+    """
+
+    def __init__(self, max_sessions=None, ttl_s=None):
+        self.max_sessions = max_sessions or Config.FEEDBACK_MAX_SESSIONS
+        self.ttl = ttl_s or Config.FEEDBACK_SESSION_TTL
+        self._sessions = OrderedDict()  # key -> (differ, last used)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def delta(self, key, feedback, incorrect_points=()):
+        """Return the feedback delta for ``key``, starting a session on first use."""
+        now = time.monotonic()
+        with self._lock:
+            differ = self._sessions.pop(key, (None, None))[0] or FeedbackDiffer()
+            while self._sessions:
+                oldest_key, (_, last_used) = next(iter(self._sessions.items()))
+                if now - last_used < self.ttl and len(self._sessions) < self.max_sessions:
+                    break
+                del self._sessions[oldest_key]
+            self._sessions[key] = (differ, now)
+            return differ.update(feedback, incorrect_points, now)
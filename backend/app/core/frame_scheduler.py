@@ -0,0 +1,108 @@
+import time
+from collections import deque
+import numpy as np
+from app.config import Config
+
+# Face landmarks jitter a lot and say nothing about exercise motion
+BODY_LANDMARKS = slice(11, 33)
+
+class AdaptiveInferenceScheduler:
+    """Skip pose inference on low-motion frames and extrapolate landmarks instead.
+
+    Wraps a PoseDetector and exposes the same ``detect_landmarks`` call. Motion
+    is the median speed of the body landmarks between the last two inferred
+    frames, in normalized image units per second. While it stays below
+    ``motion_threshold``, up to ``max_skip`` consecutive frames reuse the last
+    landmarks moved along that velocity instead of running MediaPipe.
+    """
+
+    def __init__(self, pose_detector, max_skip=None, motion_threshold=None, error_window=1000):
+        self.pose_detector = pose_detector
+        self.max_skip = Config.TRACKING_MAX_SKIP_FRAMES if max_skip is None else max_skip
+        self.motion_threshold = (Config.TRACKING_MOTION_THRESHOLD
+                                 if motion_threshold is None else motion_threshold)
+        self.last_inferred = False
+        self.inferred_frames = 0
+        self.skipped_frames = 0
+        # Recent extrapolation errors only, so a long session stays bounded
+        self._errors = deque(maxlen=error_window)
+        self.reset()
+
+    def reset(self):
+        """Forget the motion estimate, e.g. after the pose was lost."""
+        self._landmarks = None
+        self._timestamp = None
+        self._velocity = None
+        self._speed = np.inf
+        self._consecutive_skips = 0
+        self._prediction = None
+
+    def _extrapolate(self, timestamp):
+        landmarks = self._landmarks.copy()
+        landmarks[:, :3] += self._velocity * (timestamp - self._timestamp)
+        return landmarks
+
+    def should_infer(self):
+        """Whether the next frame needs a real inference."""
+        return (self._landmarks is None
+                or self._consecutive_skips >= self.max_skip
+                or self._speed >= self.motion_threshold)
+
+    def detect_landmarks(self, frame, timestamp=None):
+        """Return a (33, 4) landmark array for ``frame``, inferred or extrapolated.
+
+        Raises ValueError like PoseDetector.detect_landmarks when an inferred
+        frame contains no pose. ``last_inferred`` tells which path was taken.
+        """
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+
+        if not self.should_infer():
+            self._consecutive_skips += 1
+            self.skipped_frames += 1
+            self.last_inferred = False
+            self._prediction = self._extrapolate(timestamp)
+            return self._prediction
+
+        self.last_inferred = True
+        self.inferred_frames += 1
+        try:
+            landmarks = self.pose_detector.detect_landmarks(frame)
+        except ValueError:
+            self.reset()
+            raise
+
+        if self._prediction is not None:
+            # How far the last extrapolated frame was from where the pose really went
+            error = np.linalg.norm(self._extrapolate(timestamp)[BODY_LANDMARKS, :2]
+                                   - landmarks[BODY_LANDMARKS, :2], axis=1)
+            self._errors.append(float(np.median(error)))
+        if self._landmarks is not None and timestamp > self._timestamp:
+            self._velocity = (landmarks[:, :3] - self._landmarks[:, :3]) / (timestamp - self._timestamp)
+            self._speed = float(np.median(np.linalg.norm(self._velocity[BODY_LANDMARKS, :2], axis=1)))
+        self._landmarks = landmarks
+        self._timestamp = timestamp
+        self._consecutive_skips = 0
+        self._prediction = None
+        return landmarks
+
+    def report(self):
+        """Return throughput and quality counters since the scheduler was created.
+
+        ``extrapolation_error`` is the median distance, in normalized image
+        units, between extrapolated body landmarks and the next real detection,
+        over the last ``error_window`` extrapolations.
+        """
+        total = self.inferred_frames + self.skipped_frames
+        return {
+            'frames': total,
+            'inferred_frames': self.inferred_frames,
+            'skipped_frames': self.skipped_frames,
+            'skip_ratio': self.skipped_frames / total if total else 0.0,
+            'extrapolation_error': float(np.median(self._errors)) if self._errors else 0.0
+        }
+
+def format_scheduler_report(report):
+    """Format AdaptiveInferenceScheduler.report() as one line."""
+    return (f"Inference ran on {report['inferred_frames']}/{report['frames']} frames "
+            f"({100 * report['skip_ratio']:.0f}% skipped), "
+            f"median extrapolation error {report['extrapolation_error']:.4f}")
@@ -0,0 +1,111 @@
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+class HudOverlay:
+    """Text panel composited onto video frames at a near-constant cost.
+
+    The panel is a translucent box of ``width`` x ``max_lines`` text lines at
+    ``origin``. Everything that does not depend on the frame is folded into
+    two cached layers, ``keep`` (how much of each frame pixel survives) and
+    ``add`` (background plus antialiased text), so drawing is one multiply
+    and one add over the panel region, in place. A line is rasterized again
+    only when its text or color changes, and only its band of the layers is
+    recomputed. ``line_height`` must leave room for the font. Nothing outside
+    the panel is touched.
+    """
+
+    def __init__(self, width=300, max_lines=10, line_height=30, origin=(0, 0),
+                 background=(0, 0, 0), opacity=0.7, font_scale=0.7, thickness=2, padding=10):
+        self.origin = origin
+        self.line_height = line_height
+        self.max_lines = max_lines
+        self.opacity = opacity
+        self.font_scale = font_scale
+        self.thickness = thickness
+        self.padding = padding
+        height = max_lines * line_height + padding
+        # Static layer: the background's share of every blended pixel
+        self._background = np.array(background, dtype=np.float32) * opacity
+        self._text = np.zeros((height, width, 3), dtype=np.uint8)
+        self._alpha = np.zeros((height, width), dtype=np.uint8)
+        self._keep = np.empty((height, width, 3), dtype=np.uint8)
+        self._add = np.empty((height, width, 3), dtype=np.uint8)
+        self._compose(slice(0, height))
+        self._lines = [None] * max_lines
+        self._patches = [(None, None)] * max_lines
+        self.renders = 0
+
+    @property
+    def size(self):
+        height, width = self._alpha.shape
+        return width, height
+
+    def set_lines(self, lines):
+        """Show ``lines``, a list of ``(text, bgr_color)``; returns whether anything changed."""
+        lines = list(lines)[:self.max_lines]
+        lines += [None] * (self.max_lines - len(lines))
+        changed = False
+        for i, line in enumerate(lines):
+            if line != self._lines[i]:
+                self._lines[i] = line
+                self._render_line(i)
+                changed = True
+        return changed
+
+    def _band(self, i):
+        # Rows of line i: its line height plus the padding its descenders reach into
+        top = i * self.line_height
+        return slice(top, top + self.line_height + self.padding)
+
+    def _render_line(self, i):
+        text_patch = alpha_patch = None
+        if self._lines[i] is not None:
+            text, color = self._lines[i]
+            rows = self.line_height + self.padding
+            text_patch = np.zeros((rows, self._text.shape[1], 3), dtype=np.uint8)
+            alpha_patch = np.zeros((rows, self._text.shape[1]), dtype=np.uint8)
+            baseline = (self.padding, self.line_height)
+            cv2.putText(text_patch, text, baseline, FONT, self.font_scale, color, self.thickness)
+            cv2.putText(alpha_patch, text, baseline, FONT, self.font_scale, 255, self.thickness)
+        self._patches[i] = (text_patch, alpha_patch)
+
+        # Rebuild this band from its own patch and the neighbours' overlapping rows
+        band = self._band(i)
+        self._text[band] = 0
+        self._alpha[band] = 0
+        for j in range(max(i - 1, 0), min(i + 2, self.max_lines)):
+            text_patch, alpha_patch = self._patches[j]
+            if text_patch is None:
+                continue
+            other = self._band(j)
+            top, bottom = max(band.start, other.start), min(band.stop, other.stop)
+            if top >= bottom:
+                continue
+            patch_rows = slice(top - other.start, bottom - other.start)
+            np.maximum(self._text[top:bottom], text_patch[patch_rows], out=self._text[top:bottom])
+            np.maximum(self._alpha[top:bottom], alpha_patch[patch_rows], out=self._alpha[top:bottom])
+        self._compose(band)
+        self.renders += 1
+
+    def _compose(self, rows):
+        # The text layer is drawn on black, so it is already multiplied by its alpha:
+        # out = frame * (1 - opacity) * (1 - alpha) + background * (1 - alpha) + text
+        transparent = 1 - self._alpha[rows, :, None] / np.float32(255)
+        self._keep[rows] = np.round(255 * (1 - self.opacity) * transparent)
+        self._add[rows] = np.clip(np.round(self._background * transparent + self._text[rows]), 0, 255)
+
+    def draw(self, frame):
+        """Blend the panel into ``frame`` in place and return it."""
+        x, y = self.origin
+        width, height = self.size
+        width = min(width, frame.shape[1] - x)
+        height = min(height, frame.shape[0] - y)
+        if width <= 0 or height <= 0:
+            return frame
+
+        region = frame[y:y + height, x:x + width]
+        cv2.multiply(region, self._keep[:height, :width], dst=region, scale=1 / 255)
+        cv2.add(region, self._add[:height, :width], dst=region)
+        return frame
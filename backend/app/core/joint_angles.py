@@ -0,0 +1,45 @@
+import numpy as np
+
+# Joint angles as (name, left triplet, right triplet) of landmark indices.
+# The angle is measured at the middle landmark of each triplet. Names follow
+# the PoseDetector helpers they replace, e.g. "hip" is hip-knee-ankle.
+JOINT_TRIPLETS = (
+    ('hip', (23, 25, 27), (24, 26, 28)),        # hip, knee, ankle
+    ('shoulder', (11, 13, 15), (12, 14, 16)),   # shoulder, elbow, wrist
+    ('back', (11, 23, 25), (12, 24, 26)),       # shoulder, hip, knee
+    ('elbow', (11, 13, 15), (12, 14, 16)),      # shoulder, elbow, wrist
+)
+
+ANGLE_NAMES = tuple(
+    f'{side}_{name}'
+    for name, _, _ in JOINT_TRIPLETS
+    for side in ('left', 'right')
+)
+ANGLE_INDEX = {name: i for i, name in enumerate(ANGLE_NAMES)}
+TRIPLET_INDICES = np.array(
+    [triplet for _, left, right in JOINT_TRIPLETS for triplet in (left, right)],
+    dtype=np.intp
+)
+
+def compute_joint_angles(landmarks):
+    """Compute every angle in JOINT_TRIPLETS in one vectorized pass.
+
+    Takes a (33, 4) landmark array or an (N, 33, 4) batch and returns the
+    angles in degrees with shape (len(ANGLE_NAMES),) or (N, len(ANGLE_NAMES)),
+    ordered as ANGLE_NAMES. Degenerate triplets (coincident points) give NaN.
+    """
+    xy = np.asarray(landmarks)[..., :2].astype(np.float64)
+    a = xy[..., TRIPLET_INDICES[:, 0], :]
+    b = xy[..., TRIPLET_INDICES[:, 1], :]
+    c = xy[..., TRIPLET_INDICES[:, 2], :]
+    ba = a - b
+    bc = c - b
+    dot = np.einsum('...i,...i->...', ba, bc)
+    norms = np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cosine_angle = np.clip(dot / norms, -1.0, 1.0)
+    return np.degrees(np.arccos(cosine_angle))
+
+def angles_to_dict(angles):
+    """Map a single frame's angle vector to {name: degrees}."""
+    return dict(zip(ANGLE_NAMES, angles.tolist()))
@@ -0,0 +1,91 @@
+import hashlib
+import inspect
+import json
+import os
+import numpy as np
+from .model_tiers import resolve_model_complexity
+from .pose_detection import PoseDetector
+from .video_analysis import extract_landmarks, open_video
+
+# PoseDetector arguments that change the landmarks it produces. Anything else,
+# e.g. latency_budget_ms, which extraction never uses, stays out of the cache key
+KEY_OPTIONS = ('static_image_mode', 'model_complexity', 'min_detection_confidence',
+               'min_tracking_confidence')
+# Off by default, and only part of the key when turned on, so adding such an
+# option does not invalidate existing caches
+KEY_FLAGS = ('use_roi', 'smooth_landmarks')
+
+def detector_config(detector_kwargs):
+    """The PoseDetector arguments that affect the landmarks it produces."""
+    arguments = inspect.signature(PoseDetector).bind(**detector_kwargs)
+    arguments.apply_defaults()
+    config = {name: arguments.arguments[name] for name in KEY_OPTIONS}
+    config['model_complexity'] = resolve_model_complexity(config['model_complexity'],
+                                                          arguments.arguments['fallback_tier'])
+    config.update((name, True) for name in KEY_FLAGS if arguments.arguments[name])
+    return config
+
+class LandmarkCache:
+    """On-disk cache of per-video (T, 33, 4) landmark sequences.
+
+    Entries are ``.npy`` files named by a hash of the video's path, size and
+    mtime plus the detector config, so editing a video or changing the model
+    tier extracts it again. Cached sequences are opened memory-mapped, so
+    reading one costs a page-in of a few KB per second of video instead of
+    decoding the whole file.
+    """
+
+    def __init__(self, cache_dir, detector_kwargs=None):
+        self.cache_dir = cache_dir
+        # Same-video-in-order extraction benefits from the tracking graph
+        self.detector_kwargs = {'static_image_mode': False, **(detector_kwargs or {})}
+        self.detector_kwargs['latency_budget_ms'] = None
+        self.detector_config = detector_config(self.detector_kwargs)
+        self._pose_detector = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def pose_detector(self):
+        # Created on first use, so worker processes that only read never load MediaPipe
+        if self._pose_detector is None:
+            self._pose_detector = PoseDetector(**self.detector_kwargs)
+        return self._pose_detector
+
+    def key(self, video_path):
+        stat = os.stat(video_path)
+        identity = {
+            'path': os.path.abspath(video_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'detector': self.detector_config
+        }
+        return hashlib.sha1(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def path(self, video_path):
+        return os.path.join(self.cache_dir, self.key(video_path) + '.npy')
+
+    def load(self, video_path):
+        """Return the cached landmarks memory-mapped read-only, or None if not cached."""
+        path = self.path(video_path)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def extract(self, video_path):
+        """Extract and cache the landmarks of one video, replacing any entry."""
+        self.pose_detector.reset()  # Don't carry tracking state over from another video
+        landmarks = extract_landmarks(open_video(video_path), self.pose_detector)
+        path = self.path(video_path)
+        # Write under a per-process temporary name so readers never see half a file
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as f:
+            np.save(f, landmarks)
+        os.replace(temporary_path, path)
+        return np.load(path, mmap_mode='r')
+
+    def get(self, video_path):
+        """Return the cached landmarks, extracting them on a miss."""
+        landmarks = self.load(video_path)
+        if landmarks is None:
+            landmarks = self.extract(video_path)
+        return landmarks
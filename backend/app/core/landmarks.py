@@ -0,0 +1,134 @@
+import numpy as np
+
+# MediaPipe Pose reports 33 landmarks, each with these four values
+NUM_LANDMARKS = 33
+LANDMARK_FIELDS = ('x', 'y', 'z', 'visibility')
+FIELD_INDEX = {field: i for i, field in enumerate(LANDMARK_FIELDS)}
+
+# MediaPipe landmark index for each named keypoint used by the form checkers
+KEYPOINT_INDEX = {
+    'left_shoulder': 11, 'right_shoulder': 12,
+    'left_elbow': 13, 'right_elbow': 14,
+    'left_wrist': 15, 'right_wrist': 16,
+    'left_hip': 23, 'right_hip': 24,
+    'left_knee': 25, 'right_knee': 26,
+    'left_ankle': 27, 'right_ankle': 28,
+}
+
+def fill_landmark_array(pose_landmarks, out):
+    """Copy MediaPipe pose landmarks into a preallocated (33, 4) array."""
+    out[:] = [
+        (landmark.x, landmark.y, landmark.z, landmark.visibility)
+        for landmark in pose_landmarks.landmark
+    ]
+    return out
+
+def as_landmark_array(landmarks):
+    """Return landmarks as a float32 (33, 4) array.
+
+    Accepts an existing array (returned as is when it already has the right
+    dtype), a LandmarkView, a MediaPipe landmark list, or a sequence of dicts
+    or objects with x/y attributes. Missing z defaults to 0 and missing
+    visibility to 1.
+    """
+    if isinstance(landmarks, LandmarkView):
+        return landmarks.array
+    if isinstance(landmarks, np.ndarray):
+        if landmarks.dtype == np.float32:
+            return landmarks
+        return landmarks.astype(np.float32)
+    if hasattr(landmarks, 'landmark'):
+        landmarks = landmarks.landmark
+
+    array = np.empty((len(landmarks), len(LANDMARK_FIELDS)), dtype=np.float32)
+    for i, point in enumerate(landmarks):
+        if isinstance(point, dict):
+            array[i] = (point['x'], point['y'],
+                        point.get('z', 0.0), point.get('visibility', 1.0))
+        elif hasattr(point, 'x') and hasattr(point, 'y'):
+            array[i] = (point.x, point.y,
+                        getattr(point, 'z', 0.0), getattr(point, 'visibility', 1.0))
+        else:
+            array[i] = 0.0
+            array[i, 3] = 1.0
+            array[i, :len(point)] = point
+    return array
+
+def keypoints_to_landmarks(keypoints):
+    """Build a landmark array from a {name: (x, y)} keypoint dict.
+
+    Landmarks without a named keypoint are left at zero with zero visibility.
+    """
+    array = np.zeros((NUM_LANDMARKS, len(LANDMARK_FIELDS)), dtype=np.float32)
+    for name, (x, y) in keypoints.items():
+        index = KEYPOINT_INDEX[name]
+        array[index, 0] = x
+        array[index, 1] = y
+        array[index, 3] = 1.0
+    return array
+
+def landmarks_to_dicts(landmarks):
+    """Convert a landmark array into the list-of-dicts format used in JSON responses."""
+    return [dict(zip(LANDMARK_FIELDS, row)) for row in as_landmark_array(landmarks).tolist()]
+
+class LandmarkPoint:
+    """Read-only view of one landmark row supporting both point.x and point['x']."""
+    __slots__ = ('row',)
+
+    def __init__(self, row):
+        self.row = row
+
+    @property
+    def x(self):
+        return float(self.row[0])
+
+    @property
+    def y(self):
+        return float(self.row[1])
+
+    @property
+    def z(self):
+        return float(self.row[2])
+
+    @property
+    def visibility(self):
+        return float(self.row[3])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return float(self.row[FIELD_INDEX[key]])
+        return float(self.row[key])
+
+    def get(self, key, default=None):
+        if key in FIELD_INDEX:
+            return self[key]
+        return default
+
+    def keys(self):
+        return LANDMARK_FIELDS
+
+class LandmarkView:
+    """Dict-style access to a landmark array without copying it.
+
+    ``view[23]['x']`` and ``view[23].x`` read straight from the underlying
+    (33, 4) array, so code written against the old list-of-dicts format keeps
+    working while the hot path stays on NumPy.
+    """
+    __slots__ = ('array',)
+
+    def __init__(self, landmarks):
+        self.array = as_landmark_array(landmarks)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        return LandmarkPoint(self.array[index])
+
+    def __iter__(self):
+        for row in self.array:
+            yield LandmarkPoint(row)
+
+    def to_list(self):
+        """Return the landmarks as a list of dicts."""
+        return landmarks_to_dicts(self.array)
@@ -0,0 +1,93 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+class MicroBatcher:
+    """Group items submitted from many threads into batched calls.
+
+    A background thread takes the first waiting item, then keeps collecting
+    until ``max_batch_size`` items are queued or ``max_wait_ms`` has passed
+    since that first item, and hands the batch to ``process_batch``, which
+    must return one result per item. Callers get a Future per item, so a
+    frame from one session waits at most ``max_wait_ms`` plus one batched
+    forward pass.
+    """
+
+    def __init__(self, process_batch, max_batch_size=8, max_wait_ms=5.0, name='micro-batcher'):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Queue ``item`` for the next batch and return a Future for its result."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def process(self, item, timeout=None):
+        """Submit ``item`` and wait for its result."""
+        return self.submit(item).result(timeout)
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                self._queue.put(_STOP)  # Finish this batch, stop on the next get
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch = [(item, future) for item, future in self._collect(entry)
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = list(self.process_batch(items))
+                if len(results) != len(batch):
+                    # A short result list would leave the extra callers waiting forever
+                    raise ValueError(f"process_batch returned {len(results)} results "
+                                     f"for {len(batch)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+
+    def mean_batch_size(self):
+        return self.items / self.batches if self.batches else 0.0
+
+    def close(self):
+        """Process what is already queued, then stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
@@ -0,0 +1,124 @@
+import logging
+import time
+from collections import deque
+from functools import lru_cache
+import cv2
+import mediapipe as mp
+import numpy as np
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# MediaPipe pose landmark models, fastest first
+MODEL_TIERS = {'lite': 0, 'full': 1, 'heavy': 2}
+TIERS_BY_COMPLEXITY = {complexity: tier for tier, complexity in MODEL_TIERS.items()}
+# MediaPipe's own default model, what select_model_tier falls back to
+# when it has nothing to measure with
+DEFAULT_TIER = 'full'
+
+def tier_complexity(tier):
+    """Return the MediaPipe model_complexity for a tier name or complexity value."""
+    if isinstance(tier, int) and tier in TIERS_BY_COMPLEXITY:
+        return tier
+    if tier not in MODEL_TIERS:
+        raise ValueError(f"Unknown model tier: {tier!r} (expected one of {', '.join(MODEL_TIERS)})")
+    return MODEL_TIERS[tier]
+
+def benchmark_tier(tier, frame, iterations=10):
+    """Return per-frame inference latencies in ms for ``tier`` on a BGR frame.
+
+    Returns None when no pose is found in ``frame``: without a pose MediaPipe
+    skips the landmark model, which is the only part that differs by tier.
+    """
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    with mp.solutions.pose.Pose(static_image_mode=True,
+                                model_complexity=tier_complexity(tier)) as pose:
+        if not pose.process(rgb_frame).pose_landmarks:  # Also warms the graph up
+            return None
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            pose.process(rgb_frame)
+            latencies.append(1000 * (time.perf_counter() - start))
+    return latencies
+
+def select_model_tier(budget_ms, frame=None, iterations=10, default=DEFAULT_TIER):
+    """Pick the heaviest tier whose p95 latency on ``frame`` fits ``budget_ms``.
+
+    ``frame`` should show a person; without one ``default`` is returned and
+    the runtime LatencyMonitor of live detectors is left to step down if
+    needed.
+    """
+    if frame is None:
+        logger.info("No pose benchmark image configured, using the %s model", default)
+        return default
+
+    for tier in sorted(MODEL_TIERS, key=MODEL_TIERS.get, reverse=True):
+        latencies = benchmark_tier(tier, frame, iterations)
+        if latencies is None:
+            logger.warning("No pose found in the benchmark image, using the %s model", default)
+            return default
+        p95 = float(np.percentile(latencies, 95))
+        logger.info("Pose model %s: p95 %.1f ms (budget %.1f ms)", tier, p95, budget_ms)
+        if p95 <= budget_ms:
+            return tier
+    return 'lite'
+
+@lru_cache(maxsize=None)
+def _benchmarked_tier():
+    """The tier 'auto' picks on this machine, None without a usable benchmark image."""
+    frame = None
+    if Config.POSE_BENCHMARK_IMAGE:
+        frame = cv2.imread(Config.POSE_BENCHMARK_IMAGE)
+        if frame is None:
+            logger.warning("Could not read pose benchmark image %s", Config.POSE_BENCHMARK_IMAGE)
+    return select_model_tier(Config.POSE_LATENCY_BUDGET_MS, frame, default=None)
+
+def resolve_model_complexity(tier=None, fallback=DEFAULT_TIER):
+    """Return the model_complexity for a configured tier, benchmarking once for 'auto'.
+
+    ``fallback`` is the tier 'auto' uses when there is nothing to benchmark,
+    so each detector can keep the model it used before tiers existed.
+    """
+    if tier is None:
+        tier = Config.POSE_MODEL_TIER
+    if tier == 'auto':
+        tier = _benchmarked_tier() or fallback
+    return tier_complexity(tier)
+
+class LatencyMonitor:
+    """Rolling p95 of inference latency against a per-frame budget.
+
+    Latency is wall time, so the monitor suits a detector that owns its
+    cores, e.g. a live session; detectors sharing the CPU with others would
+    take contention for model cost.
+    """
+
+    def __init__(self, budget_ms, window=120, min_samples=30, headroom=0.5, step_up_after_s=30.0):
+        self.budget_ms = budget_ms
+        self.min_samples = min_samples
+        self.headroom = headroom
+        self.step_up_after_s = step_up_after_s
+        self._samples = deque(maxlen=window)
+        self._since = time.monotonic()
+
+    def record(self, seconds):
+        self._samples.append(1000 * seconds)
+
+    def p95_ms(self):
+        return float(np.percentile(self._samples, 95)) if self._samples else 0.0
+
+    def over_budget(self):
+        """Whether enough samples were seen and their p95 exceeds the budget."""
+        return len(self._samples) >= self.min_samples and self.p95_ms() > self.budget_ms
+
+    def has_headroom(self):
+        """Whether a heavier model would likely fit: p95 under ``headroom`` of the budget
+        for a full window, and ``step_up_after_s`` since the last tier change."""
+        return (len(self._samples) == self._samples.maxlen and
+                time.monotonic() - self._since >= self.step_up_after_s and
+                self.p95_ms() < self.headroom * self.budget_ms)
+
+    def reset(self):
+        self._samples.clear()
+        self._since = time.monotonic()
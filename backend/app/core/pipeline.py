@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import deque
+import numpy as np
+
+class LatestFrameQueue:
+    """Bounded hand-off between pipeline stages where the newest item wins.
+
+    ``put`` never blocks: when the queue is full the oldest item is dropped,
+    so a slow consumer always sees the most recent frame instead of falling
+    further and further behind the camera.
+
+    With ``block`` it waits for room instead, so every item is delivered;
+    for recordings, where nothing is gained by skipping frames. Closing the
+    queue releases a blocked ``put``, whose item is then discarded.
+    """
+
+    def __init__(self, maxsize=1, block=False):
+        self._items = deque(maxlen=maxsize)
+        self._condition = threading.Condition()
+        self._closed = False
+        self.block = block
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if self.block:
+                self._condition.wait_for(lambda: len(self._items) < self._items.maxlen or self._closed)
+                if self._closed:
+                    return
+            elif len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify_all()
+
+    def get(self, timeout=None):
+        """Return the oldest queued item, or None on timeout or after close()."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._items or self._closed, timeout)
+            if self._items:
+                item = self._items.popleft()
+                self._condition.notify_all()
+                return item
+            return None
+
+    @property
+    def finished(self):
+        """Whether the producer closed the queue and every item was consumed."""
+        with self._condition:
+            return self._closed and not self._items
+
+    def close(self):
+        """Wake up any waiting consumer or producer; further gets return None once drained."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+class FramePacket:
+    """A captured frame and the results attached to it as it moves through the stages."""
+    __slots__ = ('index', 'frame', 'captured_at', 'landmarks', 'feedback', 'angles')
+
+    def __init__(self, index, frame, captured_at):
+        self.index = index
+        self.frame = frame
+        self.captured_at = captured_at
+        self.landmarks = None
+        self.feedback = None
+        self.angles = None
+
+class StageStats:
+    """Rolling throughput and latency for one pipeline stage."""
+
+    def __init__(self, name, window=120):
+        self.name = name
+        self._finished = deque(maxlen=window)
+        self._durations = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, started_at, finished_at=None):
+        """Record one item that entered the stage (or the pipeline) at ``started_at``."""
+        finished_at = time.perf_counter() if finished_at is None else finished_at
+        with self._lock:
+            self._finished.append(finished_at)
+            self._durations.append(finished_at - started_at)
+            self.count += 1
+
+    def snapshot(self):
+        """Return FPS and mean/p95 latency in milliseconds over the window."""
+        with self._lock:
+            finished = list(self._finished)
+            durations = np.array(self._durations)
+        fps = 0.0
+        if len(finished) > 1 and finished[-1] > finished[0]:
+            fps = (len(finished) - 1) / (finished[-1] - finished[0])
+        if not len(durations):
+            return {'stage': self.name, 'fps': fps, 'mean_ms': 0.0, 'p95_ms': 0.0, 'count': self.count}
+        return {
+            'stage': self.name,
+            'fps': fps,
+            'mean_ms': 1000 * float(durations.mean()),
+            'p95_ms': 1000 * float(np.percentile(durations, 95)),
+            'count': self.count
+        }
+
+def format_stage_report(stats):
+    """Format a list of StageStats as a small text table."""
+    lines = [f"{'stage':<14}{'fps':>8}{'mean ms':>10}{'p95 ms':>10}{'frames':>9}"]
+    for stage in stats:
+        row = stage.snapshot()
+        lines.append(f"{row['stage']:<14}{row['fps']:>8.1f}{row['mean_ms']:>10.1f}"
+                     f"{row['p95_ms']:>10.1f}{row['count']:>9}")
+    return '\n'.join(lines)
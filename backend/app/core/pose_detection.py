@@ -3,43 +3,278 @@ import numpy as np
 from PIL import Image
 import io
 import cv2
+import logging
+import time
+from app.config import Config
+from .landmarks import NUM_LANDMARKS, as_landmark_array, fill_landmark_array
+from .feature_cache import FrameFeatureCache
+from .roi import RoiCropper
+from .smoothing import LandmarkSmoother
+from .model_tiers import TIERS_BY_COMPLEXITY, LatencyMonitor, resolve_model_complexity
+from .sequence_classifier import LandmarkWindow, load_exercise_classifier
+
+logger = logging.getLogger(__name__)
+
+def validate_form(landmarks, exercise_type, features=None):
+    """Validate exercise form from landmarks alone, without a MediaPipe graph.
+
+    ``features`` is a FrameFeatureCache to share the joint angles with other
+    consumers of the same frame; without one a private cache is used.
+    """
+    if exercise_type not in ("squat", "plank"):
+        return {
+            'feedback': ["Exercise type not supported"],
+            'incorrect_points': [],
+            'is_correct': False
+        }
+
+    # Every angle the validators need, shared with identify_exercise
+    if features is None:
+        features = FrameFeatureCache(maxsize=1)
+    angles = features.angles(landmarks)
+    if exercise_type == "squat":
+        return validate_squat(angles)
+    else:
+        return validate_plank(angles)
+
+def validate_squat(angles):
+    """Validate squat form from precomputed joint angles."""
+    feedback = []
+    incorrect_points = []
+
+    hip_angle = angles['left_hip']
+    shoulder_angle = angles['left_shoulder']
+    back_angle = angles['left_back']
+
+    # Check if the overall position is squat-like
+    is_squat_like = (
+        hip_angle < 150 and  # Hips are bent
+        shoulder_angle > 150 and  # Arms are relatively straight
+        back_angle > 30  # Back is not completely horizontal
+    )
+
+    if not is_squat_like:
+        feedback.append("Not in squat position")
+        incorrect_points.append("position")
+        return {
+            'feedback': feedback,
+            'incorrect_points': incorrect_points,
+            'is_correct': False
+        }
+
+    # If in squat-like position, give specific feedback
+    if hip_angle > 120:
+        feedback.append("Try going lower")
+        incorrect_points.append("depth")
+
+    if shoulder_angle < 150:
+        feedback.append("Straighten your arms")
+        incorrect_points.append("arms")
+
+    if back_angle < 45:
+        feedback.append("Keep your back straight")
+        incorrect_points.append("back")
+
+    return {
+        'feedback': feedback if feedback else ["Good form!"],
+        'incorrect_points': incorrect_points,
+        'is_correct': len(incorrect_points) == 0
+    }
+
+def validate_plank(angles):
+    """Validate plank form from precomputed joint angles."""
+    feedback = []
+    incorrect_points = []
+
+    # Check hip angle
+    hip_angle = angles['left_hip']
+    if hip_angle < 150:
+        feedback.append("Keep your hips up")
+        incorrect_points.append("hips")
+
+    # Check shoulder angle
+    shoulder_angle = angles['left_shoulder']
+    if shoulder_angle < 150:
+        feedback.append("Keep your shoulders straight")
+        incorrect_points.append("shoulders")
+
+    # Check elbow angle
+    elbow_angle = angles['left_elbow']
+    if elbow_angle < 85 or elbow_angle > 95:
+        feedback.append("Keep your elbows at 90 degrees")
+        incorrect_points.append("elbows")
+
+    return {
+        'feedback': feedback if feedback else ["Good form!"],
+        'incorrect_points': incorrect_points,
+        'is_correct': len(incorrect_points) == 0
+    }
 
 class PoseDetector:
-    def __init__(self):
+    def __init__(self, static_image_mode=False, model_complexity=None,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5, use_roi=False,
+                 latency_budget_ms=None, smooth_landmarks=False, fallback_tier='heavy'):
+        """``model_complexity`` takes 0-2 or a tier name ('lite', 'full', 'heavy',
+        'auto'); None uses Config.POSE_MODEL_TIER. ``fallback_tier`` is the model
+        'auto' keeps when there is no benchmark image; heavy is what this detector
+        ran before model tiers were configurable. With ``latency_budget_ms`` the
+        detector steps down to a lighter model when its p95 latency exceeds it,
+        and back up, never past the configured tier, once there is headroom.
+        ``smooth_landmarks`` runs tracking-mode results through a LandmarkSmoother.
+        """
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=2,
-            min_detection_confidence=0.5
-        )
+        self.fallback_tier = fallback_tier
+        self.model_complexity = resolve_model_complexity(model_complexity, fallback_tier)
+        # Temporal filter against frame-to-frame jitter; the ROI still follows raw landmarks.
+        # It replaces MediaPipe's own landmark filter, as two filters in a row only add lag
+        self.smoother = LandmarkSmoother() if smooth_landmarks and not static_image_mode else None
+        self._pose_options = {
+            'static_image_mode': static_image_mode,
+            'smooth_landmarks': self.smoother is None,
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence
+        }
+        self.pose = self.mp_pose.Pose(model_complexity=self.model_complexity, **self._pose_options)
+        self.latency_monitor = LatencyMonitor(latency_budget_ms) if latency_budget_ms else None
+        self.max_model_complexity = self.model_complexity
         self.calibration_data = {}
+        # Derived per-frame features shared by identify_exercise and validate_form
+        self.features = FrameFeatureCache()
+        # Crop video frames to the previous frame's person before inference
+        self.roi = RoiCropper() if use_roi and not static_image_mode else None
+        # Recent frames of the tracked person for the exercise classifier; static
+        # detectors serve unrelated images, so they classify single frames
+        self.exercise_window = None if static_image_mode else LandmarkWindow()
+
+    def warmup(self, frame_shape=(256, 256, 3)):
+        """Run one inference on a blank frame so the graph is initialized before real traffic."""
+        self.pose.process(np.zeros(frame_shape, dtype=np.uint8))
+
+    def close(self):
+        """Release the underlying MediaPipe graph."""
+        self.pose.close()
+
+    def reset(self):
+        """Forget tracking state, e.g. before starting on an unrelated video."""
+        self.pose.reset()
+        if self.roi is not None:
+            self.roi.reset()
+        if self.smoother is not None:
+            self.smoother.reset()
+        if self.exercise_window is not None:
+            self.exercise_window.clear()
+        self.features.clear()
+
+    def set_model_complexity(self, model_complexity):
+        """Swap the MediaPipe graph for one with another model tier."""
+        model_complexity = resolve_model_complexity(model_complexity, self.fallback_tier)
+        if model_complexity == self.model_complexity:
+            return
+        self.pose.close()
+        self.model_complexity = model_complexity
+        self.pose = self.mp_pose.Pose(model_complexity=model_complexity, **self._pose_options)
+        if self.latency_monitor is not None:
+            self.latency_monitor.reset()
+
+    def _process(self, rgb_image):
+        """Run MediaPipe on an RGB image, changing the model tier to stay within budget."""
+        if self.latency_monitor is None:
+            return self.pose.process(rgb_image)
+
+        start = time.perf_counter()
+        results = self.pose.process(rgb_image)
+        self.latency_monitor.record(time.perf_counter() - start)
+        if self.model_complexity > 0 and self.latency_monitor.over_budget():
+            logger.warning("Pose inference p95 %.1f ms over the %.1f ms budget, switching to the %s model",
+                           self.latency_monitor.p95_ms(), self.latency_monitor.budget_ms,
+                           TIERS_BY_COMPLEXITY[self.model_complexity - 1])
+            self.set_model_complexity(self.model_complexity - 1)
+        elif self.model_complexity < self.max_model_complexity and self.latency_monitor.has_headroom():
+            logger.info("Pose inference p95 %.1f ms well within the %.1f ms budget, switching to the %s model",
+                        self.latency_monitor.p95_ms(), self.latency_monitor.budget_ms,
+                        TIERS_BY_COMPLEXITY[self.model_complexity + 1])
+            self.set_model_complexity(self.model_complexity + 1)
+        return results
 
     def detect_landmarks(self, image):
-        """Detect pose landmarks in the image."""
+        """Detect pose landmarks in the image as a (33, 4) float32 array of x, y, z, visibility."""
+        if self.roi is not None and isinstance(image, np.ndarray):
+            # The graph's tracking state is in input image coordinates: clear it
+            # whenever the crop moves
+            landmarks = self.roi.detect(image, self._detect_landmarks, lambda: self.pose.reset())
+        else:
+            landmarks = self._detect_landmarks(image)
+        if self.smoother is not None:
+            landmarks = self.smoother.smooth(landmarks)
+        return landmarks
+
+    def _detect_landmarks(self, image):
         # Convert image to RGB if it's not already
         if isinstance(image, np.ndarray):
             if image.shape[2] == 3:  # BGR format
                 image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
-        results = self.pose.process(image)
+        results = self._process(image)
         if not results.pose_landmarks:
             raise ValueError("No pose detected in the image")
         
-        landmarks = []
-        for landmark in results.pose_landmarks.landmark:
-            landmarks.append({
-                'x': landmark.x,
-                'y': landmark.y,
-                'z': landmark.z,
-                'visibility': landmark.visibility
-            })
+        landmarks = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+        return fill_landmark_array(results.pose_landmarks, landmarks)
+
+    def detect_landmarks_batch(self, frames):
+        """Detect pose landmarks in a sequence of frames.
+
+        Accepts a list of BGR frames or a stacked (N, H, W, 3) array and
+        returns an (N, 33, 4) float32 array (empty for N == 0) of x, y, z,
+        visibility per frame; a single frame must be passed as a batch of one.
+        Frames without a detected pose are filled with NaN instead of raising,
+        so one empty frame does not abort the whole batch. Frames are fed to
+        the tracking graph in order, so consecutive video frames benefit from
+        MediaPipe reusing the previous pose ROI.
+        """
+        if isinstance(frames, np.ndarray):
+            if frames.ndim != 4 or frames.shape[-1] != 3:
+                raise ValueError(f"Expected an (N, H, W, 3) array of frames, got shape {frames.shape}")
+            # Stacked frames share a shape: convert them all with one cvtColor
+            n, h, w, c = frames.shape
+            if n == 0:
+                return np.empty((0, NUM_LANDMARKS, 4), dtype=np.float32)
+            rgb_frames = cv2.cvtColor(
+                np.ascontiguousarray(frames).reshape(n * h, w, c),
+                cv2.COLOR_BGR2RGB
+            ).reshape(n, h, w, 3)
+        else:
+            frames = list(frames)
+            for frame in frames:
+                if np.ndim(frame) != 3 or np.shape(frame)[-1] != 3:
+                    raise ValueError(f"Expected (H, W, 3) frames, got shape {np.shape(frame)}")
+            rgb_frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+        
+        landmarks = np.full((len(rgb_frames), NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+        for i, rgb_frame in enumerate(rgb_frames):
+            results = self._process(rgb_frame)
+            if results.pose_landmarks:
+                fill_landmark_array(results.pose_landmarks, landmarks[i])
         return landmarks
 
     def identify_exercise(self, landmarks):
-        """Identify the exercise being performed based on pose landmarks."""
-        # Calculate angles
-        hip_angle = self._calculate_hip_angle(landmarks)
-        shoulder_angle = self._calculate_shoulder_angle(landmarks)
+        """Identify the exercise being performed based on pose landmarks.
+
+        Uses the trained landmark-sequence classifier over the recent frames
+        when one is installed (see scripts/train_exercise_classifier.py), and
+        falls back to angle thresholds otherwise.
+        """
+        classifier = load_exercise_classifier()
+        if classifier is not None:
+            landmarks = as_landmark_array(landmarks)
+            if self.exercise_window is not None:
+                landmarks = self.exercise_window.append(landmarks)
+            exercise, confidence = classifier.classify(landmarks)
+            return exercise if confidence >= Config.EXERCISE_MIN_CONFIDENCE else "unknown"
+
+        angles = self.features.angles(landmarks)
+        hip_angle = angles['left_hip']
+        shoulder_angle = angles['left_shoulder']
         
         # Identify exercise based on angles
         if hip_angle < 90 and shoulder_angle > 150:
@@ -51,90 +286,7 @@ class PoseDetector:
 
     def validate_form(self, landmarks, exercise_type):
         """Validate the form of the exercise being performed."""
-        if exercise_type == "squat":
-            return self._validate_squat(landmarks)
-        elif exercise_type == "plank":
-            return self._validate_plank(landmarks)
-        else:
-            return {
-                'feedback': ["Exercise type not supported"],
-                'incorrect_points': [],
-                'is_correct': False
-            }
-
-    def _validate_squat(self, landmarks):
-        """Validate squat form."""
-        feedback = []
-        incorrect_points = []
-        
-        # Calculate all relevant angles
-        hip_angle = self._calculate_hip_angle(landmarks)
-        shoulder_angle = self._calculate_shoulder_angle(landmarks)
-        back_angle = self._calculate_back_angle(landmarks)
-        
-        # Check if the overall position is squat-like
-        is_squat_like = (
-            hip_angle < 150 and  # Hips are bent
-            shoulder_angle > 150 and  # Arms are relatively straight
-            back_angle > 30  # Back is not completely horizontal
-        )
-        
-        if not is_squat_like:
-            feedback.append("Not in squat position")
-            incorrect_points.append("position")
-            return {
-                'feedback': feedback,
-                'incorrect_points': incorrect_points,
-                'is_correct': False
-            }
-        
-        # If in squat-like position, give specific feedback
-        if hip_angle > 120:
-            feedback.append("Try going lower")
-            incorrect_points.append("depth")
-        
-        if shoulder_angle < 150:
-            feedback.append("Straighten your arms")
-            incorrect_points.append("arms")
-        
-        if back_angle < 45:
-            feedback.append("Keep your back straight")
-            incorrect_points.append("back")
-        
-        return {
-            'feedback': feedback if feedback else ["Good form!"],
-            'incorrect_points': incorrect_points,
-            'is_correct': len(incorrect_points) == 0
-        }
-
-    def _validate_plank(self, landmarks):
-        """Validate plank form."""
-        feedback = []
-        incorrect_points = []
-        
-        # Check hip angle
-        hip_angle = self._calculate_hip_angle(landmarks)
-        if hip_angle < 150:
-            feedback.append("Keep your hips up")
-            incorrect_points.append("hips")
-        
-        # Check shoulder angle
-        shoulder_angle = self._calculate_shoulder_angle(landmarks)
-        if shoulder_angle < 150:
-            feedback.append("Keep your shoulders straight")
-            incorrect_points.append("shoulders")
-        
-        # Check elbow angle
-        elbow_angle = self._calculate_elbow_angle(landmarks)
-        if elbow_angle < 85 or elbow_angle > 95:
-            feedback.append("Keep your elbows at 90 degrees")
-            incorrect_points.append("elbows")
-        
-        return {
-            'feedback': feedback if feedback else ["Good form!"],
-            'incorrect_points': incorrect_points,
-            'is_correct': len(incorrect_points) == 0
-        }
+        return validate_form(landmarks, exercise_type, self.features)
 
     def store_calibration(self, exercise_type, landmarks):
         """Store calibration data for an exercise."""
@@ -146,51 +298,37 @@ class PoseDetector:
 
     def _calculate_hip_angle(self, landmarks):
         """Calculate the angle at the hip."""
-        hip = landmarks[23]  # Left hip
-        knee = landmarks[25]  # Left knee
-        ankle = landmarks[27]  # Left ankle
-        
-        return self._calculate_angle(hip, knee, ankle)
+        return self._calculate_joint_angle(landmarks, 'left_hip')
 
     def _calculate_shoulder_angle(self, landmarks):
         """Calculate the angle at the shoulder."""
-        shoulder = landmarks[11]  # Left shoulder
-        elbow = landmarks[13]  # Left elbow
-        wrist = landmarks[15]  # Left wrist
-        
-        return self._calculate_angle(shoulder, elbow, wrist)
+        return self._calculate_joint_angle(landmarks, 'left_shoulder')
 
     def _calculate_back_angle(self, landmarks):
         """Calculate the angle of the back."""
-        shoulder = landmarks[11]  # Left shoulder
-        hip = landmarks[23]  # Left hip
-        knee = landmarks[25]  # Left knee
-        
-        return self._calculate_angle(shoulder, hip, knee)
+        return self._calculate_joint_angle(landmarks, 'left_back')
 
     def _calculate_elbow_angle(self, landmarks):
         """Calculate the angle at the elbow."""
-        shoulder = landmarks[11]  # Left shoulder
-        elbow = landmarks[13]  # Left elbow
-        wrist = landmarks[15]  # Left wrist
-        
-        return self._calculate_angle(shoulder, elbow, wrist)
+        return self._calculate_joint_angle(landmarks, 'left_elbow')
+
+    def _calculate_joint_angle(self, landmarks, name):
+        """Look up a single named angle from the per-frame feature cache."""
+        return self.features.angles(landmarks)[name]
 
     def _check_knee_alignment(self, landmarks):
         """Check if knees are aligned with toes."""
-        hip = landmarks[23]  # Left hip
-        knee = landmarks[25]  # Left knee
-        ankle = landmarks[27]  # Left ankle
-        
         # Calculate angle between vertical line and knee-ankle line
-        angle = self._calculate_angle(hip, knee, ankle)
+        angle = self._calculate_hip_angle(landmarks)
         return 85 <= angle <= 95
 
     def _calculate_angle(self, a, b, c):
         """Calculate the angle between three points."""
-        # Handle dict, array, or object with .x/.y
+        # Handle landmark array rows, dicts, or objects with .x/.y
         def to_xy(point):
-            if isinstance(point, dict):
+            if isinstance(point, np.ndarray):
+                return point[:2]
+            elif isinstance(point, dict):
                 return np.array([point['x'], point['y']])
             elif hasattr(point, 'x') and hasattr(point, 'y'):
                 return np.array([point.x, point.y])
@@ -204,25 +342,13 @@ class PoseDetector:
         cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
         cosine_angle = np.clip(cosine_angle, -1.0, 1.0)
         angle = np.arccos(cosine_angle)
-        return np.degrees(angle)
+        return float(np.degrees(angle))
 
     def _calculate_angles(self, landmarks):
         """Calculate all relevant angles for the pose."""
-        angles = {}
-        
-        # Calculate shoulder angle
-        shoulder = landmarks[11]  # Left shoulder
-        elbow = landmarks[13]  # Left elbow
-        wrist = landmarks[15]  # Left wrist
-        angles['left_shoulder'] = self._calculate_angle(shoulder, elbow, wrist)
-        
-        # Calculate elbow angle
-        angles['left_elbow'] = self._calculate_angle(shoulder, elbow, wrist)
-        
-        # Calculate hip angle
-        hip = landmarks[23]  # Left hip
-        knee = landmarks[25]  # Left knee
-        ankle = landmarks[27]  # Left ankle
-        angles['left_hip'] = self._calculate_angle(hip, knee, ankle)
-        
-        return angles 
\ No newline at end of file
+        angles = self.features.angles(landmarks)
+        return {
+            'left_shoulder': angles['left_shoulder'],
+            'left_elbow': angles['left_elbow'],
+            'left_hip': angles['left_hip']
+        } 
\ No newline at end of file
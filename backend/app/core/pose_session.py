@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+from .landmarks import landmarks_to_dicts
+from .feedback_diff import FeedbackDiffer
+from .pose_detection import PoseDetector
+from .video_analysis import analyze_frame
+
+class PoseSession:
+    """Server-side state for one live client connection.
+
+    Each session owns a tracking-mode PoseDetector (static_image_mode=False),
+    so MediaPipe reuses the previous frame's ROI instead of running full
+    detection on every frame. Reps are counted server-side, per exercise,
+    for the whole session. With ``feedback_deltas`` results carry only
+    feedback changes (see FeedbackDiffer) instead of the full lists. A
+    session must only be driven by one thread.
+    """
+
+    def __init__(self, exercise_type='squat', model_complexity=None,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5, use_roi=True,
+                 latency_budget_ms=None, smooth_landmarks=True, feedback_deltas=False):
+        self.pose_detector = PoseDetector(
+            static_image_mode=False,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            use_roi=use_roi,
+            latency_budget_ms=latency_budget_ms,
+            smooth_landmarks=smooth_landmarks
+        )
+        self.exercise_type = exercise_type
+        self.frame_count = 0
+        self.rep_counters = {}
+        self.feedback_differ = FeedbackDiffer() if feedback_deltas else None
+
+    def set_exercise(self, exercise_type):
+        """Switch the exercise being validated; reps counted so far are kept."""
+        self.exercise_type = exercise_type
+
+    def reset_reps(self):
+        """Start counting every exercise from zero, e.g. for a new set."""
+        self.rep_counters.clear()
+
+    def process_frame(self, frame):
+        """Analyze one BGR frame and return a JSON-serializable message."""
+        result = analyze_frame(self.pose_detector, frame, self.exercise_type, self.rep_counters)
+        if result['pose_detected']:
+            result['landmarks'] = landmarks_to_dicts(result['landmarks'])
+        if self.feedback_differ is not None:
+            # A frame without a pose clears the feedback, once that has lasted the dwell time
+            result['feedback_delta'] = self.feedback_differ.update(
+                result.pop('feedback', []), result.pop('incorrect_points', []))
+        result['type'] = 'result'
+        result['frame'] = self.frame_count
+        self.frame_count += 1
+        return result
+
+    def process_jpeg(self, data):
+        """Decode an encoded image (JPEG/PNG bytes) and analyze it."""
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return {'type': 'error', 'error': 'Could not decode frame'}
+        return self.process_frame(frame)
+
+    def close(self):
+        """Release the session's detector."""
+        self.pose_detector.close()
@@ -1,22 +1,58 @@
 import cv2
+import threading
 import time
 import numpy as np
+from app.config import Config
+from .camera import CameraCapture, is_stream
 from .pose_detection import PoseDetector
+from .hud import HudOverlay
+from .skeleton import SkeletonRenderer
+from .feedback_diff import FeedbackDiffer
+from .rep_counter import update_rep_count
+from .frame_scheduler import AdaptiveInferenceScheduler, format_scheduler_report
+from .pipeline import FramePacket, LatestFrameQueue, StageStats, format_stage_report
 
 class RealtimePoseTracker:
+    STAGES = ('capture', 'inference', 'render', 'end_to_end')
+
     def __init__(self):
-        self.pose_detector = PoseDetector()
+        self.pose_detector = PoseDetector(use_roi=Config.POSE_ROI_CROP,
+                                          latency_budget_ms=Config.POSE_LATENCY_BUDGET_MS,
+                                          smooth_landmarks=Config.LANDMARK_SMOOTHING)
+        self.scheduler = AdaptiveInferenceScheduler(self.pose_detector)
         self.current_exercise = "squat"  # default exercise
         self.rep_count = 0
+        self.rep_phase = None
+        self.rep_counters = {}
+        self._pending_exercise = None
+        self.feedback_differ = FeedbackDiffer()
         self.start_time = None
         self.fps = 0
         self.frame_count = 0
         self.last_fps_update = time.time()
+        self.stage_stats = {name: StageStats(name) for name in self.STAGES}
+        self.hud = HudOverlay(width=320, max_lines=10)
+        self.skeleton = SkeletonRenderer()
+        self._stop = threading.Event()
         
     def set_exercise(self, exercise):
-        """Set the current exercise to track"""
+        """Set the current exercise to track
+
+        Called from the render thread; the switch itself happens on the
+        inference thread before its next frame, so the rep and feedback
+        state it is updating is never swapped out from under it.
+        """
+        self._pending_exercise = exercise
+
+    def _apply_pending_exercise(self):
+        exercise, self._pending_exercise = self._pending_exercise, None
+        if exercise is None:
+            return
         self.current_exercise = exercise
         self.rep_count = 0
+        self.rep_phase = None
+        self.rep_counters = {}
+        self.feedback_differ.reset()
         
     def calculate_fps(self):
         """Calculate and update FPS"""
@@ -29,89 +65,183 @@ class RealtimePoseTracker:
             
     def draw_feedback(self, frame, feedback, angles=None):
         """Draw feedback and metrics on the frame"""
-        # Draw FPS
-        cv2.putText(frame, f"FPS: {self.fps}", (10, 30), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        
-        # Draw current exercise
-        cv2.putText(frame, f"Exercise: {self.current_exercise}", (10, 60),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        
-        # Draw rep count
-        cv2.putText(frame, f"Reps: {self.rep_count}", (10, 90),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        
-        # Draw feedback
-        if feedback["feedback"]:
-            y_pos = 120
-            for msg in feedback["feedback"]:
-                cv2.putText(frame, msg, (10, y_pos),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                y_pos += 30
-                
-        # Draw angles if available
-        if angles:
-            y_pos = 180
-            for joint, angle in angles.items():
-                cv2.putText(frame, f"{joint}: {angle:.1f}°", (10, y_pos),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-                y_pos += 30
+        green, red, cyan = (0, 255, 0), (0, 0, 255), (255, 255, 0)
+        reps = f"Reps: {self.rep_count}" + (f" ({self.rep_phase})" if self.rep_phase else "")
+        lines = [
+            (f"FPS: {self.fps}", green),
+            (f"Exercise: {self.current_exercise}", green),
+            (reps, green)
+        ]
+        lines += [(msg, red) for msg in feedback["feedback"]]
+        # Whole degrees, so the cached lines only re-render when an angle really moves
+        lines += [(f"{joint}: {angle:.0f} deg", cyan) for joint, angle in (angles or {}).items()]
+
+        # Only changed lines are rasterized again; the panel is blended in place
+        self.hud.set_lines(lines)
+        self.hud.draw(frame)
                 
-    def run(self):
-        """Run the real-time pose tracking system"""
-        cap = cv2.VideoCapture(0)
-        
-        if not cap.isOpened():
-            print("Error: Could not open camera")
-            return
-            
-        print("Press 'q' to quit")
-        print("Press '1' for Squat")
-        print("Press '2' for Plank")
-        
-        while cap.isOpened():
+    def _capture_loop(self, cap, frames):
+        """Capture stage: read frames as fast as the source delivers them, or the queue takes them."""
+        index = 0
+        while not self._stop.is_set():
+            started_at = time.perf_counter()
             ret, frame = cap.read()
             if not ret:
                 break
-                
-            # Calculate FPS
-            self.calculate_fps()
-            
-            # Process frame
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            landmarks = self.pose_detector.detect_landmarks(rgb_frame)
-            
-            if landmarks:
+            captured_at = time.perf_counter()
+            self.stage_stats['capture'].record(started_at, captured_at)
+            frames.put(FramePacket(index, frame, captured_at))
+            index += 1
+        frames.close()
+
+    def _inference_loop(self, frames, results):
+        """Inference stage: always run the detector on the newest captured frame."""
+        try:
+            self._run_inference(frames, results)
+        except Exception:
+            # Stop the other stages too rather than leave them waiting on a dead thread
+            self._stop.set()
+            raise
+        finally:
+            results.close()
+
+    def _run_inference(self, frames, results):
+        while not self._stop.is_set() and not frames.finished:
+            packet = frames.get(timeout=0.1)
+            if packet is None:
+                continue
+
+            self._apply_pending_exercise()
+            started_at = time.perf_counter()
+            # Low-motion frames get extrapolated landmarks instead of a MediaPipe run;
+            # detect_landmarks converts BGR to RGB itself
+            try:
+                packet.landmarks = self.scheduler.detect_landmarks(packet.frame, packet.captured_at)
+            except ValueError:
+                packet.landmarks = None  # No pose in this frame
+
+            if packet.landmarks is not None:
                 # Get feedback and angles
-                feedback = self.pose_detector.validate_form(landmarks, self.current_exercise)
-                angles = self.pose_detector.calculate_angles(landmarks)
-                
-                # Update rep count if exercise is completed
-                if feedback.get("rep_completed", False):
-                    self.rep_count += 1
-                
-                # Draw feedback and metrics
-                self.draw_feedback(frame, feedback, angles)
-                
-                # Draw landmarks
-                for landmark in landmarks:
-                    x, y = int(landmark.x * frame.shape[1]), int(landmark.y * frame.shape[0])
-                    cv2.circle(frame, (x, y), 5, (0, 255, 0), -1)
-            
-            # Display frame
+                packet.feedback = self.pose_detector.validate_form(packet.landmarks, self.current_exercise)
+                # Show messages only once they have held for the dwell time, so
+                # borderline angles do not make the overlay flicker
+                self.feedback_differ.update(packet.feedback['feedback'], packet.feedback['incorrect_points'],
+                                            packet.captured_at)
+                packet.feedback['feedback'] = self.feedback_differ.messages()
+                packet.angles = self.pose_detector._calculate_angles(packet.landmarks)
+
+                # Count reps from the same frame's angles
+                rep_state = update_rep_count(self.rep_counters, self.current_exercise,
+                                             self.pose_detector.features.angles(packet.landmarks))
+                if rep_state is not None:
+                    packet.feedback['rep_completed'] = rep_state['rep_completed']
+                    self.rep_count = rep_state['reps']
+                    self.rep_phase = rep_state['rep_phase']
+
+            self.stage_stats['inference'].record(started_at)
+            results.put(packet)
+
+    def _render_frame(self, packet, display=True):
+        """Render stage: draw the results onto their frame and display it."""
+        started_at = time.perf_counter()
+        frame = packet.frame
+
+        # Calculate FPS
+        self.calculate_fps()
+
+        if packet.landmarks is not None:
+            # Draw feedback and metrics
+            self.draw_feedback(frame, packet.feedback, packet.angles)
+
+            # Draw the skeleton, highlighting the joints the feedback is about
+            self.skeleton.draw(frame, packet.landmarks, packet.feedback['incorrect_points'])
+
+        # Display frame
+        if display:
             cv2.imshow('Real-Time Pose Tracking', frame)
-            
-            # Handle key presses
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
-            elif key == ord('1'):
-                self.set_exercise("squat")
-            elif key == ord('2'):
-                self.set_exercise("plank")
-        
-        cap.release()
-        cv2.destroyAllWindows()
+        finished_at = time.perf_counter()
+        self.stage_stats['render'].record(started_at, finished_at)
+        self.stage_stats['end_to_end'].record(packet.captured_at, finished_at)
+
+    def stage_report(self):
+        """Return per-stage FPS and latency of the last run as a text table."""
+        return format_stage_report(self.stage_stats.values())
+
+    def run(self, source=None, display=True):
+        """Run the real-time pose tracking system
+
+        Capture and inference run on their own threads, joined by single-slot
+        latest-frame-wins queues, so the camera never waits on the detector
+        and the detector always works on the newest frame. A video file has
+        no newest frame to keep up with, so there the queues block instead
+        and every frame is analyzed and rendered. Rendering and key
+        handling stay on the calling thread, as OpenCV's HighGUI requires.
+
+        ``source`` is a camera index, video file or stream URL (default
+        Config.CAMERA_SOURCE). With ``display=False`` nothing is shown and
+        the run ends with the source, e.g. to exercise the pipeline on a
+        recording without a screen.
+        """
+        # The capture stage below is already a latest-frame grab thread,
+        # so the camera is read directly rather than through a second one
+        try:
+            cap = CameraCapture(source, threaded=False)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+        settings = cap.settings()
+        print(f"Camera: {settings['width']}x{settings['height']} {settings['fourcc'] or '?'} "
+              f"at {settings['fps']:.0f} FPS via {settings['backend']}")
+        if display:
+            print("Press 'q' to quit")
+            print("Press '1' for Squat")
+            print("Press '2' for Plank")
+
+        self._stop = threading.Event()
+        self.stage_stats = {name: StageStats(name) for name in self.STAGES}
+        live = isinstance(cap.source, int) or is_stream(cap.source)
+        frames = LatestFrameQueue(maxsize=1, block=not live)
+        results = LatestFrameQueue(maxsize=1, block=not live)
+        workers = [
+            threading.Thread(target=self._capture_loop, args=(cap, frames),
+                             name='pose-capture', daemon=True),
+            threading.Thread(target=self._inference_loop, args=(frames, results),
+                             name='pose-inference', daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            while not results.finished:
+                packet = results.get(timeout=0.01)
+                if packet is not None:
+                    self._render_frame(packet, display)
+                if not display:
+                    continue
+
+                # Handle key presses
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q'):
+                    break
+                elif key == ord('1'):
+                    self.set_exercise("squat")
+                elif key == ord('2'):
+                    self.set_exercise("plank")
+        finally:
+            self._stop.set()
+            # Release stages blocked handing a frame to one that has stopped
+            frames.close()
+            results.close()
+            for worker in workers:
+                worker.join()
+            cap.release()
+            if display:
+                cv2.destroyAllWindows()
+
+        print(self.stage_report())
+        print(f"Frames dropped: {frames.dropped} before inference, {results.dropped} before render")
+        print(format_scheduler_report(self.scheduler.report()))
 
 if __name__ == "__main__":
     tracker = RealtimePoseTracker()
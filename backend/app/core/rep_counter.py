@@ -0,0 +1,77 @@
+import math
+from collections import namedtuple
+from app.config import Config
+
+# How an exercise's reps show up in its joint angles: a rep starts when the
+# angle drops below ``down_angle`` and completes when it rises back above
+# ``up_angle``. The gap between the two is the hysteresis band that keeps
+# jitter around a single threshold from counting extra reps. The angle is
+# the mean of the named joints that are available in the frame.
+RepProfile = namedtuple('RepProfile', ['angles', 'down_angle', 'up_angle'])
+
+REP_PROFILES = {
+    # Only the knee bend: 'left_hip'/'right_hip' are the hip-knee-ankle angles (see
+    # joint_angles), below 120 degrees to start a rep and past 150 to finish it.
+    # The back angle plays no part in counting; validate_form checks it
+    'squat': RepProfile(('left_hip', 'right_hip'), down_angle=120, up_angle=150),
+}
+
+class RepCounter:
+    """Streaming rep counter for one exercise.
+
+    Feed it one frame's joint angles at a time with ``update``; each call is
+    O(1). Crossing a threshold only counts once the angle has stayed past it
+    for ``debounce_frames`` consecutive frames, so a single mis-detected
+    frame neither starts nor finishes a rep. Frames without a usable angle
+    are ignored. Each update reports the rep count and the phase:
+    'top', 'eccentric' (lowering), 'bottom' or 'concentric' (rising).
+    """
+
+    def __init__(self, exercise_type, profile=None, debounce_frames=None):
+        self.exercise_type = exercise_type
+        self.profile = profile or REP_PROFILES[exercise_type]
+        self.debounce_frames = debounce_frames or Config.REP_DEBOUNCE_FRAMES
+        self.reset()
+
+    def reset(self):
+        self.reps = 0
+        self.phase = 'top'
+        self._down = False
+        self._pending = 0
+
+    def _angle(self, angles):
+        values = [angles[name] for name in self.profile.angles
+                  if angles.get(name) is not None and not math.isnan(angles[name])]
+        return sum(values) / len(values) if values else None
+
+    def update(self, angles):
+        """Advance by one frame of {name: degrees} angles and return the rep state."""
+        angle = self._angle(angles)
+        rep_completed = False
+        if angle is not None:
+            crossed = angle > self.profile.up_angle if self._down else angle < self.profile.down_angle
+            self._pending = self._pending + 1 if crossed else 0
+            if self._pending >= self.debounce_frames:
+                self._pending = 0
+                self._down = not self._down
+                if not self._down:
+                    self.reps += 1
+                    rep_completed = True
+
+            if self._down:
+                self.phase = 'bottom' if angle <= self.profile.down_angle else 'concentric'
+            else:
+                self.phase = 'top' if angle >= self.profile.up_angle else 'eccentric'
+
+        return {'reps': self.reps, 'rep_phase': self.phase, 'rep_completed': rep_completed}
+
+def update_rep_count(rep_counters, exercise_type, angles):
+    """Update the counter for ``exercise_type`` in ``rep_counters``, creating it on first use.
+
+    Returns the rep state, or None for exercises without reps (e.g. planks).
+    """
+    if exercise_type not in REP_PROFILES:
+        return None
+    if exercise_type not in rep_counters:
+        rep_counters[exercise_type] = RepCounter(exercise_type)
+    return rep_counters[exercise_type].update(angles)
@@ -0,0 +1,127 @@
+import cv2
+
+# Input resolution of the MediaPipe pose landmark model
+MODEL_INPUT_SIZE = 256
+
+class RoiCropper:
+    """Crop video frames to the person found in a previous frame before inference.
+
+    The region is the bounding box of the visible landmarks, padded and
+    squared. It stays put while the person moves inside it, and is only
+    recomputed once they come within ``edge_margin`` of an edge or shrink
+    below ``min_fill`` of it. MediaPipe's tracking graph keeps the previous
+    frame's ROI and landmark filter in input image coordinates, so whenever
+    the image fed to it changes geometry (a new region, or the full frame
+    after a lost track) the ``reset`` callback given to ``detect`` clears
+    that state first.
+
+    Crops larger than ``input_size`` are downscaled before colour
+    conversion, which saves MediaPipe resizing and converting a full 1080p
+    frame. The default keeps twice the model input, since MediaPipe crops
+    the person out of the image again and the padding would otherwise cost
+    landmark resolution. Landmarks are mapped back to normalized full-frame
+    coordinates. When no pose is found in the crop, the same frame is
+    retried in full.
+    """
+
+    def __init__(self, padding=0.25, input_size=2 * MODEL_INPUT_SIZE, min_visibility=0.5,
+                 min_visible_landmarks=8, edge_margin=0.05, min_fill=0.3):
+        self.padding = padding
+        self.input_size = input_size
+        self.min_visibility = min_visibility
+        self.min_visible_landmarks = min_visible_landmarks
+        self.edge_margin = edge_margin
+        self.min_fill = min_fill
+        self.region = None  # (x0, y0, x1, y1) in pixels
+        self._input_region = None  # Region of the last image handed to detect, None for the full frame
+
+    def reset(self):
+        """Drop the tracked region so the next frame is processed in full."""
+        self.region = None
+        self._input_region = None
+
+    def _still_fits(self, box, frame_shape):
+        # Whether the person's box is still well inside the current region;
+        # region edges on the frame border cannot move, so they never count
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = self.region
+        margin = self.edge_margin * max(x1 - x0, y1 - y0)
+        box_x0, box_y0, box_x1, box_y1 = box
+        if max(box_x1 - box_x0, box_y1 - box_y0) < self.min_fill * max(x1 - x0, y1 - y0):
+            return False
+        return ((x0 == 0 or box_x0 - x0 >= margin) and (y0 == 0 or box_y0 - y0 >= margin) and
+                (x1 == width or x1 - box_x1 >= margin) and (y1 == height or y1 - box_y1 >= margin))
+
+    def update(self, landmarks, frame_shape):
+        """Derive the region for the next frame from this frame's landmarks."""
+        height, width = frame_shape[:2]
+        visible = landmarks[landmarks[:, 3] >= self.min_visibility]
+        if len(visible) < self.min_visible_landmarks:
+            self.region = None
+            return
+
+        x_min, y_min = visible[:, :2].min(axis=0) * (width, height)
+        x_max, y_max = visible[:, :2].max(axis=0) * (width, height)
+        if self.region is not None and self._still_fits((x_min, y_min, x_max, y_max), frame_shape):
+            return
+        # Square box around the person, padded on every side
+        side = max(x_max - x_min, y_max - y_min) * (1 + 2 * self.padding)
+        center_x, center_y = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x0 = int(max(center_x - side / 2, 0))
+        y0 = int(max(center_y - side / 2, 0))
+        x1 = int(min(center_x + side / 2, width))
+        y1 = int(min(center_y + side / 2, height))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            self.region = None
+        elif x1 - x0 == width and y1 - y0 == height:
+            self.region = None  # Person fills the frame: nothing to crop
+        else:
+            self.region = (x0, y0, x1, y1)
+
+    def _downscale(self, image):
+        scale = self.input_size / max(image.shape[:2])
+        if scale >= 1:
+            return image
+        return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    def to_frame(self, landmarks, region, frame_shape):
+        """Map landmarks normalized to ``region`` back to the full frame, in place."""
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = region
+        crop_width, crop_height = x1 - x0, y1 - y0
+        landmarks[:, 0] = (landmarks[:, 0] * crop_width + x0) / width
+        landmarks[:, 1] = (landmarks[:, 1] * crop_height + y0) / height
+        # z shares the scale of x
+        landmarks[:, 2] *= crop_width / width
+        return landmarks
+
+    def _switch_input(self, region, reset):
+        if region != self._input_region:
+            self._input_region = region
+            if reset is not None:
+                reset()
+
+    def detect(self, frame, detect, reset=None):
+        """Run ``detect`` on the tracked region of a BGR frame.
+
+        ``detect`` takes a BGR image and returns a (33, 4) landmark array or
+        raises ValueError, like PoseDetector.detect_landmarks. ``reset`` is
+        called before ``detect`` whenever its input switches to another
+        region or to the full frame, to clear the model's tracking state.
+        """
+        if self.region is not None:
+            x0, y0, x1, y1 = self.region
+            self._switch_input(self.region, reset)
+            try:
+                landmarks = detect(self._downscale(frame[y0:y1, x0:x1]))
+            except ValueError:
+                self.region = None  # Lost track: fall back to the full frame
+            else:
+                self.to_frame(landmarks, (x0, y0, x1, y1), frame.shape)
+                self.update(landmarks, frame.shape)
+                return landmarks
+
+        self._switch_input(None, reset)
+        landmarks = detect(frame)
+        self.update(landmarks, frame.shape)
+        return landmarks
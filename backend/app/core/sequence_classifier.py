@@ -0,0 +1,179 @@
+import os
+import zlib
+from collections import deque
+from functools import lru_cache
+import numpy as np
+from app.config import Config
+from .joint_angles import compute_joint_angles
+
+# Landmarks that describe the body; the face says little about the exercise
+BODY_LANDMARKS = np.arange(11, 33)
+LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP = 11, 12, 23, 24
+NUM_FEATURES = 2 * (2 * len(BODY_LANDMARKS) + 8)
+
+def _nan_mean(values, axis):
+    """np.nanmean without the empty-slice warning: all-NaN slices give NaN."""
+    present = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(present, values, 0).sum(axis=axis) / present.sum(axis=axis)
+
+def _nan_std(values, axis, mean):
+    deviation = values - np.expand_dims(mean, axis)
+    return np.sqrt(_nan_mean(deviation * deviation, axis))
+
+def normalize_landmarks(landmarks, min_visibility=0.5):
+    """Center landmark windows on the hips and scale them by torso length.
+
+    Takes a (33, 4) frame or a (T, 33, 4) window and returns (T, 22, 2) body
+    landmark coordinates that no longer depend on where the person stands or
+    how far from the camera. Orientation is kept: it is what tells a plank
+    from a squat. Landmarks below ``min_visibility`` and frames without hips
+    or shoulders are NaN.
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64).reshape(-1, 33, 4)
+    xy = np.where(landmarks[..., 3:] >= min_visibility, landmarks[..., :2], np.nan)
+    hips = _nan_mean(xy[:, [LEFT_HIP, RIGHT_HIP]], axis=1)
+    shoulders = _nan_mean(xy[:, [LEFT_SHOULDER, RIGHT_SHOULDER]], axis=1)
+    torso = np.linalg.norm(shoulders - hips, axis=1)
+    torso[torso < 1e-6] = np.nan
+    return (xy[:, BODY_LANDMARKS] - hips[:, None]) / torso[:, None, None]
+
+def window_features(landmarks):
+    """Fixed-length feature vector for a (T, 33, 4) window or a single (33, 4) frame.
+
+    Mean and standard deviation over time of the normalized body landmarks
+    and of the joint angles (scaled to 0-1). Values missing in every frame
+    are NaN; ExerciseClassifier treats them as average.
+    """
+    landmarks = np.asarray(landmarks).reshape(-1, 33, 4)
+    coordinates = normalize_landmarks(landmarks).reshape(len(landmarks), -1)
+    angles = compute_joint_angles(landmarks) / 180
+    series = np.concatenate([coordinates, angles], axis=1)
+    mean = _nan_mean(series, axis=0)
+    return np.concatenate([mean, _nan_std(series, axis=0, mean=mean)])
+
+class ExerciseClassifier:
+    """Multinomial logistic regression over window_features, in NumPy.
+
+    Classifying a window is one feature extraction and a (F, C) matrix
+    product, a few tens of microseconds on a CPU.
+    """
+
+    def __init__(self, classes, weights=None, bias=None, feature_mean=None, feature_std=None):
+        self.classes = [str(c) for c in classes]
+        num_classes = len(self.classes)
+        self.weights = np.zeros((NUM_FEATURES, num_classes)) if weights is None else weights
+        self.bias = np.zeros(num_classes) if bias is None else bias
+        self.feature_mean = np.zeros(NUM_FEATURES) if feature_mean is None else feature_mean
+        self.feature_std = np.ones(NUM_FEATURES) if feature_std is None else feature_std
+
+    def _standardize(self, features):
+        features = (np.asarray(features, dtype=np.float64) - self.feature_mean) / self.feature_std
+        return np.nan_to_num(features, nan=0.0)
+
+    def fit(self, features, labels, epochs=500, learning_rate=0.5, l2=1e-3):
+        """Train with full-batch gradient descent on an (N, F) feature matrix."""
+        features = np.asarray(features, dtype=np.float64)
+        labels = np.asarray([self.classes.index(label) for label in labels])
+        mean = _nan_mean(features, axis=0)
+        std = _nan_std(features, axis=0, mean=mean)
+        self.feature_mean = np.nan_to_num(mean)
+        std = np.nan_to_num(std)
+        self.feature_std = np.where(std > 1e-6, std, 1.0)
+        x = self._standardize(features)
+        targets = np.eye(len(self.classes))[labels]
+
+        for _ in range(epochs):
+            probabilities = self._softmax(x @ self.weights + self.bias)
+            error = (probabilities - targets) / len(x)
+            self.weights -= learning_rate * (x.T @ error + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+        return self
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def predict_proba(self, features):
+        """Class probabilities for one feature vector or an (N, F) matrix."""
+        return self._softmax(self._standardize(features) @ self.weights + self.bias)
+
+    def classify(self, landmarks):
+        """Return ``(exercise, confidence)`` for a landmark window or frame."""
+        probabilities = self.predict_proba(window_features(landmarks))
+        best = int(np.argmax(probabilities))
+        return self.classes[best], float(probabilities[best])
+
+    def save(self, path):
+        np.savez(path, classes=np.array(self.classes), weights=self.weights, bias=self.bias,
+                 feature_mean=self.feature_mean, feature_std=self.feature_std)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['classes'], data['weights'], data['bias'],
+                       data['feature_mean'], data['feature_std'])
+
+@lru_cache(maxsize=8)
+def _load_classifier(path, mtime_ns):
+    return ExerciseClassifier.load(path)
+
+def load_exercise_classifier(path=None):
+    """Return the trained classifier at ``path`` (default: Config), or None if there is none.
+
+    Loaded classifiers are cached by path and modification time, so one
+    installed or retrained while the server runs is picked up on the next
+    call, at the cost of a stat per call.
+    """
+    path = path or Config.EXERCISE_CLASSIFIER_PATH
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_classifier(path, mtime_ns)
+
+class LandmarkWindow:
+    """The last ``size`` landmark frames of one tracked person."""
+
+    def __init__(self, size=None):
+        self.frames = deque(maxlen=size or Config.EXERCISE_WINDOW_FRAMES)
+
+    def append(self, landmarks):
+        self.frames.append(np.asarray(landmarks))
+        return np.stack(self.frames)
+
+    def clear(self):
+        self.frames.clear()
+
+def load_dataset_windows(root_dir, landmark_cache, window, stride):
+    """Cut every video of an ExerciseDataset layout into landmark windows.
+
+    Videos live under ``root_dir/<exercise>/*.mp4``. Returns ``(windows,
+    labels, videos)`` where ``videos`` names the source of each window, so
+    callers can split by video rather than by window. Single frames are
+    included as well, since static-image requests classify one frame.
+    """
+    windows, labels, videos = [], [], []
+    for exercise in sorted(os.listdir(root_dir)):
+        exercise_dir = os.path.join(root_dir, exercise)
+        if exercise.startswith('.') or not os.path.isdir(exercise_dir):
+            continue
+        for filename in sorted(os.listdir(exercise_dir)):
+            if not filename.endswith('.mp4'):
+                continue
+            video_path = os.path.join(exercise_dir, filename)
+            landmarks = np.asarray(landmark_cache.get(video_path))
+            detected = landmarks[~np.isnan(landmarks).any(axis=(1, 2))]
+            starts = range(0, max(len(detected) - window, 0) + 1, stride) if len(detected) else []
+            for start in starts:
+                for sample in (detected[start:start + window], detected[start]):
+                    windows.append(sample)
+                    labels.append(exercise)
+                    videos.append(video_path)
+    return windows, labels, videos
+
+def is_validation_video(video_path, fraction=0.2):
+    """Deterministically hold out ``fraction`` of the videos, by file name."""
+    return zlib.crc32(os.path.basename(video_path).encode('utf-8')) % 1000 < fraction * 1000
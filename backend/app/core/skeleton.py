@@ -0,0 +1,116 @@
+import cv2
+import numpy as np
+from .landmarks import as_landmark_array
+
+# Body landmarks and bones; the face is left out
+BODY_JOINTS = np.arange(11, 33)
+BODY_CONNECTIONS = np.array([
+    # Arms
+    (11, 12), (11, 13), (13, 15), (12, 14), (14, 16),
+    # Torso
+    (11, 23), (12, 24), (23, 24),
+    # Left leg
+    (23, 25), (25, 27), (27, 29), (29, 31),
+    # Right leg
+    (24, 26), (26, 28), (28, 30), (30, 32)
+])
+
+# Joints behind the named incorrect_points the form validators report
+INCORRECT_POINT_JOINTS = {
+    'position': tuple(BODY_JOINTS),
+    'depth': (23, 24, 25, 26),
+    'arms': (11, 12, 13, 14, 15, 16),
+    'back': (11, 12, 23, 24),
+    'hips': (23, 24),
+    'shoulders': (11, 12),
+    'elbows': (13, 14),
+}
+
+def incorrect_joint_mask(incorrect_points, landmarks):
+    """Map validator ``incorrect_points`` to a (33,) bool mask of joints to highlight.
+
+    Accepts names (see INCORRECT_POINT_JOINTS) and normalized ``[x, y]``
+    points, which mark the landmark nearest to them.
+    """
+    mask = np.zeros(len(landmarks), dtype=bool)
+    points = []
+    for point in incorrect_points:
+        if isinstance(point, str):
+            mask[list(INCORRECT_POINT_JOINTS.get(point, ()))] = True
+        else:
+            points.append(point[:2])
+    if points:
+        distances = np.linalg.norm(landmarks[None, :, :2] - np.asarray(points, dtype=np.float32)[:, None],
+                                   axis=-1)
+        mask[np.argmin(np.nan_to_num(distances, nan=np.inf), axis=1)] = True
+    return mask
+
+class SkeletonRenderer:
+    """Draw body joints and bones with a handful of OpenCV calls per frame.
+
+    Landmarks are converted to pixels in one NumPy operation. All bones of
+    one color go to a single ``cv2.polylines`` call as two-point segments,
+    and so do the joints, as zero-length segments whose round caps draw the
+    dots. Joints named by ``incorrect_points``, and bones touching them, are
+    drawn in ``incorrect_color``. Joints below ``min_visibility`` or
+    missing (NaN rows) are skipped.
+    """
+
+    def __init__(self, color=(0, 255, 0), incorrect_color=(0, 0, 255), radius=5, thickness=2,
+                 joints=BODY_JOINTS, connections=BODY_CONNECTIONS, min_visibility=0.0):
+        self.color = color
+        self.incorrect_color = incorrect_color
+        self.radius = radius
+        self.thickness = thickness
+        self.joints = np.asarray(joints)
+        self.connections = np.asarray(connections)
+        # Each joint as a zero-length segment, gathered in the same fancy index as the bones
+        self._dot_index = np.repeat(self.joints[:, None], 2, axis=1)
+        self.min_visibility = min_visibility
+
+    @staticmethod
+    def to_pixels(landmarks, frame_shape, visible=None):
+        """Normalized (33, 4) landmarks to (33, 2) int32 pixel coordinates.
+
+        Landmarks that are not ``visible`` (default: NaN ones) map to (0, 0).
+        """
+        height, width = frame_shape[:2]
+        if visible is None:
+            visible = ~np.isnan(landmarks[:, :2]).any(axis=1)
+        xy = landmarks[:, :2] * np.array([width, height], dtype=np.float32)
+        xy[~visible] = 0
+        return np.rint(xy, out=xy).astype(np.int32)
+
+    def draw(self, frame, landmarks, incorrect_points=(), color=None):
+        """Draw the skeleton onto ``frame`` in place and return it.
+
+        ``color`` overrides the color of correct joints, e.g. to show the
+        overall verdict when there is no per-joint feedback.
+        """
+        landmarks = as_landmark_array(landmarks)
+        color = color or self.color
+        # False for NaN rows too, i.e. frames or joints without a detection
+        visible = landmarks[:, 3] >= self.min_visibility
+        pixels = self.to_pixels(landmarks, frame.shape, visible)
+        segments = pixels[self.connections]
+        dots = pixels[self._dot_index]
+
+        if not incorrect_points and visible.all():
+            # Common case: the whole body in one color, two calls
+            cv2.polylines(frame, segments, False, color, self.thickness)
+            cv2.polylines(frame, dots, False, color, 2 * self.radius)
+            return frame
+
+        incorrect = incorrect_joint_mask(incorrect_points, landmarks)
+        bone_visible = visible[self.connections].all(axis=1)
+        joint_visible = visible[self.joints]
+        bad_bones = incorrect[self.connections].any(axis=1)
+        bad_joints = incorrect[self.joints]
+        for bone_mask, joint_mask, draw_color in (
+                (bone_visible & ~bad_bones, joint_visible & ~bad_joints, color),
+                (bone_visible & bad_bones, joint_visible & bad_joints, self.incorrect_color)):
+            if bone_mask.any():
+                cv2.polylines(frame, segments[bone_mask], False, draw_color, self.thickness)
+            if joint_mask.any():
+                cv2.polylines(frame, dots[joint_mask], False, draw_color, 2 * self.radius)
+        return frame
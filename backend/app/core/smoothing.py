@@ -0,0 +1,80 @@
+import time
+import numpy as np
+from app.config import Config
+
+def _alpha(cutoff, dt):
+    """Smoothing factor of a first-order low-pass filter at ``cutoff`` Hz (scalar or array)."""
+    tau = 1.0 / (2 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+class OneEuroFilter:
+    """One-Euro filter over every element of an array at once.
+
+    A low-pass filter whose cutoff rises with the element's speed: still
+    joints are smoothed hard (cutoff ``min_cutoff`` Hz) so they stop
+    jittering, while fast-moving ones follow with little lag (``beta`` sets
+    how quickly the cutoff grows with speed). State is kept per element, so
+    one filter covers all joints of a frame in a few vectorized operations.
+    NaN inputs leave that element's state alone. After a gap longer than
+    ``max_gap`` seconds the filter restarts from the new value.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0, max_gap=0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self._value = None
+        self._speed = None
+        self._timestamp = None
+
+    def __call__(self, value, timestamp):
+        value = np.asarray(value, dtype=np.float32)
+        dt = None if self._timestamp is None else timestamp - self._timestamp
+        if dt is None or not 0 < dt <= self.max_gap or self._value.shape != value.shape:
+            self._value = value.copy()
+            self._speed = np.zeros_like(value)
+            self._timestamp = timestamp
+            return value.copy()
+
+        present = ~np.isnan(value)
+        previous = np.where(np.isnan(self._value), value, self._value)
+        speed = (value - previous) / dt
+        speed = self._speed + _alpha(self.d_cutoff, dt) * (speed - self._speed)
+        cutoff = self.min_cutoff + self.beta * np.abs(speed)
+        smoothed = previous + _alpha(cutoff, dt) * (value - previous)
+
+        self._value = np.where(present, smoothed, self._value)
+        self._speed = np.where(present, speed, self._speed)
+        self._timestamp = timestamp
+        return np.where(present, smoothed, value).astype(np.float32)
+
+class LandmarkSmoother:
+    """Temporal smoothing of (33, 4) landmark arrays from one tracked person.
+
+    x, y and z go through a OneEuroFilter; visibility passes through as
+    detected. Defaults come from Config.LANDMARK_SMOOTHING_*. Frames are
+    timed with ``time.perf_counter()`` unless a timestamp in seconds is given.
+    """
+
+    def __init__(self, min_cutoff=None, beta=None, d_cutoff=1.0, max_gap=0.5):
+        self.filter = OneEuroFilter(
+            min_cutoff=Config.LANDMARK_SMOOTHING_MIN_CUTOFF if min_cutoff is None else min_cutoff,
+            beta=Config.LANDMARK_SMOOTHING_BETA if beta is None else beta,
+            d_cutoff=d_cutoff,
+            max_gap=max_gap
+        )
+
+    def reset(self):
+        self.filter.reset()
+
+    def smooth(self, landmarks, timestamp=None):
+        """Return a smoothed copy of one frame's landmarks."""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        smoothed = np.array(landmarks, dtype=np.float32)
+        smoothed[:, :3] = self.filter(smoothed[:, :3], timestamp)
+        return smoothed
@@ -0,0 +1,189 @@
+import random
+from collections import Counter
+import cv2
+import numpy as np
+from .landmarks import NUM_LANDMARKS
+from .rep_counter import update_rep_count
+
+def open_video(source):
+    """Open a video file, device index or stream URL with OpenCV."""
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        cap.release()
+        raise ValueError(f"Could not open video: {source}")
+    return cap
+
+def clip_start(total_frames, length, stride=1, random_offset=True):
+    """Pick the first frame of a ``length``-frame window sampled every ``stride`` frames.
+
+    Random offsets are drawn from the ``random`` module, which PyTorch seeds
+    differently in every DataLoader worker. Without one the window is centered.
+    """
+    span = (length - 1) * stride + 1
+    slack = max(int(total_frames) - span, 0)
+    return random.randint(0, slack) if random_offset else slack // 2
+
+def read_clip(cap, start, length, stride=1, out=None):
+    """Decode ``length`` frames every ``stride`` frames from ``start`` into a uint8 buffer.
+
+    Seeks to ``start`` and only decodes the frames in the window: frames
+    between samples are skipped with grab(), which does not convert them to
+    BGR. Each frame is decoded straight into ``out`` (allocated as
+    (length, H, W, 3) uint8 if not given), so peak memory is one clip. Past
+    the end of the video the last decoded frame is repeated. Returns
+    ``(out, frames_read)``; the capture is left open.
+    """
+    if out is None:
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        out = np.zeros((length, height, width, 3), dtype=np.uint8)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    frames_read = 0
+    for i in range(length):
+        if i and not all(cap.grab() for _ in range(stride - 1)):
+            break
+        ret, frame = cap.read(out[i])
+        if not ret:
+            break
+        if frame.shape != out.shape[1:]:  # e.g. a rotated stream: fit it into the buffer
+            out[i] = cv2.resize(frame, (out.shape[2], out.shape[1]))
+        frames_read += 1
+    if 0 < frames_read < length:
+        out[frames_read:] = out[frames_read - 1]
+    return out, frames_read
+
+def analyze_frame(pose_detector, frame, exercise_type, rep_counters=None):
+    """Detect landmarks in one BGR frame and validate form.
+
+    Returns a result dict with ``pose_detected`` and, when a pose is found,
+    the (33, 4) landmark array plus the validator's feedback. Pass
+    ``exercise_type='auto'`` to identify the exercise first. With a
+    ``rep_counters`` dict, kept by the caller across frames, results for
+    exercises with reps also carry ``reps``, ``rep_phase`` and
+    ``rep_completed``.
+    """
+    try:
+        landmarks = pose_detector.detect_landmarks(frame)
+    except ValueError:
+        # No pose in this frame
+        return {'pose_detected': False}
+
+    if exercise_type == 'auto':
+        exercise_type = pose_detector.identify_exercise(landmarks)
+    feedback = pose_detector.validate_form(landmarks, exercise_type)
+    result = {
+        'pose_detected': True,
+        'exercise_type': exercise_type,
+        'landmarks': landmarks,
+        'feedback': feedback['feedback'],
+        'incorrect_points': feedback['incorrect_points'],
+        'is_correct': feedback['is_correct']
+    }
+    if rep_counters is not None:
+        rep_state = update_rep_count(rep_counters, exercise_type, pose_detector.features.angles(landmarks))
+        if rep_state is not None:
+            result.update(rep_state)
+    return result
+
+def analyze_video(cap, exercise_type, pose_detector):
+    """Decode frames one at a time and yield a result dict per frame.
+
+    Frames are read incrementally from ``cap`` so memory stays flat no matter
+    how long the video is. ``pose_detector`` should be a tracking-mode
+    PoseDetector (static_image_mode=False) dedicated to this video, so
+    MediaPipe can reuse the previous frame's ROI. Pass ``exercise_type='auto'``
+    to identify the exercise on every frame. Reps are counted per exercise
+    (see analyze_frame). Landmarks are yielded as the detector's (33, 4)
+    array; the capture is released when iteration ends.
+    """
+    frame_index = 0
+    rep_counters = {}
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            result = {
+                'frame': frame_index,
+                'timestamp_ms': cap.get(cv2.CAP_PROP_POS_MSEC)
+            }
+            result.update(analyze_frame(pose_detector, frame, exercise_type, rep_counters))
+            yield result
+            frame_index += 1
+    finally:
+        cap.release()
+
+def extract_landmarks(cap, pose_detector):
+    """Return an (N, 33, 4) float32 landmark array for every frame of ``cap``.
+
+    Frames without a pose are NaN. The capture is released when done.
+    """
+    frames = []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            try:
+                frames.append(pose_detector.detect_landmarks(frame))
+            except ValueError:
+                frames.append(None)  # No pose in this frame
+    finally:
+        cap.release()
+    return _stack_landmarks(frames)
+
+def _stack_landmarks(frames):
+    landmarks = np.full((len(frames), NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+    for i, frame_landmarks in enumerate(frames):
+        if frame_landmarks is not None:
+            landmarks[i] = frame_landmarks
+    return landmarks
+
+def score_video(cap, exercise_type, pose_detector):
+    """Analyze a whole video and return ``(landmarks, summary)``.
+
+    ``landmarks`` is an (N, 33, 4) float32 array with NaN rows for frames
+    without a pose. ``summary`` is a JSON-serializable dict with frame
+    counts, the share of frames with correct form, the most frequent
+    feedback, reps and seconds of correct plank hold.
+    """
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    feedback_counts = Counter()
+    exercise_counts = Counter()
+    reps = Counter()
+    pose_frames = correct_frames = plank_frames = 0
+
+    for result in analyze_video(cap, exercise_type, pose_detector):
+        if not result['pose_detected']:
+            frames.append(None)
+            continue
+
+        frames.append(result['landmarks'])
+        pose_frames += 1
+        exercise_counts[result['exercise_type']] += 1
+        feedback_counts.update(result['feedback'])
+        if result['is_correct']:
+            correct_frames += 1
+            if result['exercise_type'] == 'plank':
+                plank_frames += 1
+        if 'reps' in result:
+            reps[result['exercise_type']] = result['reps']
+
+    landmarks = _stack_landmarks(frames)
+    summary = {
+        'exercise_type': exercise_counts.most_common(1)[0][0] if exercise_counts else exercise_type,
+        'frames': len(frames),
+        'fps': fps,
+        'duration_s': len(frames) / fps,
+        'pose_frames': pose_frames,
+        'correct_frames': correct_frames,
+        'correct_ratio': correct_frames / pose_frames if pose_frames else 0.0,
+        'reps': sum(reps.values()),
+        'plank_hold_s': plank_frames / fps,
+        'feedback': dict(feedback_counts.most_common())
+    }
+    return landmarks, summary
@@ -4,12 +4,14 @@ from flask_jwt_extended import JWTManager
 from app.config import Config
 from app.commands import register_commands
 from app.db import db
+from app.utils.upload_limits import UploadLimitRequest
 
 # Initialize Flask extensions
 jwt = JWTManager()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
+    app.request_class = UploadLimitRequest
     app.config.from_object(config_class)
 
     # Initialize extensions
@@ -3,12 +3,48 @@ from torch.utils.data import Dataset
 import numpy as np
 import cv2
 import os
-from typing import List, Tuple, Dict
+import threading
+from typing import List, Tuple, Dict, Optional
+from app.core.landmark_cache import LandmarkCache
+from app.core.micro_batcher import MicroBatcher
+from app.core.video_analysis import clip_start, read_clip
+from app.models.model_registry import build_architecture, get_registry
+
+# Input resolution of the exercise classifier
+CLASSIFIER_INPUT_SIZE = 224
 
 class ExerciseDataset(Dataset):
-    def __init__(self, root_dir: str, transform=None):
+    """Exercise videos under ``root_dir/<exercise>/*.mp4``.
+
+    ``mode='frames'`` decodes every frame of the video on each access.
+    ``mode='landmarks'`` serves (T, 33, 4) landmark sequences from a
+    LandmarkCache in ``cache_dir`` instead, extracting a video the first time
+    it is seen; run scripts/extract_landmarks.py beforehand to fill the cache
+    up front.
+
+    With ``clip_length`` each access returns one window of ``clip_length``
+    frames taken every ``clip_stride`` frames, starting at a random offset
+    (or centered when ``random_offset`` is False). In frames mode only that
+    window is decoded, into a (clip_length, H, W, 3) uint8 tensor; converting
+    to float is left to the transform or the model.
+    """
+
+    def __init__(self, root_dir: str, transform=None, mode: str = 'frames',
+                 cache_dir: Optional[str] = None, detector_kwargs: Optional[Dict] = None,
+                 clip_length: Optional[int] = None, clip_stride: int = 1,
+                 random_offset: bool = True):
+        if mode not in ('frames', 'landmarks'):
+            raise ValueError(f"Unknown dataset mode: {mode}")
         self.root_dir = root_dir
         self.transform = transform
+        self.mode = mode
+        self.clip_length = clip_length
+        self.clip_stride = clip_stride
+        self.random_offset = random_offset
+        self.landmark_cache = None
+        if mode == 'landmarks':
+            self.landmark_cache = LandmarkCache(cache_dir or os.path.join(root_dir, '.landmarks'),
+                                                detector_kwargs)
         self.exercises = ['plank', 'squat']
         self.samples = []
         
@@ -30,6 +66,10 @@ class ExerciseDataset(Dataset):
     def __getitem__(self, idx):
         sample = self.samples[idx]
         video_path = sample['video_path']
+        if self.mode == 'landmarks':
+            return self._get_landmarks(sample)
+        if self.clip_length:
+            return self._get_clip(sample)
         
         # Read video frames
         cap = cv2.VideoCapture(video_path)
@@ -52,19 +92,105 @@ class ExerciseDataset(Dataset):
             'exercise': sample['exercise']
         }
 
+    def _get_clip(self, sample: Dict) -> Dict:
+        cap = cv2.VideoCapture(sample['video_path'])
+        try:
+            start = clip_start(cap.get(cv2.CAP_PROP_FRAME_COUNT), self.clip_length,
+                               self.clip_stride, self.random_offset)
+            frames, _ = read_clip(cap, start, self.clip_length, self.clip_stride)
+        finally:
+            cap.release()
+
+        if self.transform:
+            frames = self.transform(frames)
+
+        return {
+            'frames': torch.as_tensor(frames),
+            'label': torch.LongTensor([sample['label']])[0],
+            'exercise': sample['exercise']
+        }
+
+    def _get_landmarks(self, sample: Dict) -> Dict:
+        landmarks = self.landmark_cache.get(sample['video_path'])
+        if self.clip_length:
+            start = clip_start(len(landmarks), self.clip_length, self.clip_stride, self.random_offset)
+            landmarks = landmarks[start:start + (self.clip_length - 1) * self.clip_stride + 1:self.clip_stride]
+        # Copy out of the memory map; frames without a pose stay NaN
+        landmarks = np.array(landmarks)
+        if self.clip_length and 0 < len(landmarks) < self.clip_length:
+            # Short video: repeat the last frame, as read_clip does for frames
+            padding = np.repeat(landmarks[-1:], self.clip_length - len(landmarks), axis=0)
+            landmarks = np.concatenate([landmarks, padding])
+        if self.transform:
+            landmarks = self.transform(landmarks)
+
+        return {
+            'landmarks': torch.as_tensor(landmarks),
+            'label': torch.LongTensor([sample['label']])[0],
+            'exercise': sample['exercise']
+        }
+
 class RealTimePoseDetector:
-    def __init__(self, model_path: str = None):
+    """Frame-level exercise classifier.
+
+    ``process_frames`` classifies a list of frames in one forward pass.
+    ``submit_frame`` hands a frame to a MicroBatcher that groups frames from
+    concurrent sessions into such batches of up to ``max_batch_size``, waiting
+    at most ``max_wait_ms`` for a batch to fill.
+
+    The model is loaded on first use: from ``model_path`` (a state dict) if
+    given, otherwise ``model_name`` at ``model_version`` (default: latest) from
+    the local ModelRegistry, which shares one instance across all detectors.
+    """
+
+    def __init__(self, model_path: str = None, max_batch_size: int = 8, max_wait_ms: float = 5.0,
+                 model: Optional[torch.nn.Module] = None, model_name: str = 'exercise_classifier',
+                 model_version: Optional[str] = None):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.model = self._load_model(model_path)
+        self.model_path = model_path
+        self.model_name = model_name
+        self.model_version = model_version
+        if model is not None:
+            model.to(self.device)
+            model.eval()
+        self._model = model
         self.transform = self._get_transform()
+        self.max_batch_size = max_batch_size
+        # Reused across batches: resized BGR frames, RGB frames, and the float input
+        # tensor, pinned so the copy to the GPU can run asynchronously
+        size = CLASSIFIER_INPUT_SIZE
+        self._resized = np.empty((max_batch_size, size, size, 3), dtype=np.uint8)
+        self._rgb = np.empty((max_batch_size, size, size, 3), dtype=np.uint8)
+        self._input = torch.empty((max_batch_size, 3, size, size), dtype=torch.float32,
+                                  pin_memory=self.device.type == 'cuda')
+        self._lock = threading.Lock()
+        # Started on the first submitted frame, so detectors that only batch
+        # themselves through process_frames never run a batching thread
+        self.max_wait_ms = max_wait_ms
+        self._batcher = None
+        self._batcher_lock = threading.Lock()
         
+    @property
+    def batcher(self) -> MicroBatcher:
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = MicroBatcher(self.process_frames, self.max_batch_size, self.max_wait_ms,
+                                             name='classifier-batcher')
+            return self._batcher
+
+    @property
+    def model(self) -> torch.nn.Module:
+        if self._model is None:
+            if self.model_path:
+                self._model = self._load_model(self.model_path)
+            else:
+                self._model = get_registry().load(self.model_name, self.model_version, self.device)
+        return self._model
+
     def _load_model(self, model_path: str):
-        # Load your trained PyTorch model here
-        # This is a placeholder - you'll need to implement your actual model architecture
-        model = torch.hub.load('pytorch/vision:v0.10.0', 'resnet18', pretrained=True)
-        model.fc = torch.nn.Linear(model.fc.in_features, 2)  # 2 classes: plank and squat
-        if model_path:
-            model.load_state_dict(torch.load(model_path))
+        # Built locally rather than through torch.hub, so no network access is needed
+        model = build_architecture('resnet18', 2)  # 2 classes: plank and squat
+        model.load_state_dict(torch.load(model_path, map_location=self.device, weights_only=True))
         model.to(self.device)
         model.eval()
         return model
@@ -78,19 +204,49 @@ class RealTimePoseDetector:
         )
     
     def process_frame(self, frame: np.ndarray) -> Dict:
-        """Process a single frame and return pose detection results"""
-        # Preprocess frame
-        frame = cv2.resize(frame, (224, 224))
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = torch.FloatTensor(frame).permute(2, 0, 1).unsqueeze(0)
-        frame = frame.to(self.device)
-        
-        # Get prediction
-        with torch.no_grad():
-            output = self.model(frame)
-            probabilities = torch.nn.functional.softmax(output[0], dim=0)
-            
-        return {
-            'exercise_type': 'plank' if probabilities[1] > 0.5 else 'squat',
-            'confidence': float(probabilities[1] if probabilities[1] > 0.5 else probabilities[0])
-        } 
\ No newline at end of file
+        """Process a single frame and return pose detection results
+
+        Goes through the micro-batcher, so concurrent callers share forward passes.
+        """
+        return self.submit_frame(frame).result()
+
+    def submit_frame(self, frame: np.ndarray):
+        """Queue a frame for the next micro-batch; returns a Future of its result."""
+        return self.batcher.submit(frame)
+
+    def process_frames(self, frames: List[np.ndarray]) -> List[Dict]:
+        """Classify a list of BGR frames in batched forward passes."""
+        results = []
+        for start in range(0, len(frames), self.max_batch_size):
+            results.extend(self._process_batch(frames[start:start + self.max_batch_size]))
+        return results
+
+    def _process_batch(self, frames: List[np.ndarray]) -> List[Dict]:
+        n = len(frames)
+        size = CLASSIFIER_INPUT_SIZE
+        # The preprocessing buffers are shared, so one batch at a time
+        with self._lock:
+            # Preprocess into the reused buffers
+            for i, frame in enumerate(frames):
+                cv2.resize(frame, (size, size), dst=self._resized[i])
+            cv2.cvtColor(self._resized[:n].reshape(n * size, size, 3), cv2.COLOR_BGR2RGB,
+                         dst=self._rgb[:n].reshape(n * size, size, 3))
+            batch = self._input[:n]
+            batch.copy_(torch.from_numpy(self._rgb[:n]).permute(0, 3, 1, 2))
+            batch = batch.to(self.device, non_blocking=True)
+
+            # Get predictions
+            with torch.inference_mode():
+                output = self.model(batch)
+                probabilities = torch.nn.functional.softmax(output, dim=1).cpu().numpy()
+
+        return [{
+            'exercise_type': 'plank' if p[1] > 0.5 else 'squat',
+            'confidence': float(p[1] if p[1] > 0.5 else p[0])
+        } for p in probabilities]
+
+    def close(self):
+        """Stop the micro-batching thread, if one was started."""
+        with self._batcher_lock:
+            if self._batcher is not None:
+                self._batcher.close()
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+import torch
+import torchvision
+from app.config import Config
+
+MANIFEST_NAME = 'manifest.json'
+
+def build_architecture(architecture: str, num_classes: int) -> torch.nn.Module:
+    """Build an untrained torchvision classifier without touching the network."""
+    if architecture != 'resnet18':
+        raise ValueError(f"Unsupported architecture: {architecture}")
+    model = torchvision.models.resnet18(weights=None)
+    model.fc = torch.nn.Linear(model.fc.in_features, num_classes)
+    return model
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _verify_checksum(path: str, expected: Optional[str]) -> str:
+    """Return ``path`` if its sha256 matches the manifest's, or no checksum was recorded."""
+    if expected and _sha256(path) != expected:
+        raise ValueError(f"Checksum mismatch for {path}")
+    return path
+
+class ModelRegistry:
+    """Directory of versioned model weights described by ``manifest.json``.
+
+    The manifest maps each model name to its versions and a ``latest``
+    pointer. A version lists a ``weights`` file (a state dict for
+    ``architecture``) and optionally a ``torchscript`` file, which loads
+    without rebuilding the Python module and is preferred when present.
+    Both files are checked against the sha256 recorded next to them
+    (``sha256`` and ``torchscript_sha256``) before they are loaded.
+    Models are loaded lazily on first request and shared by every caller in
+    the process; nothing is fetched from the network.
+    """
+
+    def __init__(self, root: str, prefer_torchscript: bool = True):
+        self.root = root
+        self.prefer_torchscript = prefer_torchscript
+        self._models: Dict[tuple, torch.nn.Module] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[tuple, threading.Lock] = {}
+
+    def manifest(self) -> Dict:
+        path = os.path.join(self.root, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {'models': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def entry(self, name: str, version: Optional[str] = None) -> Dict:
+        """Return the manifest entry of ``name`` at ``version`` (default: latest)."""
+        models = self.manifest()['models']
+        if name not in models:
+            raise KeyError(f"Model {name!r} is not in the registry at {self.root}")
+        version = str(version or models[name]['latest'])
+        if version not in models[name]['versions']:
+            raise KeyError(f"Model {name!r} has no version {version!r}")
+        return {'version': version, **models[name]['versions'][version]}
+
+    def load(self, name: str, version: Optional[str] = None,
+             device: Optional[torch.device] = None) -> torch.nn.Module:
+        """Return the shared, eval-mode model, loading it on first use."""
+        device = torch.device(device or 'cpu')
+        entry = self.entry(name, version)
+        key = (name, entry['version'], str(device))
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available, but
+        # only once per key however many threads ask at the same time
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    return self._models[key]
+            model = self._load_entry(entry, device)
+            with self._lock:
+                self._models[key] = model
+        return model
+
+    def _load_entry(self, entry: Dict, device: torch.device) -> torch.nn.Module:
+        torchscript = entry.get('torchscript')
+        if self.prefer_torchscript and torchscript:
+            path = _verify_checksum(os.path.join(self.root, torchscript), entry.get('torchscript_sha256'))
+            model = torch.jit.load(path, map_location=device)
+        else:
+            path = _verify_checksum(os.path.join(self.root, entry['weights']), entry.get('sha256'))
+            model = build_architecture(entry['architecture'], entry['num_classes'])
+            model.load_state_dict(torch.load(path, map_location=device, weights_only=True))
+            model.to(device)
+        model.eval()
+        return model
+
+    def register(self, name: str, version: str, model: torch.nn.Module, architecture: str,
+                 num_classes: int, export_torchscript: bool = True,
+                 input_shape=(1, 3, 224, 224)) -> Dict:
+        """Save ``model`` as ``name`` ``version``, mark it latest and return its entry."""
+        os.makedirs(self.root, exist_ok=True)
+        model = model.to('cpu').eval()
+        entry = {
+            'architecture': architecture,
+            'num_classes': num_classes,
+            'weights': f"{name}-{version}.pt"
+        }
+        torch.save(model.state_dict(), os.path.join(self.root, entry['weights']))
+        entry['sha256'] = _sha256(os.path.join(self.root, entry['weights']))
+        if export_torchscript:
+            entry['torchscript'] = f"{name}-{version}.torchscript.pt"
+            with torch.no_grad():
+                scripted = torch.jit.trace(model, torch.zeros(input_shape))
+            scripted.save(os.path.join(self.root, entry['torchscript']))
+            entry['torchscript_sha256'] = _sha256(os.path.join(self.root, entry['torchscript']))
+
+        with self._lock:
+            manifest = self.manifest()
+            model_versions = manifest['models'].setdefault(name, {'versions': {}})
+            model_versions['versions'][str(version)] = entry
+            model_versions['latest'] = str(version)
+            path = os.path.join(self.root, MANIFEST_NAME)
+            with open(path + '.tmp', 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(path + '.tmp', path)
+        return {'version': str(version), **entry}
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide registry at Config.MODEL_REGISTRY_DIR."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry(Config.MODEL_REGISTRY_DIR)
+        return _default_registry
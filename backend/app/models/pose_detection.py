@@ -1,16 +1,30 @@
 import mediapipe as mp
 import numpy as np
 import cv2
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+from app.core.feature_cache import FrameFeatureCache
+from app.core.landmarks import as_landmark_array, keypoints_to_landmarks
+from app.core.model_tiers import resolve_model_complexity
+from app.core.sequence_classifier import load_exercise_classifier
+
+Keypoints = Dict[str, Tuple[float, float]]
+
+def _as_landmarks(keypoints: Union[Keypoints, np.ndarray]) -> np.ndarray:
+    """Accept either named keypoints or a (33, 4) landmark array."""
+    if isinstance(keypoints, dict):
+        return keypoints_to_landmarks(keypoints)
+    return as_landmark_array(keypoints)
 
 class PoseDetector:
-    def __init__(self):
+    def __init__(self, model_complexity: Union[int, str, None] = None):
         self.mp_pose = mp.solutions.pose
         self.pose = self.mp_pose.Pose(
+            model_complexity=resolve_model_complexity(model_complexity),
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5 
         )
         self.mp_drawing = mp.solutions.drawing_utils
+        self.features = FrameFeatureCache()
 
     def detect_pose(self, image: np.ndarray) -> Optional[Dict[str, Tuple[float, float]]]:
         """Detect pose keypoints in the image using MediaPipe"""
@@ -54,15 +68,16 @@ class PoseDetector:
         
         return keypoints
 
-    def detect_exercise_type(self, keypoints: Dict[str, Tuple[float, float]]) -> Tuple[str, float]:
+    def detect_exercise_type(self, keypoints: Union[Keypoints, np.ndarray]) -> Tuple[str, float]:
         """Detect if the person is doing a plank or squat"""
-        # Calculate key angles for exercise classification
-        hip_angle = self._calculate_angle(keypoints['left_shoulder'], 
-                                        keypoints['left_hip'], 
-                                        keypoints['left_knee'])
-        knee_angle = self._calculate_angle(keypoints['left_hip'], 
-                                         keypoints['left_knee'], 
-                                         keypoints['left_ankle'])
+        classifier = load_exercise_classifier()
+        if classifier is not None:
+            return classifier.classify(_as_landmarks(keypoints))
+
+        # Key angles for exercise classification (shoulder-hip-knee, hip-knee-ankle)
+        angles = self.features.angles(_as_landmarks(keypoints))
+        hip_angle = angles['left_back']
+        knee_angle = angles['left_hip']
         
         # Simple rule-based classification
         if hip_angle > 150 and knee_angle > 150:  # Body is straight
@@ -87,6 +102,8 @@ class PoseDetector:
 class ExerciseFormChecker:
     def __init__(self):
         self.pose_detector = PoseDetector()
+        # Share derived features with the detector that produced the keypoints
+        self.features = self.pose_detector.features
         self.exercise_standards = {
             'plank': {
                 'correct_angles': {
@@ -105,41 +122,35 @@ class ExerciseFormChecker:
             }
         }
     
-    def check_plank_form(self, keypoints: Dict[str, Tuple[float, float]]) -> List[str]:
+    def check_plank_form(self, keypoints: Union[Keypoints, np.ndarray]) -> List[str]:
         """Check if plank form is correct based on keypoints"""
         feedback = []
+        angles = self.features.angles(_as_landmarks(keypoints))
         
-        # Check shoulder angle
-        shoulder_angle = self._calculate_angle(keypoints['left_shoulder'], 
-                                            keypoints['left_elbow'], 
-                                            keypoints['left_wrist'])
+        # Check shoulder angle (shoulder-elbow-wrist)
+        shoulder_angle = angles['left_shoulder']
         if not self._is_angle_in_range(shoulder_angle, self.exercise_standards['plank']['correct_angles']['shoulder']):
             feedback.append("Keep your shoulders directly above your elbows")
             
-        # Check hip alignment
-        hip_angle = self._calculate_angle(keypoints['left_shoulder'], 
-                                       keypoints['left_hip'], 
-                                       keypoints['left_knee'])
+        # Check hip alignment (shoulder-hip-knee)
+        hip_angle = angles['left_back']
         if not self._is_angle_in_range(hip_angle, self.exercise_standards['plank']['correct_angles']['hip']):
             feedback.append("Keep your body straight from shoulders to hips")
             
         return feedback
     
-    def check_squat_form(self, keypoints: Dict[str, Tuple[float, float]]) -> List[str]:
+    def check_squat_form(self, keypoints: Union[Keypoints, np.ndarray]) -> List[str]:
         """Check if squat form is correct based on keypoints"""
         feedback = []
+        angles = self.features.angles(_as_landmarks(keypoints))
         
-        # Check hip angle
-        hip_angle = self._calculate_angle(keypoints['left_shoulder'], 
-                                       keypoints['left_hip'], 
-                                       keypoints['left_knee'])
+        # Check hip angle (shoulder-hip-knee)
+        hip_angle = angles['left_back']
         if not self._is_angle_in_range(hip_angle, self.exercise_standards['squat']['correct_angles']['hip']):
             feedback.append("Keep your back straight and chest up")
             
-        # Check knee angle
-        knee_angle = self._calculate_angle(keypoints['left_hip'], 
-                                        keypoints['left_knee'], 
-                                        keypoints['left_ankle'])
+        # Check knee angle (hip-knee-ankle)
+        knee_angle = angles['left_hip']
         if not self._is_angle_in_range(knee_angle, self.exercise_standards['squat']['correct_angles']['knee']):
             feedback.append("Keep your knees aligned with your toes")
             
@@ -1,47 +1,57 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from app.core.pose_detection import PoseDetector
+from app.core.detector_pool import PoseDetectorPool
 from app.core.exercise_instructions import ExerciseInstructions
-import base64
-import numpy as np
-import cv2
+from app.core.pose_detection import validate_form
+from app.config import Config
+from app.utils.image_decoding import get_request_frame
+from app.utils.feedback_delta import with_feedback_delta
+from app.utils.landmark_encoding import landmark_response
 
 pose_detection_bp = Blueprint('pose_detection', __name__)
-pose_detector = PoseDetector()
+# Pooled graphs share the cores, so they keep their tier instead of a latency budget
+pose_detector_pool = PoseDetectorPool(
+    size=Config.POSE_DETECTOR_POOL_SIZE,
+    timeout=Config.POSE_DETECTOR_POOL_TIMEOUT,
+    detector_kwargs={
+        'static_image_mode': True
+    }
+)
 exercise_instructions = ExerciseInstructions()
 
 @pose_detection_bp.route('/analyze', methods=['POST'])
 @jwt_required()
 def analyze_pose():
     try:
-        data = request.get_json()
-        exercise_type = data.get('exercise_type')
-        image_data = data.get('image')  # Base64 encoded image
+        # Raw image body (exercise_type in the query string) or JSON with a base64 image
+        exercise_type, frame = get_request_frame()
         
-        if not image_data or not exercise_type:
+        if frame is None or not exercise_type:
             return jsonify({
                 'error': 'Missing image or exercise type'
             }), 400
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
-        
-        # Convert bytes to numpy array
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
         # Process the image
-        landmarks = pose_detector.detect_landmarks(frame)
-        feedback = pose_detector.validate_form(landmarks, exercise_type)
+        with pose_detector_pool.detector() as pose_detector:
+            landmarks = pose_detector.detect_landmarks(frame)
+            # Auto-detection shares cached angles with the form validation below
+            if exercise_type == 'auto':
+                exercise_type = pose_detector.identify_exercise(landmarks)
+            feedback = pose_detector.validate_form(landmarks, exercise_type)
         
-        return jsonify({
+        # JSON by default, packed binary or MessagePack on request via Accept;
+        # only feedback changes when the client names a session
+        return landmark_response(with_feedback_delta({
+            'exercise_type': exercise_type,
             'landmarks': landmarks,
             'feedback': feedback['feedback'],
             'incorrect_points': feedback['incorrect_points'],
             'is_correct': feedback['is_correct']
-        }), 200
+        }), 200)
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except TimeoutError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
@@ -58,13 +68,14 @@ def get_form_feedback():
                 'error': 'Missing landmarks or exercise type'
             }), 400
         
-        feedback = pose_detector.validate_form(landmarks, exercise_type)
+        # Angle math on the client's landmarks: no MediaPipe graph needed
+        feedback = validate_form(landmarks, exercise_type)
         
-        return jsonify({
+        return jsonify(with_feedback_delta({
             'feedback': feedback['feedback'],
             'incorrect_points': feedback['incorrect_points'],
             'is_correct': feedback['is_correct']
-        }), 200
+        })), 200
     except Exception as e:
         return jsonify({'message': str(e)}), 400
 
@@ -72,29 +83,24 @@ def get_form_feedback():
 @jwt_required()
 def calibrate_pose():
     try:
-        data = request.get_json()
-        exercise_type = data.get('exercise_type')
-        image_data = data.get('image')
+        # Raw image body (exercise_type in the query string) or JSON with a base64 image
+        exercise_type, frame = get_request_frame()
         
-        if not image_data or not exercise_type:
+        if frame is None or not exercise_type:
             return jsonify({
                 'error': 'Missing image or exercise type'
             }), 400
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
-        
-        # Convert bytes to numpy array
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
         # Process the image
-        landmarks = pose_detector.detect_landmarks(frame)
-        pose_detector.store_calibration(exercise_type, landmarks)
+        with pose_detector_pool.detector() as pose_detector:
+            landmarks = pose_detector.detect_landmarks(frame)
+        pose_detector_pool.store_calibration(exercise_type, landmarks)
         
         return jsonify({
             'message': 'Calibration successful'
         }), 200
+    except TimeoutError as e:
+        return jsonify({'message': str(e)}), 503
     except Exception as e:
         return jsonify({'message': str(e)}), 400
 
@@ -0,0 +1,30 @@
+from flask import request
+from flask_jwt_extended import get_jwt_identity
+from app.core.feedback_diff import FeedbackSessionStore
+
+# Shared by every blueprint so a session_id means the same thing on all endpoints
+feedback_sessions = FeedbackSessionStore()
+
+def request_session_id():
+    """The optional ``session_id`` of the current request, from the query string or JSON body."""
+    session_id = request.args.get('session_id')
+    if session_id is None and request.is_json:
+        session_id = (request.get_json(silent=True) or {}).get('session_id')
+    return session_id
+
+def with_feedback_delta(payload):
+    """Replace ``feedback``/``incorrect_points`` with a delta when the request names a session.
+
+    Clients that send a ``session_id`` get ``feedback_delta`` (see
+    FeedbackDiffer) instead of the full lists, so an unchanged form costs a
+    few bytes and nothing to re-render. Without one the payload is unchanged.
+    """
+    session_id = request_session_id()
+    if not session_id:
+        return payload
+    payload = dict(payload)
+    feedback = payload.pop('feedback', [])
+    incorrect_points = payload.pop('incorrect_points', [])
+    payload['feedback_delta'] = feedback_sessions.delta((get_jwt_identity(), session_id),
+                                                        feedback, incorrect_points)
+    return payload
@@ -0,0 +1,61 @@
+import base64
+import cv2
+import numpy as np
+from flask import request
+
+# Request content types carrying an encoded image directly in the body
+RAW_IMAGE_MIMETYPES = ('image/jpeg', 'image/png', 'application/octet-stream')
+
+def decode_image_buffer(buffer):
+    """Decode an encoded image held in any buffer-protocol object into a BGR frame."""
+    frame = cv2.imdecode(np.frombuffer(buffer, np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Could not decode image")
+    return frame
+
+def decode_base64_image(image_data):
+    """Decode a base64 image, optionally wrapped in a data URL, into a BGR frame."""
+    image_bytes = base64.b64decode(image_data.split(',')[1] if ',' in image_data else image_data)
+    return decode_image_buffer(image_bytes)
+
+def read_request_body():
+    """Read the raw request body into a single buffer.
+
+    With a Content-Length the body is read straight into one preallocated
+    bytearray, which cv2.imdecode then reads through np.frombuffer without
+    any further copies. Chunked bodies fall back to a single read().
+    """
+    length = request.content_length
+    stream = request.stream
+    if not length or not hasattr(stream, 'readinto'):
+        return stream.read()
+
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    received = 0
+    while received < length:
+        count = stream.readinto(view[received:])
+        if not count:
+            break
+        received += count
+    return view[:received]
+
+def is_raw_image_request():
+    """Whether the request body is an encoded image rather than JSON."""
+    return request.mimetype in RAW_IMAGE_MIMETYPES
+
+def get_request_frame():
+    """Return ``(exercise_type, frame)`` from the current request.
+
+    Raw image requests carry the exercise type in the query string; JSON
+    requests carry it next to a base64 ``image`` field. ``frame`` is None when
+    no image was sent.
+    """
+    if is_raw_image_request():
+        exercise_type = request.args.get('exercise_type')
+        body = read_request_body()
+        return exercise_type, decode_image_buffer(body) if len(body) else None
+
+    data = request.get_json()
+    image_data = data.get('image')  # Base64 encoded image
+    return data.get('exercise_type'), decode_base64_image(image_data) if image_data else None
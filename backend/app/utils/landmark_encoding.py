@@ -0,0 +1,99 @@
+import json
+import struct
+import msgpack
+import numpy as np
+from flask import Response, jsonify, request
+from app.config import Config
+from app.core.landmarks import LANDMARK_FIELDS, as_landmark_array, landmarks_to_dicts
+
+JSON_MIMETYPE = 'application/json'
+BINARY_MIMETYPE = 'application/vnd.gymtastic.landmarks'
+MSGPACK_MIMETYPE = 'application/msgpack'
+# JSON first so clients accepting */* keep getting JSON
+RESPONSE_MIMETYPES = (JSON_MIMETYPE, BINARY_MIMETYPE, MSGPACK_MIMETYPE, 'application/x-msgpack')
+
+# Packed binary layout (little-endian):
+#   header   magic "GTLM", version, dtype code, flags, reserved,
+#            landmark rows, fields per landmark, metadata length
+#   body     rows * fields values of the given dtype
+#   trailer  UTF-8 JSON with the remaining response fields
+BINARY_MAGIC = b'GTLM'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sBBBBHHI')
+DTYPE_CODES = {'float16': 1, 'float32': 2}
+DTYPES_BY_CODE = {code: np.dtype(name).newbyteorder('<') for name, code in DTYPE_CODES.items()}
+FLAG_POSE_DETECTED = 0x01
+FLAG_IS_CORRECT = 0x02
+
+def _split_payload(payload):
+    """Separate the landmark array from the rest of a response payload."""
+    metadata = dict(payload)
+    landmarks = metadata.pop('landmarks', None)
+    if landmarks is not None:
+        landmarks = as_landmark_array(landmarks)
+    return landmarks, metadata
+
+def pack_landmarks(payload, dtype=None):
+    """Encode a response payload in the packed binary landmark format."""
+    dtype = dtype or Config.LANDMARK_BINARY_DTYPE
+    landmarks, metadata = _split_payload(payload)
+    if landmarks is None:
+        landmarks = np.empty((0, len(LANDMARK_FIELDS)), dtype=np.float32)
+
+    flags = 0
+    if landmarks.size:
+        flags |= FLAG_POSE_DETECTED
+    if metadata.get('is_correct'):
+        flags |= FLAG_IS_CORRECT
+    trailer = json.dumps(metadata, separators=(',', ':')).encode('utf-8')
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, DTYPE_CODES[dtype], flags, 0,
+                                landmarks.shape[0], landmarks.shape[1], len(trailer))
+    body = landmarks.astype(DTYPES_BY_CODE[DTYPE_CODES[dtype]], copy=False).tobytes()
+    return header + body + trailer
+
+def unpack_landmarks(data):
+    """Decode the packed binary format back into a payload dict with a float32 array."""
+    magic, version, dtype_code, flags, _, rows, fields, trailer_length = \
+        BINARY_HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError("Not a landmark payload")
+    dtype = DTYPES_BY_CODE[dtype_code]
+    offset = BINARY_HEADER.size
+    body_length = rows * fields * dtype.itemsize
+    landmarks = np.frombuffer(data, dtype=dtype, count=rows * fields, offset=offset)
+    trailer = bytes(data[offset + body_length:offset + body_length + trailer_length])
+    payload = json.loads(trailer.decode('utf-8'))
+    payload['landmarks'] = landmarks.reshape(rows, fields).astype(np.float32) if rows else None
+    return payload
+
+def msgpack_landmarks(payload, dtype=None):
+    """Encode a response payload as MessagePack with the landmarks as a raw typed buffer."""
+    dtype = dtype or Config.LANDMARK_BINARY_DTYPE
+    landmarks, metadata = _split_payload(payload)
+    if landmarks is not None:
+        metadata['landmarks'] = {
+            'dtype': dtype,
+            'shape': list(landmarks.shape),
+            'data': landmarks.astype(np.dtype(dtype).newbyteorder('<'), copy=False).tobytes()
+        }
+    return msgpack.packb(metadata, use_bin_type=True)
+
+def landmark_response(payload, status=200):
+    """Return ``payload`` in the format the client asked for in its Accept header.
+
+    Defaults to JSON with landmarks as a list of dicts. ``payload['landmarks']``
+    may be a landmark array or None.
+    """
+    mimetype = request.accept_mimetypes.best_match(RESPONSE_MIMETYPES, default=JSON_MIMETYPE)
+    if mimetype == BINARY_MIMETYPE:
+        response = Response(pack_landmarks(payload), mimetype=BINARY_MIMETYPE)
+    elif mimetype in (MSGPACK_MIMETYPE, 'application/x-msgpack'):
+        response = Response(msgpack_landmarks(payload), mimetype=mimetype)
+    else:
+        payload = dict(payload)
+        if payload.get('landmarks') is not None:
+            payload['landmarks'] = landmarks_to_dicts(payload['landmarks'])
+        response = jsonify(payload)
+    response.status_code = status
+    response.vary.add('Accept')
+    return response
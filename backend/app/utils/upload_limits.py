@@ -0,0 +1,23 @@
+from flask import Request, current_app
+
+def upload_limit(config_key):
+    """Give a view its own request body limit, read from ``config_key``.
+
+    Flask applies MAX_CONTENT_LENGTH to every request; views that accept
+    large uploads, such as whole workout videos, name a larger limit here.
+    """
+    def decorator(view):
+        view.upload_limit_key = config_key
+        return view
+    return decorator
+
+class UploadLimitRequest(Request):
+    """Request that honours the body limit set on its view with ``upload_limit``."""
+
+    @property
+    def max_content_length(self):
+        view = current_app.view_functions.get(self.endpoint) if self.url_rule else None
+        config_key = getattr(view, 'upload_limit_key', None)
+        if config_key is not None:
+            return current_app.config[config_key]
+        return super().max_content_length
@@ -1,6 +1,7 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from app.core.pose_detection import PoseDetector
+from app.core.landmarks import landmarks_to_dicts
 from app.core.user import UserManager
 from app.utils.auth import token_required
 from app.utils.error_handler import handle_error
@@ -62,7 +63,7 @@ def detect_pose(current_user):
     try:
         frame = request.json.get('frame')
         landmarks = pose_detector.detect_landmarks(frame)
-        return jsonify({"landmarks": landmarks})
+        return jsonify({"landmarks": landmarks_to_dicts(landmarks)})
     except Exception as e:
         return handle_error(e)
 
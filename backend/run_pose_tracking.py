@@ -1,15 +1,23 @@
+import argparse
 from app.core.realtime_pose_tracker import RealtimePoseTracker
 
 def main():
+    parser = argparse.ArgumentParser(description="Real-time exercise form tracking")
+    parser.add_argument('--source', help="camera index, video file or stream URL (default: CAMERA_SOURCE)")
+    parser.add_argument('--headless', action='store_true',
+                        help="run without a window until the source ends, then print the stage report")
+    args = parser.parse_args()
+
     print("Starting Real-Time Pose Tracking System...")
-    print("Make sure you have a webcam connected and proper lighting.")
-    print("\nControls:")
-    print("- Press '1' to track Squats")
-    print("- Press '2' to track Planks")
-    print("- Press 'q' to quit")
+    if not args.headless:
+        print("Make sure you have a webcam connected and proper lighting.")
+        print("\nControls:")
+        print("- Press '1' to track Squats")
+        print("- Press '2' to track Planks")
+        print("- Press 'q' to quit")
     
     tracker = RealtimePoseTracker()
-    tracker.run()
+    tracker.run(args.source, display=not args.headless)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
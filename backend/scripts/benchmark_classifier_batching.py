@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+import threading
+import time
+import numpy as np
+import torch
+import torchvision
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.dataset import RealTimePoseDetector
+
+def make_model():
+    """ResNet18 with the classifier's two-class head; weights don't affect timing."""
+    model = torchvision.models.resnet18(weights=None)
+    model.fc = torch.nn.Linear(model.fc.in_features, 2)
+    return model
+
+def run_clients(detector, clients, duration, frame):
+    """Closed loop: each client submits its next frame as soon as the last one returns."""
+    latencies = [[] for _ in range(clients)]
+    stop_at = time.perf_counter() + duration
+
+    def client(samples):
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            detector.submit_frame(frame).result()
+            samples.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(samples,)) for samples in latencies]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return np.concatenate([np.array(samples) for samples in latencies]), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput versus latency of micro-batched classification.")
+    parser.add_argument('--clients', default='1,4,8,16', help="comma-separated concurrent session counts")
+    parser.add_argument('--batch-sizes', default='1,4,8,16', help="comma-separated max batch sizes")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds per configuration")
+    parser.add_argument('--threads', type=int, default=None, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    frame = np.random.default_rng(0).integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+    model = make_model()
+
+    print(f"device: {'cuda' if torch.cuda.is_available() else 'cpu'}, torch threads: {torch.get_num_threads()}, "
+          f"max wait {args.max_wait_ms} ms, {args.duration}s per row")
+    print(f"{'clients':>8}{'max batch':>11}{'mean batch':>12}{'frames/s':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for clients in (int(value) for value in args.clients.split(',')):
+        for batch_size in (int(value) for value in args.batch_sizes.split(',')):
+            detector = RealTimePoseDetector(model=model, max_batch_size=batch_size,
+                                            max_wait_ms=args.max_wait_ms)
+            detector.process_frame(frame)  # Warm-up
+            latencies, elapsed = run_clients(detector, clients, args.duration, frame)
+            detector.close()
+            print(f"{clients:>8}{batch_size:>11}{detector.batcher.mean_batch_size():>12.1f}"
+                  f"{len(latencies) / elapsed:>10.1f}{1000 * np.median(latencies):>9.1f}"
+                  f"{1000 * np.percentile(latencies, 95):>9.1f}")
+
+if __name__ == "__main__":
+    main()
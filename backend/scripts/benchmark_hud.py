@@ -0,0 +1,93 @@
+import argparse
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.hud import FONT, HudOverlay
+from app.core.skeleton import BODY_CONNECTIONS, SkeletonRenderer
+
+LINES = [("Exercise: squat", (0, 255, 0)), ("Reps: 3 (eccentric)", (0, 255, 0)),
+         ("Try going lower", (0, 0, 255)), ("Keep your back straight", (0, 0, 255))]
+
+def draw_full_frame(frame, lines):
+    """Per-frame HUD as drawn before: copy and blend the whole frame, then rasterize every line."""
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (0, 0), (300, 150), (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+    for i, (text, color) in enumerate(lines):
+        cv2.putText(frame, text, (10, 30 * (i + 1)), FONT, 0.7, color, 2)
+
+def standing_pose():
+    """A person standing mid-frame, about two thirds of its height."""
+    body = {11: (0.45, 0.30), 12: (0.55, 0.30), 13: (0.42, 0.42), 14: (0.58, 0.42),
+            15: (0.41, 0.52), 16: (0.59, 0.52), 23: (0.47, 0.55), 24: (0.53, 0.55),
+            25: (0.47, 0.72), 26: (0.53, 0.72), 27: (0.47, 0.88), 28: (0.53, 0.88),
+            29: (0.46, 0.90), 30: (0.54, 0.90), 31: (0.49, 0.91), 32: (0.51, 0.91)}
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    landmarks[:, :2] = (0.5, 0.22)  # Face
+    landmarks[17:23, :2] = [body[15 + i % 2] for i in range(6)]  # Hands at the wrists
+    for index, xy in body.items():
+        landmarks[index, :2] = xy
+    landmarks[:, 3] = 1.0
+    return landmarks
+
+def draw_skeleton_loop(frame, landmarks):
+    """Skeleton as drawn before: one cv2.circle per joint and one cv2.line per bone."""
+    h, w, _ = frame.shape
+    for idx in range(11, 33):
+        cv2.circle(frame, (int(landmarks[idx, 0] * w), int(landmarks[idx, 1] * h)), 5, (0, 255, 0), -1)
+    for start_idx, end_idx in BODY_CONNECTIONS:
+        start = (int(landmarks[start_idx, 0] * w), int(landmarks[start_idx, 1] * h))
+        end = (int(landmarks[end_idx, 0] * w), int(landmarks[end_idx, 1] * h))
+        cv2.line(frame, start, end, (0, 255, 0), 2)
+
+def time_per_frame(draw, frames, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        draw(frames[i % len(frames)], i)
+    return 1e6 * (time.perf_counter() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame cost of drawing the live HUD and skeleton.")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--change-every', type=int, default=30,
+                        help="frames between HUD text changes, e.g. the FPS counter once a second")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8) for _ in range(4)]
+    hud = HudOverlay(width=300, max_lines=5)
+
+    def lines_at(i):
+        return [(f"FPS: {i // args.change_every}", (0, 255, 0))] + LINES
+
+    def draw_cached(frame, i):
+        hud.set_lines(lines_at(i))
+        hud.draw(frame)
+
+    before = time_per_frame(lambda frame, i: draw_full_frame(frame, lines_at(i)), frames, args.iterations)
+    after = time_per_frame(draw_cached, frames, args.iterations)
+    print(f"{args.width}x{args.height}, text changing every {args.change_every} frames")
+    print(f"full-frame blend + putText: {before:8.1f} us/frame")
+    print(f"HudOverlay:                 {after:8.1f} us/frame ({after / before:.1%}), "
+          f"{hud.renders} line renders in {args.iterations} frames")
+
+    landmarks = standing_pose()
+    skeleton = SkeletonRenderer()
+    before = time_per_frame(lambda frame, i: draw_skeleton_loop(frame, landmarks), frames, args.iterations)
+    uniform = time_per_frame(lambda frame, i: skeleton.draw(frame, landmarks), frames, args.iterations)
+    per_joint = time_per_frame(lambda frame, i: skeleton.draw(frame, landmarks, ['depth']),
+                               frames, args.iterations)
+    print(f"skeleton, per-joint loop:   {before:8.1f} us/frame")
+    print(f"SkeletonRenderer:           {uniform:8.1f} us/frame ({uniform / before:.1%}), "
+          f"{per_joint:.1f} us/frame with incorrect joints ({per_joint / before:.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from flask import Flask
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.image_decoding import get_request_frame
+
+def make_test_jpeg(width, height, quality):
+    """Encode a noisy synthetic frame so the JPEG size resembles a camera frame."""
+    rng = np.random.default_rng(0)
+    frame = cv2.GaussianBlur(rng.integers(0, 256, (height, width, 3), dtype=np.uint8), (7, 7), 0)
+    ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return encoded.tobytes()
+
+def time_request(app, body, content_type, query_string):
+    """Return seconds spent parsing one request body and decoding its frame."""
+    with app.test_request_context('/analyze', method='POST', data=body,
+                                  content_type=content_type, query_string=query_string):
+        start = time.perf_counter()
+        exercise_type, frame = get_request_frame()
+        elapsed = time.perf_counter() - start
+    assert frame is not None and exercise_type == 'squat'
+    return elapsed
+
+def time_decode(jpeg):
+    """Return seconds spent decoding the JPEG alone, which both paths pay."""
+    start = time.perf_counter()
+    cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare base64 JSON and raw JPEG frame ingestion.")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--quality', type=int, default=90)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    jpeg = make_test_jpeg(args.width, args.height, args.quality)
+    json_body = json.dumps({
+        'exercise_type': 'squat',
+        'image': 'data:image/jpeg;base64,' + base64.b64encode(jpeg).decode('ascii')
+    }).encode()
+
+    # Interleave the paths so CPU frequency drift affects all of them equally
+    timings = {'decode': [], 'json': [], 'raw': []}
+    for i in range(args.iterations + 10):
+        decode = time_decode(jpeg)
+        json_path = time_request(app, json_body, 'application/json', None)
+        raw_path = time_request(app, jpeg, 'image/jpeg', {'exercise_type': 'squat'})
+        if i >= 10:  # Skip warm-up iterations
+            timings['decode'].append(decode)
+            timings['json'].append(json_path)
+            timings['raw'].append(raw_path)
+    decode_ms, json_ms, raw_ms = (1000 * float(np.median(timings[key])) for key in ('decode', 'json', 'raw'))
+
+    print(f"Frame: {args.width}x{args.height} JPEG q={args.quality}, median of {args.iterations} iterations")
+    print(f"{'path':<16}{'payload bytes':>15}{'total ms':>10}{'overhead ms':>13}")
+    print(f"{'decode only':<16}{len(jpeg):>15}{decode_ms:>10.2f}{0:>13.2f}")
+    print(f"{'base64 JSON':<16}{len(json_body):>15}{json_ms:>10.2f}{json_ms - decode_ms:>13.2f}")
+    print(f"{'raw image/jpeg':<16}{len(jpeg):>15}{raw_ms:>10.2f}{raw_ms - decode_ms:>13.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from app.core.landmark_cache import LandmarkCache
+from app.core.sequence_classifier import ExerciseClassifier, is_validation_video, load_dataset_windows
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate the landmark-sequence exercise classifier on an ExerciseDataset layout.")
+    parser.add_argument('root_dir', help="dataset root with one directory of .mp4 files per exercise")
+    parser.add_argument('--cache-dir', help="landmark cache (default: <root_dir>/.landmarks)")
+    parser.add_argument('--model', default=Config.EXERCISE_CLASSIFIER_PATH)
+    parser.add_argument('--window', type=int, default=Config.EXERCISE_WINDOW_FRAMES)
+    parser.add_argument('--stride', type=int, default=5)
+    parser.add_argument('--val-fraction', type=float, default=None,
+                        help="only score the videos train_exercise_classifier.py held out")
+    args = parser.parse_args()
+
+    classifier = ExerciseClassifier.load(args.model)
+    cache = LandmarkCache(args.cache_dir or os.path.join(args.root_dir, '.landmarks'))
+    windows, labels, videos = load_dataset_windows(args.root_dir, cache, args.window, args.stride)
+    if args.val_fraction is not None:
+        keep = [is_validation_video(video, args.val_fraction) for video in videos]
+        windows = [window for window, k in zip(windows, keep) if k]
+        labels = [label for label, k in zip(labels, keep) if k]
+    if not windows:
+        parser.error("No windows to evaluate")
+
+    predictions, latencies = [], []
+    for window in windows:
+        start = time.perf_counter()
+        exercise, _ = classifier.classify(window)
+        latencies.append(time.perf_counter() - start)
+        predictions.append(exercise)
+    predictions, labels = np.array(predictions), np.array(labels)
+
+    print(f"{len(windows)} windows, accuracy {np.mean(predictions == labels):.3f}")
+    print(f"{'true / predicted':<18}" + ''.join(f"{c:>10}" for c in classifier.classes))
+    for true in classifier.classes:
+        row = [np.sum((labels == true) & (predictions == predicted)) for predicted in classifier.classes]
+        print(f"{true:<18}" + ''.join(f"{count:>10}" for count in row))
+    latencies = 1e6 * np.array(latencies)
+    print(f"Per-window latency: median {np.median(latencies):.0f} us, p99 {np.percentile(latencies, 99):.0f} us")
+
+if __name__ == "__main__":
+    main()
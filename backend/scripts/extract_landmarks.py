@@ -0,0 +1,58 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import cv2
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.landmark_cache import LandmarkCache
+
+# One cache, and so one PoseDetector, per worker process
+landmark_cache = None
+
+def init_worker(cache_dir, detector_kwargs):
+    global landmark_cache
+    cv2.setNumThreads(1)
+    landmark_cache = LandmarkCache(cache_dir, detector_kwargs)
+
+def extract_one(video_path):
+    """Worker: extract one video unless it is already cached; returns a status line."""
+    if landmark_cache.load(video_path) is not None:
+        return video_path, "cached"
+    start = time.perf_counter()
+    try:
+        landmarks = landmark_cache.extract(video_path)
+    except ValueError as e:
+        return video_path, str(e)
+    return video_path, f"{len(landmarks)} frames in {time.perf_counter() - start:.1f}s"
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract pose landmarks for an ExerciseDataset into its landmark cache.")
+    parser.add_argument('root_dir', help="dataset root with one directory of .mp4 files per exercise")
+    parser.add_argument('--cache-dir', help="default: <root_dir>/.landmarks, as ExerciseDataset uses")
+    parser.add_argument('--model-tier', default=None, help="lite, full or heavy (default: POSE_MODEL_TIER)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    cache_dir = args.cache_dir or os.path.join(args.root_dir, '.landmarks')
+    videos = sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(args.root_dir)
+        if not os.path.abspath(root).startswith(os.path.abspath(cache_dir))
+        for name in files if name.endswith('.mp4')
+    )
+    detector_kwargs = {'model_complexity': args.model_tier}
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers, initializer=init_worker,
+                              initargs=(cache_dir, detector_kwargs)) as pool:
+        for i, (video_path, status) in enumerate(pool.imap_unordered(extract_one, videos), 1):
+            print(f"[{i}/{len(videos)}] {video_path}: {status}")
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
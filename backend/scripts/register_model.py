@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+import torch
+import torchvision
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from app.models.model_registry import ModelRegistry, build_architecture
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Add classifier weights to the local model registry, with a TorchScript export.")
+    parser.add_argument('version')
+    parser.add_argument('--weights', help="state dict to register")
+    parser.add_argument('--imagenet', action='store_true',
+                        help="start from torchvision's ImageNet backbone instead (downloads once; "
+                             "run on a connected machine and copy the registry over)")
+    parser.add_argument('--name', default='exercise_classifier')
+    parser.add_argument('--num-classes', type=int, default=2)
+    parser.add_argument('--registry-dir', default=Config.MODEL_REGISTRY_DIR)
+    parser.add_argument('--no-torchscript', action='store_true')
+    args = parser.parse_args()
+    if not args.weights and not args.imagenet:
+        parser.error("one of --weights or --imagenet is required")
+
+    if args.imagenet:
+        model = torchvision.models.resnet18(weights=torchvision.models.ResNet18_Weights.IMAGENET1K_V1)
+        model.fc = torch.nn.Linear(model.fc.in_features, args.num_classes)
+    else:
+        model = build_architecture('resnet18', args.num_classes)
+        model.load_state_dict(torch.load(args.weights, map_location='cpu', weights_only=True))
+
+    registry = ModelRegistry(args.registry_dir)
+    entry = registry.register(args.name, args.version, model, 'resnet18', args.num_classes,
+                              export_torchscript=not args.no_torchscript)
+    print(f"Registered {args.name} {entry['version']} in {args.registry_dir}: {entry}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.pose_detection import PoseDetector
+from app.core.video_analysis import open_video, score_video
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
+MANIFEST_NAME = 'manifest.jsonl'
+
+# One tracking-mode detector per worker process, created by init_worker
+pose_detector = None
+
+def init_worker(model_complexity):
+    global pose_detector
+    # MediaPipe and the pool already use every core; keep OpenCV single-threaded
+    cv2.setNumThreads(1)
+    pose_detector = PoseDetector(static_image_mode=False, model_complexity=model_complexity)
+
+def video_key(path):
+    """Identify a video by path, size and mtime so edited files are scored again."""
+    stat = os.stat(path)
+    return {'video': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def output_stem(input_dir, output_dir, path):
+    """Mirror the video's location under input_dir inside output_dir."""
+    relative = os.path.splitext(os.path.relpath(path, input_dir))[0]
+    return os.path.join(output_dir, relative)
+
+def find_videos(input_dir, extensions):
+    videos = []
+    for root, _, files in os.walk(input_dir):
+        for name in files:
+            if name.lower().endswith(extensions):
+                videos.append(os.path.join(root, name))
+    return sorted(videos)
+
+def load_manifest(output_dir):
+    """Return the manifest entries of videos already scored, keyed by video path."""
+    done = {}
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path) as manifest:
+            for line in manifest:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line from an interrupted run
+                done[entry['video']] = entry
+    return done
+
+def is_done(entry, key):
+    # Failed videos are recorded too, and tried again on the next run
+    return (entry is not None and 'error' not in entry
+            and entry['size'] == key['size'] and entry['mtime'] == key['mtime']
+            and os.path.exists(entry['summary']) and os.path.exists(entry['landmarks']))
+
+def score_one(job):
+    """Worker: score one video, reporting any failure as a result instead of raising.
+
+    An exception escaping a worker would abort the whole pool run, so one
+    corrupt or crashing video only fails its own entry.
+    """
+    path = job[0]
+    try:
+        return score_video_file(*job)
+    except Exception as e:
+        return {'video': os.path.abspath(path), 'error': f"{type(e).__name__}: {e}"}
+
+def score_video_file(path, stem, exercise_type):
+    """Score one video and write its landmarks and summary atomically."""
+    start = time.perf_counter()
+    cap = open_video(path)
+    pose_detector.reset()  # Don't carry tracking state over from the previous video
+    landmarks, summary = score_video(cap, exercise_type, pose_detector)
+    summary['video'] = os.path.abspath(path)
+    summary['elapsed_s'] = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(stem) or '.', exist_ok=True)
+    landmarks_path, summary_path = stem + '.landmarks.npy', stem + '.json'
+    # Write to temporary names first so an interrupted run never leaves half a file
+    with open(landmarks_path + '.tmp', 'wb') as f:
+        np.save(f, landmarks)
+    with open(summary_path + '.tmp', 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(landmarks_path + '.tmp', landmarks_path)
+    os.replace(summary_path + '.tmp', summary_path)
+    return {'video': summary['video'], 'landmarks': landmarks_path, 'summary': summary_path,
+            'frames': summary['frames'], 'elapsed_s': summary['elapsed_s']}
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a directory of exercise videos offline.")
+    parser.add_argument('input_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--exercise-type', default='auto', help="squat, plank or auto")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--model-tier', default=None, help="lite, full or heavy (default: POSE_MODEL_TIER)")
+    parser.add_argument('--extensions', default=','.join(VIDEO_EXTENSIONS))
+    args = parser.parse_args()
+
+    extensions = tuple(ext.strip().lower() for ext in args.extensions.split(','))
+    videos = find_videos(args.input_dir, extensions)
+    done = load_manifest(args.output_dir)
+    jobs, keys = [], {}
+    for path in videos:
+        key = video_key(path)
+        if is_done(done.get(key['video']), key):
+            continue
+        keys[key['video']] = key
+        jobs.append((path, output_stem(args.input_dir, args.output_dir, path), args.exercise_type))
+    print(f"{len(videos)} videos found, {len(videos) - len(jobs)} already scored, {len(jobs)} to go")
+    if not jobs:
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    start = time.perf_counter()
+    frames = failed = 0
+    # Only the parent appends to the manifest, one line per finished or failed video
+    with open(os.path.join(args.output_dir, MANIFEST_NAME), 'a') as manifest, \
+            multiprocessing.Pool(args.workers, initializer=init_worker,
+                                 initargs=(args.model_tier,)) as pool:
+        for i, result in enumerate(pool.imap_unordered(score_one, jobs), 1):
+            manifest.write(json.dumps({**keys[result['video']], **result}) + '\n')
+            manifest.flush()
+            if 'error' in result:
+                failed += 1
+                print(f"[{i}/{len(jobs)}] {result['video']}: {result['error']}")
+                continue
+            frames += result['frames']
+            print(f"[{i}/{len(jobs)}] {result['video']}: {result['frames']} frames "
+                  f"in {result['elapsed_s']:.1f}s")
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {len(jobs) - failed} videos ({frames} frames) in {elapsed:.1f}s, "
+          f"{frames / elapsed:.1f} frames/s; {failed} failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from app.core.landmark_cache import LandmarkCache
+from app.core.sequence_classifier import (
+    ExerciseClassifier, is_validation_video, load_dataset_windows, window_features
+)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the landmark-sequence exercise classifier on an ExerciseDataset layout.")
+    parser.add_argument('root_dir', help="dataset root with one directory of .mp4 files per exercise")
+    parser.add_argument('--cache-dir', help="landmark cache (default: <root_dir>/.landmarks)")
+    parser.add_argument('--output', default=Config.EXERCISE_CLASSIFIER_PATH)
+    parser.add_argument('--window', type=int, default=Config.EXERCISE_WINDOW_FRAMES)
+    parser.add_argument('--stride', type=int, default=5)
+    parser.add_argument('--val-fraction', type=float, default=0.2, help="videos held out for validation")
+    parser.add_argument('--epochs', type=int, default=500)
+    parser.add_argument('--l2', type=float, default=1e-3)
+    args = parser.parse_args()
+
+    cache = LandmarkCache(args.cache_dir or os.path.join(args.root_dir, '.landmarks'))
+    windows, labels, videos = load_dataset_windows(args.root_dir, cache, args.window, args.stride)
+    if not windows:
+        parser.error(f"No videos with detected poses under {args.root_dir}")
+    features = np.stack([window_features(window) for window in windows])
+    labels = np.array(labels)
+    validation = np.array([is_validation_video(video, args.val_fraction) for video in videos])
+
+    classifier = ExerciseClassifier(sorted(set(labels)))
+    classifier.fit(features[~validation], labels[~validation], epochs=args.epochs, l2=args.l2)
+    for name, mask in (('train', ~validation), ('validation', validation)):
+        if mask.any():
+            predictions = np.array(classifier.classes)[classifier.predict_proba(features[mask]).argmax(axis=1)]
+            print(f"{name}: {mask.sum()} windows, accuracy {np.mean(predictions == labels[mask]):.3f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    classifier.save(args.output)
+    print(f"Saved {classifier.classes} classifier to {args.output}")
+
+if __name__ == "__main__":
+    main()
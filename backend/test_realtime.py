@@ -1,43 +1,11 @@
 import cv2
 import numpy as np
 import mediapipe as mp
+from app.core.camera import CameraCapture
 from app.core.pose_detection import PoseDetector
-
-def draw_landmarks(frame, landmarks, is_correct):
-    """Draw body landmarks and connections on the frame, color based on correctness."""
-    if landmarks is None:
-        return frame
-    
-    h, w, _ = frame.shape
-    color = (0, 255, 0) if is_correct else (0, 0, 255)
-    
-    # Only draw body (not face) landmarks: indices 11 and up
-    body_indices = list(range(11, 33))
-    for idx in body_indices:
-        landmark = landmarks[idx]
-        x = int(landmark['x'] * w)
-        y = int(landmark['y'] * h)
-        cv2.circle(frame, (x, y), 5, color, -1)
-    
-    # Draw body connections (no face)
-    connections = [
-        # Arms
-        (11, 12), (11, 13), (13, 15), (12, 14), (14, 16),
-        # Torso
-        (11, 23), (12, 24), (23, 24),
-        # Left leg
-        (23, 25), (25, 27), (27, 29), (29, 31),
-        # Right leg
-        (24, 26), (26, 28), (28, 30), (30, 32)
-    ]
-    for start_idx, end_idx in connections:
-        if 0 <= start_idx < len(landmarks) and 0 <= end_idx < len(landmarks):
-            start_x = int(landmarks[start_idx]['x'] * w)
-            start_y = int(landmarks[start_idx]['y'] * h)
-            end_x = int(landmarks[end_idx]['x'] * w)
-            end_y = int(landmarks[end_idx]['y'] * h)
-            cv2.line(frame, (start_x, start_y), (end_x, end_y), color, 2)
-    return frame
+from app.core.frame_scheduler import AdaptiveInferenceScheduler, format_scheduler_report
+from app.core.hud import HudOverlay
+from app.core.skeleton import SkeletonRenderer
 
 def show_exercise_selection():
     """Show exercise selection screen"""
@@ -69,9 +37,18 @@ def show_exercise_selection():
 def main():
     # Initialize the pose detector
     detector = PoseDetector()
+    # Skips inference on low-motion frames, e.g. while holding a plank
+    scheduler = AdaptiveInferenceScheduler(detector)
+    # Feedback panel, re-rendered only when its text changes
+    hud = HudOverlay(width=300, max_lines=4)
+    skeleton = SkeletonRenderer()
     
-    # Initialize webcam
-    cap = cv2.VideoCapture(0)
+    # Initialize webcam with the configured format, always reading its newest frame
+    try:
+        cap = CameraCapture()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
     
     # Show exercise selection first
     current_exercise = show_exercise_selection()
@@ -90,35 +67,26 @@ def main():
             print("Failed to grab frame")
             break
             
-        # Convert frame to RGB for pose detection
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
         try:
-            # Detect landmarks
-            landmarks = detector.detect_landmarks(rgb_frame)
+            # Detect landmarks (the detector converts BGR to RGB itself)
+            landmarks = scheduler.detect_landmarks(frame)
             
             # Validate form
             feedback = detector.validate_form(landmarks, current_exercise)
             is_correct = feedback.get('is_correct', False)
             
-            # Draw landmarks and connections (color based on correctness)
-            frame = draw_landmarks(frame, landmarks, is_correct)
-            
-            # Create a semi-transparent overlay for feedback
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (0, 0), (300, 150), (0, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-            
-            # Draw feedback on frame
-            y_offset = 30
-            cv2.putText(frame, f"Exercise: {current_exercise}", (10, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            # Draw the skeleton, with the joints behind the feedback in red; with
+            # no per-joint feedback an incorrect pose is red throughout
+            whole_color = None if is_correct or feedback['incorrect_points'] else (0, 0, 255)
+            skeleton.draw(frame, landmarks, feedback['incorrect_points'], whole_color)
             
+            # Draw feedback on a semi-transparent panel, blending only the panel region
+            lines = [(f"Exercise: {current_exercise}", (0, 255, 0))]
             for msg in feedback['feedback']:
-                y_offset += 30
                 color = (0, 255, 0) if msg == "Good form!" else (0, 0, 255)
-                cv2.putText(frame, msg, (10, y_offset), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                lines.append((msg, color))
+            hud.set_lines(lines)
+            hud.draw(frame)
             
         except ValueError as e:
             # No pose detected
@@ -141,6 +109,7 @@ def main():
     # Clean up
     cap.release()
     cv2.destroyAllWindows()
+    print(format_scheduler_report(scheduler.report()))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+import pytest
+from app.core import camera
+from app.core.camera import CameraCapture, parse_source
+
+@pytest.fixture
+def video_path(tmp_path):
+    """Ten frames whose brightness encodes the frame index"""
+    path = str(tmp_path / 'clip.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (32, 24))
+    for i in range(10):
+        writer.write(np.full((24, 32, 3), i * 25, dtype=np.uint8))
+    writer.release()
+    return path
+
+def frame_index(frame):
+    return int(round(frame.mean() / 25))
+
+def test_parse_source():
+    """Test that digit strings select a device and anything else is a path or URL"""
+    assert parse_source('0') == 0
+    assert parse_source(1) == 1
+    assert parse_source('clip.mp4') == 'clip.mp4'
+    assert parse_source('rtsp://camera/stream') == 'rtsp://camera/stream'
+
+def test_file_reads_every_frame(video_path):
+    """Test that a file source is read unthreaded, frame by frame, to the end"""
+    with CameraCapture(video_path) as cap:
+        assert not cap.threaded
+        assert cap.settings()['width'] == 32
+        indices = []
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            indices.append(frame_index(frame))
+    assert indices == list(range(10))
+
+def test_threaded_read_keeps_newest_frame(video_path):
+    """Test that a slow reader skips to the newest grabbed frame instead of falling behind"""
+    cap = CameraCapture(video_path, threaded=True)
+    time.sleep(0.5)  # The grab thread decodes the whole clip meanwhile
+    ret, frame = cap.read()
+    assert ret and frame_index(frame) == 9
+    assert cap.dropped == 9
+    # Nothing newer is coming: the source has ended
+    assert cap.read() == (False, None)
+    assert not cap.isOpened()
+    cap.release()
+
+def test_invalid_source():
+    """Test that a source that cannot be opened raises"""
+    with pytest.raises(ValueError):
+        CameraCapture('missing.mp4')
+    with pytest.raises(ValueError):
+        CameraCapture('0', backend='firewire')
+
+class StallingCapture:
+    """Stand-in for cv2.VideoCapture whose frames arrive only when ``deliver`` is called"""
+
+    def __init__(self, *args):
+        self.frames = queue.Queue()
+
+    def deliver(self, frame):
+        self.frames.put((frame is not None, frame))
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def read(self):
+        return self.frames.get()
+
+    def release(self):
+        self.frames.put((False, None))
+
+@pytest.fixture
+def stalling_capture(monkeypatch):
+    captures = []
+    monkeypatch.setattr(camera.cv2, 'VideoCapture', lambda *args: captures.append(StallingCapture()) or captures[-1])
+    return captures
+
+def read_in_background(cap):
+    result = []
+    reader = threading.Thread(target=lambda: result.append(cap.read()))
+    reader.start()
+    return reader, result
+
+def test_threaded_read_waits_out_stalls(stalling_capture):
+    """Test that a stalled source is waited for rather than taken for its end"""
+    cap = CameraCapture('rtsp://camera/stream')
+    assert cap.threaded
+    reader, result = read_in_background(cap)
+    reader.join(timeout=0.5)
+    assert reader.is_alive()
+
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    stalling_capture[0].deliver(frame)
+    reader.join(timeout=2)
+    assert result[0][0] and result[0][1] is frame
+    stalling_capture[0].deliver(None)  # End of stream
+    assert cap.read() == (False, None)
+    cap.release()
+
+def test_release_wakes_waiting_reader(stalling_capture):
+    """Test that releasing the capture ends a read blocked on a stalled source"""
+    cap = CameraCapture('rtsp://camera/stream')
+    reader, result = read_in_background(cap)
+    reader.join(timeout=0.2)
+    assert reader.is_alive()
+    cap.release()
+    reader.join(timeout=2)
+    assert result == [(False, None)]
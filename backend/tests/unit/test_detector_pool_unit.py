@@ -0,0 +1,27 @@
+import pytest
+from app.core.detector_pool import PoseDetectorPool
+
+@pytest.fixture
+def detector_pool():
+    pool = PoseDetectorPool(size=1, timeout=0.1)
+    yield pool
+    pool.close()
+
+def test_detector_is_reused(detector_pool):
+    """Test that a checked-in detector is handed out again"""
+    with detector_pool.detector() as first:
+        pass
+    with detector_pool.detector() as second:
+        assert second is first
+
+def test_pool_exhaustion_times_out(detector_pool):
+    """Test that checkout fails once every detector is in use"""
+    with detector_pool.detector():
+        with pytest.raises(TimeoutError):
+            detector_pool.checkout()
+
+def test_calibration_is_shared(detector_pool):
+    """Test that calibration stored on the pool is visible to its detectors"""
+    detector_pool.store_calibration("squat", [{'x': 0.5, 'y': 0.5}])
+    with detector_pool.detector() as detector:
+        assert detector.get_calibration("squat") == [{'x': 0.5, 'y': 0.5}]
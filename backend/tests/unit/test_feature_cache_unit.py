@@ -0,0 +1,43 @@
+import numpy as np
+from app.core.feature_cache import FrameFeatureCache
+from app.models.pose_detection import ExerciseFormChecker
+
+def random_landmarks(seed=0):
+    return np.random.default_rng(seed).random((33, 4), dtype=np.float32)
+
+def test_same_frame_hits_cache():
+    """Test that a second lookup on the same frame reuses the computed angles"""
+    cache = FrameFeatureCache()
+    landmarks = random_landmarks()
+    assert cache.angles(landmarks) is cache.angles(landmarks.copy())
+
+def test_mutated_buffer_misses_cache():
+    """Test that changing the landmark buffer invalidates its features"""
+    cache = FrameFeatureCache()
+    landmarks = random_landmarks()
+    before = cache.angles(landmarks)
+    landmarks[25, 0] += 0.1
+    assert cache.angles(landmarks) is not before
+
+def test_cache_is_bounded():
+    """Test that old frames are evicted once the cache is full"""
+    cache = FrameFeatureCache(maxsize=2)
+    first = random_landmarks(seed=1)
+    cache.angles(first)
+    cache.angles(random_landmarks(seed=2))
+    cache.angles(random_landmarks(seed=3))
+    assert len(cache._entries) == 2
+    assert (first.shape, first.tobytes()) not in cache._entries
+
+def test_form_checker_reads_from_cache():
+    """Test that the form checker and detector share one feature cache"""
+    checker = ExerciseFormChecker()
+    keypoints = {
+        'left_shoulder': (0.5, 0.2), 'left_elbow': (0.5, 0.4), 'left_wrist': (0.5, 0.6),
+        'left_hip': (0.5, 0.5), 'left_knee': (0.6, 0.7), 'left_ankle': (0.5, 0.9),
+    }
+    checker.check_squat_form(keypoints)
+    checker.check_plank_form(keypoints)
+    checker.pose_detector.detect_exercise_type(keypoints)
+    assert checker.features is checker.pose_detector.features
+    assert len(checker.features._entries) == 1
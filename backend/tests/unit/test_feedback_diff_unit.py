@@ -0,0 +1,63 @@
+from flask import Flask
+from app.core.feedback_diff import FeedbackDiffer, FeedbackSessionStore, feedback_id
+from app.utils import feedback_delta
+
+def test_feedback_ids_are_stable_slugs():
+    """Test that IDs depend only on the message text"""
+    assert feedback_id("Keep your elbows at 90 degrees") == 'keep-your-elbows-at-90-degrees'
+    assert feedback_id("Good form!") == 'good-form'
+
+def test_emits_changes_after_dwell_time():
+    """Test that messages are added and removed only once they have lasted the dwell time"""
+    differ = FeedbackDiffer(min_dwell_ms=200)
+    assert not differ.update(["Try going lower"], ["depth"], timestamp=0.0)['changed']
+    delta = differ.update(["Try going lower"], ["depth"], timestamp=0.25)
+    assert delta == {'changed': True, 'added': [{'id': 'try-going-lower', 'message': "Try going lower"}],
+                     'removed': [], 'incorrect_points': ["depth"]}
+    assert differ.update(["Try going lower"], ["depth"], timestamp=0.3) == {
+        'changed': False, 'added': [], 'removed': []}
+
+    # A one-frame flicker to "Good form!" is never sent
+    assert not differ.update(["Good form!"], [], timestamp=0.35)['changed']
+    assert not differ.update(["Try going lower"], ["depth"], timestamp=0.4)['changed']
+    assert not differ.update(["Good form!"], [], timestamp=0.5)['changed']
+    delta = differ.update(["Good form!"], [], timestamp=0.75)
+    assert delta['added'] == [{'id': 'good-form', 'message': "Good form!"}]
+    assert delta['removed'] == ['try-going-lower']
+    assert differ.messages() == ["Good form!"]
+
+def test_zero_dwell_passes_every_change_through():
+    """Test that without a dwell time every change is emitted immediately"""
+    differ = FeedbackDiffer(min_dwell_ms=0)
+    assert differ.update(["A", "B"], timestamp=0.0)['changed']
+    delta = differ.update(["B"], timestamp=0.01)
+    assert delta['removed'] == ['a'] and delta['added'] == []
+
+def test_session_store_expires_and_bounds_sessions(monkeypatch):
+    """Test that idle sessions expire and the least recently used are evicted"""
+    now = [0.0]
+    monkeypatch.setattr('app.core.feedback_diff.time.monotonic', lambda: now[0])
+    store = FeedbackSessionStore(max_sessions=2, ttl_s=10)
+    for key in ('a', 'b', 'c'):
+        store.delta(key, ["Good form!"])
+    assert len(store) == 2
+    now[0] = 20.0
+    store.delta('d', [])
+    assert len(store) == 1
+
+def test_http_responses_carry_deltas_for_sessions(monkeypatch):
+    """Test that a session_id swaps the feedback lists for a delta"""
+    monkeypatch.setattr(feedback_delta, 'feedback_sessions', FeedbackSessionStore())
+    monkeypatch.setattr(feedback_delta, 'get_jwt_identity', lambda: 'user')
+    monkeypatch.setattr('app.core.feedback_diff.Config.FEEDBACK_MIN_DWELL_MS', 0)
+    payload = {'feedback': ["Try going lower"], 'incorrect_points': ["depth"], 'is_correct': False}
+    app = Flask(__name__)
+    with app.test_request_context('/analyze'):
+        assert feedback_delta.with_feedback_delta(payload) == payload
+    with app.test_request_context('/analyze?session_id=s1'):
+        first = feedback_delta.with_feedback_delta(payload)
+    with app.test_request_context('/feedback', method='POST', json={'session_id': 's1'}):
+        second = feedback_delta.with_feedback_delta(payload)
+    assert 'feedback' not in first and first['is_correct'] is False
+    assert first['feedback_delta']['added'][0]['id'] == 'try-going-lower'
+    assert second['feedback_delta'] == {'changed': False, 'added': [], 'removed': []}
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from app.core.frame_scheduler import AdaptiveInferenceScheduler
+
+class MovingDetector:
+    """Fake detector whose pose drifts right at a fixed speed per call timestamp"""
+    def __init__(self, speed):
+        self.speed = speed
+        self.calls = 0
+        self.now = 0.0
+
+    def detect_landmarks(self, frame):
+        self.calls += 1
+        landmarks = np.full((33, 4), 0.5, dtype=np.float32)
+        landmarks[:, 0] += self.speed * self.now
+        return landmarks
+
+def run(scheduler, detector, frames, fps=30):
+    outputs = []
+    for i in range(frames):
+        detector.now = i / fps
+        outputs.append(scheduler.detect_landmarks(None, timestamp=detector.now))
+    return outputs
+
+def test_still_pose_skips_inference():
+    """Test that a still pose only runs inference every max_skip + 1 frames"""
+    detector = MovingDetector(speed=0.0)
+    scheduler = AdaptiveInferenceScheduler(detector, max_skip=2, motion_threshold=0.1)
+    run(scheduler, detector, 32)
+    # The first two frames establish the velocity estimate
+    assert detector.calls == 12
+    assert scheduler.report()['skipped_frames'] == 20
+
+def test_fast_motion_infers_every_frame():
+    """Test that motion above the threshold disables skipping"""
+    detector = MovingDetector(speed=1.0)
+    scheduler = AdaptiveInferenceScheduler(detector, max_skip=2, motion_threshold=0.1)
+    run(scheduler, detector, 10)
+    assert detector.calls == 10
+
+def test_skipped_frames_are_extrapolated():
+    """Test that skipped frames continue the last velocity"""
+    detector = MovingDetector(speed=0.05)
+    scheduler = AdaptiveInferenceScheduler(detector, max_skip=3, motion_threshold=0.1)
+    outputs = run(scheduler, detector, 12)
+    expected = 0.5 + 0.05 * np.arange(12) / 30
+    np.testing.assert_allclose([frame[0, 0] for frame in outputs], expected, atol=1e-5)
+    assert scheduler.report()['extrapolation_error'] < 1e-5
+
+def test_lost_pose_resets_motion():
+    """Test that a frame without a pose forces inference on the next frame"""
+    detector = MovingDetector(speed=0.0)
+    scheduler = AdaptiveInferenceScheduler(detector, max_skip=1, motion_threshold=0.1)
+    run(scheduler, detector, 3)
+    assert not scheduler.last_inferred
+
+    def no_pose(frame):
+        raise ValueError("No pose detected in the image")
+    detector.detect_landmarks = no_pose
+    with pytest.raises(ValueError):
+        scheduler.detect_landmarks(None, timestamp=0.2)
+    assert scheduler.should_infer()
+
+def test_extrapolation_errors_are_bounded():
+    """Test that only the most recent extrapolation errors are kept for the report"""
+    detector = MovingDetector(speed=0.0)
+    scheduler = AdaptiveInferenceScheduler(detector, max_skip=1, motion_threshold=0.1, error_window=4)
+    run(scheduler, detector, 40)
+    assert len(scheduler._errors) == 4
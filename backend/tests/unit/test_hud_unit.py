@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+from app.core.hud import FONT, HudOverlay
+
+LINES = [("Exercise: squat", (0, 255, 0)), ("Try going lower", (0, 0, 255))]
+
+def random_frame(shape=(240, 320, 3)):
+    return np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+
+def test_matches_full_frame_blend():
+    """Test that the cached panel looks like a blended box with text drawn on top"""
+    hud = HudOverlay(width=200, max_lines=3)
+    hud.set_lines(LINES)
+    frame = random_frame()
+    expected = frame.copy()
+    overlay = expected.copy()
+    cv2.rectangle(overlay, (0, 0), (199, hud.size[1] - 1), (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.7, expected, 0.3, 0, expected)
+    for i, (text, color) in enumerate(LINES):
+        cv2.putText(expected, text, (10, 30 * (i + 1)), FONT, 0.7, color, 2)
+
+    assert hud.draw(frame) is frame
+    assert np.abs(frame.astype(int) - expected).max() <= 1
+
+def test_only_changed_lines_are_rendered():
+    """Test that unchanged text is not rasterized again and replaced lines leave no trace"""
+    hud = HudOverlay(width=200, max_lines=3)
+    assert hud.set_lines(LINES)
+    renders = hud.renders
+    assert not hud.set_lines(LINES)
+    assert hud.renders == renders
+
+    hud.set_lines([LINES[0], ("Good form!", (0, 255, 0))])
+    assert hud.renders == renders + 1
+    fresh = HudOverlay(width=200, max_lines=3)
+    fresh.set_lines([LINES[0], ("Good form!", (0, 255, 0))])
+    np.testing.assert_array_equal(hud.draw(random_frame()), fresh.draw(random_frame()))
+
+def test_leaves_the_rest_of_the_frame_alone():
+    """Test that only the panel region is written, and panels larger than the frame are clipped"""
+    hud = HudOverlay(width=200, max_lines=3, origin=(50, 20))
+    hud.set_lines(LINES)
+    frame = random_frame()
+    original = frame.copy()
+    hud.draw(frame)
+    width, height = hud.size
+    outside = np.ones(frame.shape[:2], dtype=bool)
+    outside[20:20 + height, 50:50 + width] = False
+    np.testing.assert_array_equal(frame[outside], original[outside])
+
+    small = random_frame((40, 60, 3))
+    hud.draw(small)
+    assert small.shape == (40, 60, 3)
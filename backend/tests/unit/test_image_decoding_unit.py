@@ -0,0 +1,50 @@
+import base64
+import cv2
+import numpy as np
+import pytest
+from flask import Flask
+from app.utils.image_decoding import decode_base64_image, get_request_frame
+
+@pytest.fixture
+def jpeg_bytes():
+    return cv2.imencode('.jpg', np.zeros((48, 64, 3), dtype=np.uint8))[1].tobytes()
+
+@pytest.fixture
+def flask_app():
+    return Flask(__name__)
+
+def test_decode_data_url(jpeg_bytes):
+    """Test decoding a base64 data URL"""
+    data_url = 'data:image/jpeg;base64,' + base64.b64encode(jpeg_bytes).decode()
+    assert decode_base64_image(data_url).shape == (48, 64, 3)
+
+def test_raw_jpeg_request(flask_app, jpeg_bytes):
+    """Test reading a frame from a raw image/jpeg body"""
+    with flask_app.test_request_context('/analyze?exercise_type=squat', method='POST',
+                                        data=jpeg_bytes, content_type='image/jpeg'):
+        exercise_type, frame = get_request_frame()
+    assert exercise_type == 'squat'
+    assert frame.shape == (48, 64, 3)
+
+def test_json_request(flask_app, jpeg_bytes):
+    """Test reading a frame from a JSON body with a base64 image"""
+    with flask_app.test_request_context('/analyze', method='POST', json={
+        'exercise_type': 'plank',
+        'image': base64.b64encode(jpeg_bytes).decode()
+    }):
+        exercise_type, frame = get_request_frame()
+    assert exercise_type == 'plank'
+    assert frame.shape == (48, 64, 3)
+
+def test_empty_raw_body(flask_app):
+    """Test that an empty raw body yields no frame"""
+    with flask_app.test_request_context('/analyze?exercise_type=squat', method='POST',
+                                        data=b'', content_type='application/octet-stream'):
+        assert get_request_frame() == ('squat', None)
+
+def test_undecodable_image(flask_app):
+    """Test that garbage bytes raise a ValueError"""
+    with flask_app.test_request_context('/analyze?exercise_type=squat', method='POST',
+                                        data=b'not an image', content_type='image/jpeg'):
+        with pytest.raises(ValueError):
+            get_request_frame()
@@ -0,0 +1,46 @@
+import os
+import cv2
+import numpy as np
+import pytest
+from app.core.landmark_cache import LandmarkCache, detector_config
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / 'clip.mp4')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (64, 48))
+    for i in range(4):
+        writer.write(np.full((48, 64, 3), i * 40, dtype=np.uint8))
+    writer.release()
+    return path
+
+def test_extracts_once_then_memory_maps(tmp_path, video_path):
+    """Test that a cached video is served from a memory-mapped .npy"""
+    cache = LandmarkCache(str(tmp_path / 'cache'), {'model_complexity': 'lite'})
+    assert cache.load(video_path) is None
+    landmarks = cache.get(video_path)
+    assert landmarks.shape == (4, 33, 4)
+    assert np.isnan(landmarks).all()  # No person in the synthetic clip
+
+    cache.extract = lambda path: pytest.fail("cached video was extracted again")
+    cached = cache.get(video_path)
+    assert isinstance(cached, np.memmap)
+
+def test_key_tracks_video_and_detector(tmp_path, video_path):
+    """Test that editing the video or changing the model tier misses the cache"""
+    cache = LandmarkCache(str(tmp_path / 'cache'), {'model_complexity': 'lite'})
+    key = cache.key(video_path)
+    assert key == LandmarkCache(str(tmp_path / 'cache'), {'model_complexity': 0}).key(video_path)
+    assert key != LandmarkCache(str(tmp_path / 'cache'), {'model_complexity': 'full'}).key(video_path)
+
+    stat = os.stat(video_path)
+    os.utime(video_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.key(video_path) != key
+
+def test_key_ignores_options_that_do_not_change_landmarks():
+    """Test that only result-affecting detector options are part of the key"""
+    config = detector_config({'model_complexity': 'lite'})
+    assert config == {'static_image_mode': False, 'model_complexity': 0,
+                      'min_detection_confidence': 0.5, 'min_tracking_confidence': 0.5}
+    assert detector_config({'model_complexity': 0, 'latency_budget_ms': 50}) == config
+    assert detector_config({'model_complexity': 0, 'smooth_landmarks': False}) == config
+    assert detector_config({'model_complexity': 0, 'smooth_landmarks': True}) != config
@@ -0,0 +1,61 @@
+import msgpack
+import numpy as np
+import pytest
+from flask import Flask
+from app.utils.landmark_encoding import (
+    BINARY_MIMETYPE, MSGPACK_MIMETYPE, landmark_response, pack_landmarks, unpack_landmarks
+)
+
+@pytest.fixture
+def payload():
+    landmarks = np.random.default_rng(0).random((33, 4), dtype=np.float32)
+    return {
+        'landmarks': landmarks,
+        'feedback': ['Good form!'],
+        'incorrect_points': [],
+        'is_correct': True
+    }
+
+def test_binary_round_trip(payload):
+    """Test that the packed format round-trips within float16 precision"""
+    data = pack_landmarks(payload, dtype='float16')
+    decoded = unpack_landmarks(data)
+    assert np.allclose(decoded['landmarks'], payload['landmarks'], atol=1e-3)
+    assert decoded['feedback'] == ['Good form!']
+    assert decoded['is_correct'] is True
+
+def test_binary_is_smaller_than_json(payload):
+    """Test that the packed float16 body is a fraction of the JSON size"""
+    app = Flask(__name__)
+    with app.test_request_context(headers={'Accept': 'application/json'}):
+        json_size = len(landmark_response(payload).get_data())
+    assert len(pack_landmarks(payload, dtype='float16')) < json_size / 4
+
+def test_binary_without_landmarks():
+    """Test encoding a no-pose response"""
+    decoded = unpack_landmarks(pack_landmarks({'feedback': ['No pose'], 'is_correct': False}))
+    assert decoded['landmarks'] is None
+    assert decoded['feedback'] == ['No pose']
+
+@pytest.mark.parametrize('accept, mimetype', [
+    (None, 'application/json'),
+    ('*/*', 'application/json'),
+    (BINARY_MIMETYPE, BINARY_MIMETYPE),
+    (MSGPACK_MIMETYPE, MSGPACK_MIMETYPE),
+])
+def test_content_negotiation(payload, accept, mimetype):
+    """Test that the Accept header selects the response format"""
+    app = Flask(__name__)
+    headers = {'Accept': accept} if accept else {}
+    with app.test_request_context(headers=headers):
+        response = landmark_response(payload)
+    assert response.mimetype == mimetype
+
+def test_msgpack_landmarks(payload):
+    """Test that MessagePack carries landmarks as a typed buffer"""
+    app = Flask(__name__)
+    with app.test_request_context(headers={'Accept': MSGPACK_MIMETYPE}):
+        body = msgpack.unpackb(landmark_response(payload).get_data())
+    landmarks = np.frombuffer(body['landmarks']['data'], dtype=body['landmarks']['dtype'])
+    assert landmarks.reshape(body['landmarks']['shape']).shape == (33, 4)
+    assert body['feedback'] == ['Good form!']
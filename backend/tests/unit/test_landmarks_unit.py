@@ -0,0 +1,51 @@
+import numpy as np
+from app.core.landmarks import LandmarkView, as_landmark_array, landmarks_to_dicts
+from app.core.pose_detection import PoseDetector, validate_form
+
+def make_landmark_dicts():
+    return [{'x': i / 33, 'y': 0.5, 'z': 0.0, 'visibility': 1.0} for i in range(33)]
+
+def test_array_from_dicts():
+    """Test conversion of the JSON landmark format to an array"""
+    landmarks = as_landmark_array(make_landmark_dicts())
+    assert landmarks.shape == (33, 4)
+    assert landmarks.dtype == np.float32
+    assert landmarks[3, 0] == np.float32(3 / 33)
+
+def test_array_from_objects_fills_defaults():
+    """Test that objects without z/visibility get default values"""
+    points = [type('Landmark', (), {'x': 0.1, 'y': 0.2})() for _ in range(33)]
+    landmarks = as_landmark_array(points)
+    assert np.allclose(landmarks[0], [0.1, 0.2, 0.0, 1.0])
+
+def test_existing_array_is_not_copied():
+    """Test that a float32 array passes through unchanged"""
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    assert as_landmark_array(landmarks) is landmarks
+
+def test_landmark_view_access():
+    """Test dict-style and attribute access through the view"""
+    view = LandmarkView(make_landmark_dicts())
+    assert len(view) == 33
+    assert view[23]['x'] == view[23].x
+    assert view[23]['visibility'] == 1.0
+
+def test_round_trip_to_dicts():
+    """Test that landmarks survive conversion back to dicts"""
+    dicts = landmarks_to_dicts(as_landmark_array(make_landmark_dicts()))
+    assert dicts[0].keys() == {'x', 'y', 'z', 'visibility'}
+    assert len(dicts) == 33
+
+def test_validate_form_accepts_arrays():
+    """Test that form validation gives the same result for arrays and dicts"""
+    detector = PoseDetector()
+    dicts = make_landmark_dicts()
+    assert detector.validate_form(dicts, "squat") == \
+        detector.validate_form(as_landmark_array(dicts), "squat")
+
+def test_validate_form_without_detector():
+    """Test that form validation works on client landmarks without a MediaPipe graph"""
+    dicts = make_landmark_dicts()
+    detector = PoseDetector()
+    for exercise_type in ("squat", "plank", "lunge"):
+        assert validate_form(dicts, exercise_type) == detector.validate_form(dicts, exercise_type)
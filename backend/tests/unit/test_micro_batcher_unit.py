@@ -0,0 +1,73 @@
+import threading
+import time
+import pytest
+from app.core.micro_batcher import MicroBatcher
+
+def test_groups_concurrent_items():
+    """Test that items submitted together share one batched call"""
+    batches = []
+
+    def process_batch(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(process_batch, max_batch_size=4, max_wait_ms=200)
+    futures = [batcher.submit(i) for i in range(6)]
+    assert [future.result(timeout=2) for future in futures] == [0, 2, 4, 6, 8, 10]
+    batcher.close()
+    assert [len(batch) for batch in batches] == [4, 2]
+    assert batcher.mean_batch_size() == 3
+
+def test_lone_item_waits_at_most_max_wait():
+    """Test that a single item is processed once the deadline passes"""
+    batcher = MicroBatcher(lambda items: items, max_batch_size=8, max_wait_ms=20)
+    start = time.monotonic()
+    assert batcher.process('frame', timeout=2) == 'frame'
+    assert time.monotonic() - start < 1
+    batcher.close()
+
+def test_errors_reach_every_caller():
+    """Test that a failing batch fails each of its futures"""
+    def process_batch(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(process_batch, max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(2)]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=2)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(0)
+
+def test_short_result_list_fails_every_caller():
+    """Test that fewer results than items fails the batch instead of leaving futures pending"""
+    batcher = MicroBatcher(lambda items: items[:1], max_batch_size=3, max_wait_ms=200)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(timeout=2)
+    batcher.close()
+
+def test_classifier_batches_single_frames_lazily():
+    """Test that process_frame goes through a batcher started on first use"""
+    import numpy as np
+    import torch
+    from app.models.dataset import RealTimePoseDetector
+    model = torch.nn.Sequential(torch.nn.AdaptiveAvgPool2d(1), torch.nn.Flatten(), torch.nn.Linear(3, 2))
+    detector = RealTimePoseDetector(model=model, max_batch_size=4, max_wait_ms=200)
+    assert detector._batcher is None
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    assert len(detector.process_frames([frame, frame])) == 2
+    assert detector._batcher is None
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(detector.process_frame(frame)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    detector.close()
+    assert len(results) == 4 and results[0]['exercise_type'] in ('squat', 'plank')
+    assert detector._batcher.items == 4 and detector._batcher.batches < 4
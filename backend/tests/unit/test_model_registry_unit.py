@@ -0,0 +1,55 @@
+import threading
+import numpy as np
+import pytest
+torch = pytest.importorskip('torch')
+from app.models.model_registry import ModelRegistry, build_architecture
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    torch.manual_seed(0)
+    registry.register('exercise_classifier', '1', build_architecture('resnet18', 2), 'resnet18', 2)
+    return registry
+
+def test_register_writes_manifest(registry):
+    """Test that registering a model records it as the latest version"""
+    entry = registry.entry('exercise_classifier')
+    assert entry['version'] == '1'
+    assert entry['torchscript'].endswith('.torchscript.pt')
+    with pytest.raises(KeyError):
+        registry.entry('exercise_classifier', '2')
+
+def test_torchscript_matches_weights(tmp_path, registry):
+    """Test that the TorchScript export and the state dict give the same outputs"""
+    scripted = registry.load('exercise_classifier')
+    eager = ModelRegistry(str(tmp_path), prefer_torchscript=False).load('exercise_classifier')
+    assert isinstance(scripted, torch.jit.ScriptModule)
+    assert not isinstance(eager, torch.jit.ScriptModule)
+    inputs = torch.rand(2, 3, 224, 224)
+    with torch.inference_mode():
+        np.testing.assert_allclose(scripted(inputs).numpy(), eager(inputs).numpy(), atol=1e-4)
+
+def test_model_is_loaded_once_and_shared(registry, monkeypatch):
+    """Test that concurrent first requests load a single shared instance"""
+    loads = []
+    load_entry = registry._load_entry
+    monkeypatch.setattr(registry, '_load_entry',
+                        lambda entry, device: loads.append(entry) or load_entry(entry, device))
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(registry.load('exercise_classifier')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1
+    assert all(model is models[0] for model in models)
+
+def test_tampered_torchscript_is_refused(tmp_path, registry):
+    """Test that a TorchScript file that no longer matches its checksum is not loaded"""
+    entry = registry.entry('exercise_classifier')
+    assert entry['torchscript_sha256']
+    with open(tmp_path / entry['torchscript'], 'ab') as f:
+        f.write(b'\0')
+    with pytest.raises(ValueError):
+        registry.load('exercise_classifier')
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+import app.core.model_tiers as model_tiers
+from app.core.model_tiers import LatencyMonitor, select_model_tier, tier_complexity
+from app.core.pose_detection import PoseDetector
+
+def test_tier_names():
+    """Test that tier names and complexity values resolve to MediaPipe complexities"""
+    assert [tier_complexity(tier) for tier in ('lite', 'full', 'heavy')] == [0, 1, 2]
+    assert tier_complexity(1) == 1
+    with pytest.raises(ValueError):
+        tier_complexity('ultra')
+
+def test_selects_heaviest_tier_within_budget(monkeypatch):
+    """Test that auto selection steps down until a tier fits the budget"""
+    latency = {'heavy': 120.0, 'full': 40.0, 'lite': 15.0}
+    monkeypatch.setattr(model_tiers, 'benchmark_tier',
+                        lambda tier, frame, iterations: [latency[tier]] * iterations)
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    assert select_model_tier(50, frame) == 'full'
+    assert select_model_tier(200, frame) == 'heavy'
+    assert select_model_tier(5, frame) == 'lite'
+
+def test_selection_without_pose_uses_default(monkeypatch):
+    """Test that a benchmark image without a pose falls back to the default tier"""
+    monkeypatch.setattr(model_tiers, 'benchmark_tier', lambda tier, frame, iterations: None)
+    assert select_model_tier(50, np.zeros((64, 64, 3), dtype=np.uint8)) == model_tiers.DEFAULT_TIER
+    assert select_model_tier(50) == model_tiers.DEFAULT_TIER
+
+def test_auto_without_benchmark_image_keeps_fallback(monkeypatch):
+    """Test that auto without a benchmark image resolves to each caller's previous model"""
+    monkeypatch.setattr(model_tiers.Config, 'POSE_BENCHMARK_IMAGE', None)
+    model_tiers._benchmarked_tier.cache_clear()
+    try:
+        assert model_tiers.resolve_model_complexity('auto') == 1
+        assert model_tiers.resolve_model_complexity('auto', 'heavy') == 2
+        assert model_tiers.resolve_model_complexity('lite', 'heavy') == 0
+    finally:
+        model_tiers._benchmarked_tier.cache_clear()
+
+def test_latency_monitor():
+    """Test that the monitor waits for enough samples before judging p95"""
+    monitor = LatencyMonitor(budget_ms=10, min_samples=5)
+    for _ in range(4):
+        monitor.record(0.020)
+    assert not monitor.over_budget()
+    monitor.record(0.020)
+    assert monitor.over_budget()
+    monitor.reset()
+    assert not monitor.over_budget()
+
+def test_detector_steps_down_when_over_budget():
+    """Test that a detector over its latency budget switches to a lighter model"""
+    detector = PoseDetector(static_image_mode=True, model_complexity='full', latency_budget_ms=1e-6)
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    for _ in range(detector.latency_monitor.min_samples):
+        with pytest.raises(ValueError):
+            detector.detect_landmarks(frame)
+    assert detector.model_complexity == 0
+
+def test_latency_monitor_headroom(monkeypatch):
+    """Test that stepping back up needs a full window well under budget and a cooldown"""
+    now = [0.0]
+    monkeypatch.setattr(model_tiers.time, 'monotonic', lambda: now[0])
+    monitor = LatencyMonitor(budget_ms=10, window=5, min_samples=5, step_up_after_s=30)
+    for _ in range(5):
+        monitor.record(0.002)
+    assert not monitor.has_headroom()
+    now[0] = 31.0
+    assert monitor.has_headroom()
+    monitor.record(0.008)
+    assert not monitor.has_headroom()
+
+def test_detector_steps_back_up_to_configured_tier():
+    """Test that a detector with headroom returns to its configured tier and no further"""
+    detector = PoseDetector(static_image_mode=True, model_complexity='full', latency_budget_ms=1e9)
+    detector.set_model_complexity('lite')
+    detector.latency_monitor.step_up_after_s = 0
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    for _ in range(2 * detector.latency_monitor._samples.maxlen + 1):
+        with pytest.raises(ValueError):
+            detector.detect_landmarks(frame)
+    assert detector.model_complexity == 1
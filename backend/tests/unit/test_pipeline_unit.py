@@ -0,0 +1,126 @@
+import threading
+import cv2
+import numpy as np
+from app.core.pipeline import LatestFrameQueue, StageStats, format_stage_report
+from app.core.realtime_pose_tracker import RealtimePoseTracker
+
+def test_latest_frame_wins():
+    """Test that a full queue drops the oldest frame instead of blocking"""
+    queue = LatestFrameQueue(maxsize=1)
+    for frame in range(3):
+        queue.put(frame)
+    assert queue.get(timeout=0) == 2
+    assert queue.dropped == 2
+    assert queue.get(timeout=0) is None
+
+def test_close_wakes_consumer():
+    """Test that closing the queue releases a blocked get"""
+    queue = LatestFrameQueue()
+    result = []
+    consumer = threading.Thread(target=lambda: result.append(queue.get()))
+    consumer.start()
+    queue.close()
+    consumer.join(timeout=1)
+    assert not consumer.is_alive() and result == [None]
+
+def test_blocking_queue_waits_for_room():
+    """Test that a blocking queue holds the producer back instead of dropping frames"""
+    queue = LatestFrameQueue(maxsize=1, block=True)
+    producer = threading.Thread(target=lambda: [queue.put(frame) for frame in range(3)])
+    producer.start()
+    received = [queue.get(timeout=1) for _ in range(3)]
+    producer.join(timeout=1)
+    assert received == [0, 1, 2] and queue.dropped == 0
+
+def test_close_releases_blocked_producer():
+    """Test that closing a full blocking queue releases a waiting put"""
+    queue = LatestFrameQueue(maxsize=1, block=True)
+    queue.put(0)
+    producer = threading.Thread(target=queue.put, args=(1,))
+    producer.start()
+    queue.close()
+    producer.join(timeout=1)
+    assert not producer.is_alive()
+    assert queue.get(timeout=0) == 0 and queue.get(timeout=0) is None
+
+def test_stage_stats():
+    """Test FPS and latency over the rolling window"""
+    stats = StageStats('inference')
+    for i in range(11):
+        stats.record(i * 0.1, i * 0.1 + 0.02)
+    snapshot = stats.snapshot()
+    assert np.isclose(snapshot['fps'], 10)
+    assert np.isclose(snapshot['mean_ms'], 20)
+    assert snapshot['count'] == 11
+    assert 'inference' in format_stage_report([stats])
+
+def write_clip(path, frames=5):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 64))
+    for _ in range(frames):
+        writer.write(np.zeros((64, 64, 3), dtype=np.uint8))
+    writer.release()
+    return path
+
+def test_pipeline_run(tmp_path, monkeypatch):
+    """Test that a recording flows through capture, inference and render threads headless"""
+    import app.core.realtime_pose_tracker as tracker_module
+    path = write_clip(str(tmp_path / 'clip.avi'))
+
+    def no_window(*args):
+        raise AssertionError("headless run opened a window")
+    monkeypatch.setattr(tracker_module.cv2, 'imshow', no_window)
+    monkeypatch.setattr(tracker_module.cv2, 'waitKey', no_window)
+
+    class NoPoseDetector:
+        def __init__(self, **kwargs):
+            pass
+
+        def detect_landmarks(self, frame):
+            raise ValueError("No pose detected in the image")
+    monkeypatch.setattr(tracker_module, 'PoseDetector', NoPoseDetector)
+
+    tracker = RealtimePoseTracker()
+    tracker.run(path, display=False)
+
+    # A recording is not live, so no frame may be dropped between the stages
+    for stage in RealtimePoseTracker.STAGES:
+        assert tracker.stage_stats[stage].count == 5
+
+def test_pipeline_run_ends_on_inference_error(tmp_path, monkeypatch):
+    """Test that a crashing inference stage ends the run instead of hanging it"""
+    import app.core.realtime_pose_tracker as tracker_module
+    path = write_clip(str(tmp_path / 'clip.avi'))
+
+    class BrokenDetector:
+        def __init__(self, **kwargs):
+            pass
+
+        def detect_landmarks(self, frame):
+            raise RuntimeError("graph crashed")
+    monkeypatch.setattr(tracker_module, 'PoseDetector', BrokenDetector)
+    monkeypatch.setattr(threading, 'excepthook', lambda args: None)
+
+    tracker = RealtimePoseTracker()
+    runner = threading.Thread(target=tracker.run, args=(path,), kwargs={'display': False})
+    runner.start()
+    runner.join(timeout=10)
+    assert not runner.is_alive()
+    assert tracker._stop.is_set()
+
+def test_set_exercise_applies_on_inference_thread(monkeypatch):
+    """Test that an exercise switch waits for the inference thread to pick it up"""
+    import app.core.realtime_pose_tracker as tracker_module
+    monkeypatch.setattr(tracker_module, 'PoseDetector', lambda **kwargs: None)
+    tracker = RealtimePoseTracker()
+    tracker.rep_count, tracker.rep_phase = 3, 'bottom'
+    tracker.rep_counters = {'squat': object()}
+    tracker.feedback_differ.update(['Try going lower'], timestamp=0)
+    tracker.feedback_differ.update(['Try going lower'], timestamp=1)
+
+    tracker.set_exercise('plank')
+    assert tracker.current_exercise == 'squat' and tracker.rep_count == 3
+    assert tracker.feedback_differ.messages() == ['Try going lower']
+    tracker._apply_pending_exercise()
+    assert tracker.current_exercise == 'plank'
+    assert tracker.feedback_differ.messages() == []
+    assert tracker.rep_count == 0 and tracker.rep_phase is None and tracker.rep_counters == {}
@@ -125,4 +125,29 @@ def test_exercise_switching(pose_detector):
     plank_landmarks[15] = type('Landmark', (), {'x': 0.5, 'y': 0.5})()
     plank_feedback = pose_detector.validate_form(plank_landmarks, "plank")
 
-    assert squat_feedback != plank_feedback 
\ No newline at end of file
+    assert squat_feedback != plank_feedback 
+
+def test_batch_landmark_detection(pose_detector):
+    """Test batched landmark detection on stacked and listed frames"""
+    frames = np.zeros((3, 120, 160, 3), dtype=np.uint8)
+
+    stacked = pose_detector.detect_landmarks_batch(frames)
+    assert stacked.shape == (3, 33, 4)
+    assert stacked.dtype == np.float32
+
+    # Blank frames contain no pose, so every row is NaN rather than an error
+    listed = pose_detector.detect_landmarks_batch(list(frames))
+    assert listed.shape == (3, 33, 4)
+    assert np.isnan(listed).all()
+
+def test_batch_landmark_detection_edge_cases(pose_detector):
+    """Test that an empty batch returns no rows and a bare frame is rejected"""
+    empty = pose_detector.detect_landmarks_batch(np.zeros((0, 120, 160, 3), dtype=np.uint8))
+    assert empty.shape == (0, 33, 4) and empty.dtype == np.float32
+    assert pose_detector.detect_landmarks_batch([]).shape == (0, 33, 4)
+
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        pose_detector.detect_landmarks_batch(frame)
+    with pytest.raises(ValueError):
+        pose_detector.detect_landmarks_batch([frame[..., 0]])
@@ -0,0 +1,42 @@
+from app.core.rep_counter import RepCounter, update_rep_count
+
+def feed(counter, knee_angles):
+    return [counter.update({'left_hip': angle, 'right_hip': float('nan')}) for angle in knee_angles]
+
+def test_counts_full_reps_with_phases():
+    """Test that a rep is counted on the way back up, with phases along the way"""
+    counter = RepCounter('squat', debounce_frames=2)
+    states = feed(counter, [170, 140, 110, 100, 105, 130, 155, 160, 170])
+    assert [state['rep_phase'] for state in states] == [
+        'top', 'eccentric', 'eccentric', 'bottom', 'bottom', 'concentric', 'concentric', 'top', 'top']
+    assert [state['rep_completed'] for state in states].count(True) == 1
+    assert states[7]['rep_completed'] and states[-1]['reps'] == 1
+
+def test_hysteresis_ignores_jitter_and_partial_reps():
+    """Test that wobbling near a threshold and half squats do not count"""
+    counter = RepCounter('squat', debounce_frames=2)
+    feed(counter, [170, 148, 152, 149, 151, 130, 125, 140, 160, 170])
+    assert counter.reps == 0
+    assert counter.phase == 'top'
+
+def test_debounce_rejects_single_frame_spikes():
+    """Test that one mis-detected frame neither starts nor finishes a rep"""
+    counter = RepCounter('squat', debounce_frames=2)
+    feed(counter, [170, 90, 170, 170])
+    assert counter.reps == 0
+    feed(counter, [100, 100, 160, 110, 100, 160, 160])
+    assert counter.reps == 1
+
+def test_missing_angles_are_skipped():
+    """Test that frames without the joint keep the current state"""
+    counter = RepCounter('squat', debounce_frames=2)
+    feed(counter, [100, 100])
+    state = counter.update({})
+    assert state['rep_phase'] == 'bottom' and state['reps'] == 0
+
+def test_update_rep_count_creates_counters_per_exercise():
+    """Test that counters are created on first use and planks have none"""
+    counters = {}
+    assert update_rep_count(counters, 'plank', {'left_hip': 100}) is None
+    assert update_rep_count(counters, 'squat', {'left_hip': 100})['reps'] == 0
+    assert list(counters) == ['squat']
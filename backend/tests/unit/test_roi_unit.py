@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from app.core.roi import RoiCropper
+
+def person_landmarks(x0=0.4, y0=0.2, x1=0.6, y1=0.8):
+    """Landmarks spread over a box in normalized frame coordinates"""
+    landmarks = np.ones((33, 4), dtype=np.float32)
+    grid = np.linspace(0, 1, 33, dtype=np.float32)
+    landmarks[:, 0] = x0 + (x1 - x0) * grid
+    landmarks[:, 1] = y0 + (y1 - y0) * grid[::-1]
+    landmarks[:, 2] = 0.1
+    return landmarks
+
+def test_region_is_padded_square():
+    """Test that the region covers the person plus padding"""
+    roi = RoiCropper(padding=0.25)
+    roi.update(person_landmarks(), (1080, 1920, 3))
+    x0, y0, x1, y1 = roi.region
+    assert x0 <= 0.4 * 1920 and x1 >= 0.6 * 1920
+    assert y0 <= 0.2 * 1080 and y1 >= 0.8 * 1080
+    assert x1 - x0 == pytest.approx(0.6 * 1080 * 1.5, abs=2)
+    assert y1 - y0 == pytest.approx(x1 - x0, abs=2)
+
+def test_region_is_clipped_to_frame():
+    """Test that a person at the frame edge gets a region inside the frame"""
+    roi = RoiCropper(padding=0.25)
+    roi.update(person_landmarks(0.0, 0.0, 0.3, 0.5), (720, 1280, 3))
+    x0, y0, x1, y1 = roi.region
+    assert x0 == 0 and y0 == 0 and x1 <= 1280 and y1 <= 720
+
+def test_landmarks_round_trip_through_crop():
+    """Test that landmarks found in the crop map back to full-frame coordinates"""
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    expected = person_landmarks()
+    roi = RoiCropper()
+    roi.update(expected, frame.shape)
+    x0, y0, x1, y1 = roi.region
+    seen = []
+
+    def detect(image):
+        seen.append(image.shape)
+        # What the model would report for the same person inside the crop
+        landmarks = expected.copy()
+        landmarks[:, 0] = (expected[:, 0] * 1920 - x0) / (x1 - x0)
+        landmarks[:, 1] = (expected[:, 1] * 1080 - y0) / (y1 - y0)
+        landmarks[:, 2] = expected[:, 2] * 1920 / (x1 - x0)
+        return landmarks
+
+    landmarks = roi.detect(frame, detect)
+    np.testing.assert_allclose(landmarks, expected, atol=1e-5)
+    assert max(seen[0][:2]) == roi.input_size
+
+def test_falls_back_to_full_frame_on_tracking_loss():
+    """Test that a crop without a pose is retried on the whole frame"""
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    roi = RoiCropper()
+    roi.update(person_landmarks(), frame.shape)
+    seen = []
+
+    def detect(image):
+        seen.append(image.shape)
+        if image.shape != frame.shape:
+            raise ValueError("No pose detected in the image")
+        return person_landmarks(0.1, 0.1, 0.3, 0.5)
+
+    landmarks = roi.detect(frame, detect)
+    assert seen[-1] == frame.shape and len(seen) == 2
+    assert landmarks[0, 0] == pytest.approx(0.1)
+    assert roi.region[0] < 0.3 * 1280
+
+def test_no_region_without_visible_pose():
+    """Test that low-visibility landmarks leave the next frame uncropped"""
+    landmarks = person_landmarks()
+    landmarks[:, 3] = 0.1
+    roi = RoiCropper()
+    roi.update(landmarks, (720, 1280, 3))
+    assert roi.region is None
+
+def test_region_holds_until_person_nears_edge():
+    """Test that small movements keep the region and larger ones move it"""
+    roi = RoiCropper(padding=0.25)
+    roi.update(person_landmarks(), (1080, 1920, 3))
+    region = roi.region
+    roi.update(person_landmarks(0.41, 0.21, 0.61, 0.81), (1080, 1920, 3))
+    assert roi.region == region
+    roi.update(person_landmarks(0.55, 0.2, 0.75, 0.8), (1080, 1920, 3))
+    assert roi.region != region
+
+def test_reset_when_input_changes():
+    """Test that the tracking graph is reset only when its input image changes geometry"""
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    roi = RoiCropper()
+    resets = []
+    found = [True, True, False, True]
+
+    def detect(image):
+        if not found.pop(0):
+            raise ValueError("No pose detected in the image")
+        return person_landmarks(0.3, 0.3, 0.6, 0.6)
+
+    roi.detect(frame, detect, lambda: resets.append('reset'))  # Full frame, as before
+    assert resets == []
+    roi.detect(frame, detect, lambda: resets.append('reset'))  # Into the crop
+    assert resets == ['reset']
+    roi.detect(frame, detect, lambda: resets.append('reset'))  # Lost in the crop, back to the full frame
+    assert resets == ['reset'] * 2
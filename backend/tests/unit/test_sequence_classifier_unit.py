@@ -0,0 +1,110 @@
+import os
+import time
+import numpy as np
+import pytest
+from app.core import sequence_classifier
+from app.core.sequence_classifier import ExerciseClassifier, LandmarkWindow, window_features
+
+def _pose(exercise, rng, frames=30):
+    """Synthetic (T, 33, 4) window: a horizontal body for planks, an upright one bobbing for squats."""
+    landmarks = np.zeros((frames, 33, 4))
+    landmarks[..., 3] = 1.0
+    base = rng.uniform(0.3, 0.7, size=2)
+    t = np.linspace(0, 2 * np.pi, frames)
+    for i in range(33):
+        offset = rng.normal(0, 0.01, size=2)
+        if exercise == 'plank':
+            position = base + [0.4 * (i / 33 - 0.5), 0.02 * np.sin(i)] + offset
+            landmarks[:, i, :2] = position
+        else:
+            depth = 0.1 * (1 - np.cos(t)) if i < 25 else 0
+            landmarks[:, i, 0] = base[0] + 0.02 * np.sin(i) + offset[0]
+            landmarks[:, i, 1] = base[1] + 0.4 * (i / 33 - 0.5) + offset[1] + depth
+    return landmarks
+
+@pytest.fixture
+def classifier():
+    rng = np.random.default_rng(0)
+    labels = ['plank', 'squat'] * 20
+    windows = [_pose(label, rng) for label in labels]
+    # Single frames too, as load_dataset_windows provides them
+    features = np.stack([window_features(w) for w in windows] + [window_features(w[0]) for w in windows])
+    labels = labels * 2
+    return ExerciseClassifier(['plank', 'squat']).fit(features, labels)
+
+def test_classifies_windows_and_single_frames(classifier):
+    """Test that the classifier separates planks from squats from windows and single frames"""
+    rng = np.random.default_rng(1)
+    for exercise in ('plank', 'squat'):
+        window = _pose(exercise, rng)
+        label, confidence = classifier.classify(window)
+        assert label == exercise and confidence > 0.9
+        assert classifier.classify(window[0])[0] == exercise
+
+def test_missing_landmarks_do_not_break_features(classifier):
+    """Test that invisible landmarks and frames without a pose become NaN features, not errors"""
+    window = _pose('plank', np.random.default_rng(2))
+    window[:, 25:, 3] = 0.0
+    window[5] = np.nan
+    assert window_features(window).shape == (sequence_classifier.NUM_FEATURES,)
+    assert classifier.classify(window)[0] == 'plank'
+
+def test_save_load_round_trip(tmp_path, classifier):
+    """Test that a saved classifier predicts exactly like the original"""
+    path = str(tmp_path / 'classifier.npz')
+    classifier.save(path)
+    loaded = ExerciseClassifier.load(path)
+    features = window_features(_pose('squat', np.random.default_rng(3)))
+    assert loaded.classes == classifier.classes
+    np.testing.assert_allclose(loaded.predict_proba(features), classifier.predict_proba(features))
+
+def test_classifies_a_window_in_under_a_millisecond(classifier):
+    """Test that classification is cheap enough to run on every frame"""
+    window = _pose('squat', np.random.default_rng(4))
+    classifier.classify(window)
+    start = time.perf_counter()
+    for _ in range(100):
+        classifier.classify(window)
+    assert (time.perf_counter() - start) / 100 < 1e-3
+
+def test_landmark_window_keeps_recent_frames():
+    """Test that the window holds at most ``size`` frames, newest last"""
+    window = LandmarkWindow(size=3)
+    for i in range(5):
+        stacked = window.append(np.full((33, 4), i, dtype=np.float32))
+    assert stacked.shape == (3, 33, 4)
+    assert stacked[:, 0, 0].tolist() == [2, 3, 4]
+    window.clear()
+    assert len(window.frames) == 0
+
+def test_identify_exercise_uses_installed_classifier(monkeypatch, classifier):
+    """Test that identify_exercise defers to the classifier and returns 'unknown' when unsure"""
+    from app.config import Config
+    from app.core.pose_detection import PoseDetector
+    monkeypatch.setattr('app.core.pose_detection.load_exercise_classifier', lambda: classifier)
+    detector = PoseDetector(static_image_mode=True)
+    try:
+        frame = _pose('squat', np.random.default_rng(5))[0]
+        assert detector.identify_exercise(frame) == 'squat'
+        monkeypatch.setattr(Config, 'EXERCISE_MIN_CONFIDENCE', 1.01)
+        assert detector.identify_exercise(frame) == 'unknown'
+    finally:
+        detector.close()
+
+def test_missing_classifier_file_falls_back(tmp_path):
+    """Test that no classifier is loaded when the file does not exist"""
+    assert sequence_classifier.load_exercise_classifier(str(tmp_path / 'missing.npz')) is None
+
+def test_classifier_installed_or_retrained_later_is_loaded(tmp_path, classifier):
+    """Test that the loader picks up a classifier file that appears or changes after startup"""
+    path = str(tmp_path / 'classifier.npz')
+    assert sequence_classifier.load_exercise_classifier(path) is None
+    classifier.save(path)
+    first = sequence_classifier.load_exercise_classifier(path)
+    assert first is not None
+    assert sequence_classifier.load_exercise_classifier(path) is first
+
+    classifier.save(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert sequence_classifier.load_exercise_classifier(path) is not first
@@ -0,0 +1,39 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token
+from flask_jwt_extended.exceptions import RevokedTokenError, UserLookupError, WrongTokenError
+from app.api.pose_detection import authenticate_session_token
+
+@pytest.fixture
+def jwt_app():
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'session-test-secret-key-of-sufficient-length'
+    return app, JWTManager(app)
+
+def test_access_token_opens_session(jwt_app):
+    """Test that an access token authenticates a WebSocket session"""
+    app, _ = jwt_app
+    with app.app_context():
+        assert authenticate_session_token(create_access_token(identity='1'))['sub'] == '1'
+
+def test_refresh_token_is_refused(jwt_app):
+    """Test that the long-lived refresh token cannot open a session"""
+    app, _ = jwt_app
+    with app.app_context():
+        with pytest.raises(WrongTokenError):
+            authenticate_session_token(create_refresh_token(identity='1'))
+
+def test_blocklist_and_user_lookup_apply(jwt_app):
+    """Test that the same revocation and user checks as REST endpoints run"""
+    app, jwt = jwt_app
+    revoked = set()
+    jwt.token_in_blocklist_loader(lambda header, payload: payload['jti'] in revoked)
+    jwt.user_lookup_loader(lambda header, payload: None if payload['sub'] == 'deleted' else payload['sub'])
+    with app.app_context():
+        token = create_access_token(identity='1')
+        authenticate_session_token(token)
+        revoked.add(authenticate_session_token(token)['jti'])
+        with pytest.raises(RevokedTokenError):
+            authenticate_session_token(token)
+        with pytest.raises(UserLookupError):
+            authenticate_session_token(create_access_token(identity='deleted'))
@@ -0,0 +1,50 @@
+import cv2
+import numpy as np
+from app.core.skeleton import BODY_CONNECTIONS, SkeletonRenderer, incorrect_joint_mask
+
+RED, GREEN = (0, 0, 255), (0, 255, 0)
+
+def body_landmarks(seed=0):
+    landmarks = np.ones((33, 4), dtype=np.float32)
+    landmarks[:, :2] = np.random.default_rng(seed).uniform(0.1, 0.9, (33, 2))
+    return landmarks
+
+def test_matches_per_joint_drawing():
+    """Test that the batched skeleton draws what circles and lines per joint would"""
+    landmarks = body_landmarks()
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    SkeletonRenderer().draw(frame, landmarks)
+
+    expected = np.zeros_like(frame)
+    pixels = np.rint(landmarks[:, :2] * (160, 120)).astype(int)
+    for start, end in BODY_CONNECTIONS:
+        cv2.line(expected, tuple(pixels[start]), tuple(pixels[end]), GREEN, 2)
+    for joint in range(11, 33):
+        cv2.circle(expected, tuple(pixels[joint]), 5, GREEN, -1)
+    differing = (frame != expected).any(axis=2)
+    assert differing.mean() < 0.01
+    assert (frame[..., 1] > 0).sum() > 0
+
+def test_incorrect_points_are_drawn_in_red():
+    """Test that named and coordinate incorrect_points color their joints and bones"""
+    landmarks = body_landmarks()
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    SkeletonRenderer(radius=2).draw(frame, landmarks, ['elbows', landmarks[27, :2].tolist()])
+    pixels = SkeletonRenderer.to_pixels(landmarks, frame.shape)
+    for joint in (13, 14, 27):
+        x, y = pixels[joint]
+        assert tuple(frame[y, x]) == RED
+    mask = incorrect_joint_mask(['elbows', landmarks[27, :2].tolist()], landmarks)
+    assert np.flatnonzero(mask).tolist() == [13, 14, 27]
+
+def test_missing_and_hidden_joints_are_skipped():
+    """Test that NaN joints and joints below min_visibility draw nothing"""
+    landmarks = np.full((33, 4), np.nan, dtype=np.float32)
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    SkeletonRenderer().draw(frame, landmarks)
+    assert not frame.any()
+
+    landmarks = body_landmarks()
+    landmarks[:, 3] = 0.1
+    SkeletonRenderer(min_visibility=0.5).draw(frame, landmarks, ['depth'])
+    assert not frame.any()
@@ -0,0 +1,62 @@
+import time
+import numpy as np
+from app.core.smoothing import LandmarkSmoother, OneEuroFilter
+
+def noisy_landmarks(rng, center=0.5, noise=0.01):
+    landmarks = np.empty((33, 4), dtype=np.float32)
+    landmarks[:, :3] = center + rng.normal(0, noise, size=(33, 3))
+    landmarks[:, 3] = rng.uniform(0.5, 1.0, size=33)
+    return landmarks
+
+def test_reduces_jitter_of_still_landmarks():
+    """Test that a still person's landmarks jitter far less after smoothing"""
+    rng = np.random.default_rng(0)
+    smoother = LandmarkSmoother(min_cutoff=1.0, beta=10.0)
+    raw, smoothed = [], []
+    for i in range(90):
+        frame = noisy_landmarks(rng)
+        raw.append(frame)
+        smoothed.append(smoother.smooth(frame, timestamp=i / 30))
+    raw, smoothed = np.stack(raw[30:]), np.stack(smoothed[30:])
+    assert np.diff(smoothed[..., :2], axis=0).std() < 0.3 * np.diff(raw[..., :2], axis=0).std()
+    # Visibility is not filtered
+    np.testing.assert_array_equal(smoothed[..., 3], raw[..., 3])
+
+def test_follows_fast_motion_with_little_lag():
+    """Test that a fast-moving joint is tracked closely thanks to the speed-adaptive cutoff"""
+    one_euro = OneEuroFilter(min_cutoff=1.0, beta=10.0)
+    still = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+    for i in range(30):
+        position = np.array([0.02 * i], dtype=np.float32)  # 0.6 units per second
+        adaptive, fixed = one_euro(position, i / 30), still(position, i / 30)
+    assert abs(adaptive[0] - position[0]) < 0.5 * abs(fixed[0] - position[0])
+
+def test_missing_values_and_gaps():
+    """Test that NaN joints keep their state and a long gap restarts the filter"""
+    one_euro = OneEuroFilter(min_cutoff=1.0, beta=0.0, max_gap=0.5)
+    one_euro(np.array([0.0, 0.0]), 0.0)
+    out = one_euro(np.array([np.nan, 1.0]), 1 / 30)
+    assert np.isnan(out[0]) and 0 < out[1] < 1
+    assert one_euro(np.array([0.5, 0.5]), 2 / 30)[0] < 0.5
+    np.testing.assert_allclose(one_euro(np.array([0.9, 0.9]), 2.0), [0.9, 0.9], rtol=1e-6)
+
+def test_smoothing_costs_microseconds():
+    """Test that smoothing a frame is cheap enough for every live frame"""
+    rng = np.random.default_rng(1)
+    smoother = LandmarkSmoother()
+    frames = [noisy_landmarks(rng) for _ in range(200)]
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        smoother.smooth(frame, timestamp=i / 30)
+    assert (time.perf_counter() - start) / len(frames) < 500e-6
+
+def test_detector_uses_one_landmark_filter(monkeypatch):
+    """Test that MediaPipe's landmark filter is off when the detector smooths itself"""
+    import mediapipe as mp
+    from app.core.pose_detection import PoseDetector
+    created = []
+    monkeypatch.setattr(mp.solutions.pose, 'Pose', lambda **options: created.append(options))
+    PoseDetector(smooth_landmarks=True)
+    PoseDetector(smooth_landmarks=False)
+    PoseDetector(static_image_mode=True, smooth_landmarks=True)
+    assert [options['smooth_landmarks'] for options in created] == [False, True, True]
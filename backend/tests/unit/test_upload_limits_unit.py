@@ -0,0 +1,31 @@
+import pytest
+from flask import Flask, request
+from app.utils.upload_limits import UploadLimitRequest, upload_limit
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.request_class = UploadLimitRequest
+    app.config.update(MAX_CONTENT_LENGTH=10, VIDEO_MAX_UPLOAD_BYTES=100)
+
+    @app.route('/upload', methods=['POST'])
+    def upload():
+        return str(len(request.stream.read()))
+
+    @app.route('/video', methods=['POST'])
+    @upload_limit('VIDEO_MAX_UPLOAD_BYTES')
+    def video():
+        return str(len(request.stream.read()))
+
+    return app.test_client()
+
+def test_default_limit_applies(client):
+    """Test that views without their own limit keep MAX_CONTENT_LENGTH"""
+    assert client.post('/upload', data=b'x' * 5).status_code == 200
+    assert client.post('/upload', data=b'x' * 50).status_code == 413
+
+def test_view_limit_overrides_default(client):
+    """Test that a view with upload_limit accepts bodies up to its own limit"""
+    response = client.post('/video', data=b'x' * 50)
+    assert response.status_code == 200 and response.data == b'50'
+    assert client.post('/video', data=b'x' * 500).status_code == 413
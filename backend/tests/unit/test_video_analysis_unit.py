@@ -0,0 +1,98 @@
+import random
+import cv2
+import numpy as np
+import pytest
+from app.core.pose_detection import PoseDetector
+from app.core.video_analysis import clip_start, read_clip, score_video
+
+def squat_landmarks(knee_angle):
+    """Upright torso and straight arms with the given hip-knee-ankle angle"""
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    landmarks[:, 3] = 1
+    landmarks[11, :2] = (0.5, 0.2)   # Left shoulder
+    landmarks[13, :2] = (0.5, 0.35)  # Left elbow
+    landmarks[15, :2] = (0.5, 0.5)   # Left wrist
+    landmarks[23, :2] = (0.5, 0.5)   # Left hip
+    landmarks[25, :2] = (0.5, 0.7)   # Left knee
+    radians = np.radians(180 - knee_angle)
+    landmarks[27, :2] = (0.5 + 0.2 * np.sin(radians), 0.7 + 0.2 * np.cos(radians))  # Left ankle
+    return landmarks
+
+class FakeCapture:
+    def __init__(self, count):
+        self.count = count
+        self.read_frames = 0
+
+    def get(self, prop):
+        return 10.0
+
+    def read(self):
+        if self.read_frames == self.count:
+            return False, None
+        self.read_frames += 1
+        return True, np.zeros((8, 8, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+def test_score_video_counts_squat_reps():
+    """Test that a video is summarized with per-frame landmarks and squat reps"""
+    knee_angles = [170, 140, 100, 90, 130, 170, None, 165, 95, 90, 160, 170]
+    sequence = iter(knee_angles)
+    detector = PoseDetector(static_image_mode=True)
+
+    def detect_landmarks(frame):
+        angle = next(sequence)
+        if angle is None:
+            raise ValueError("No pose detected in the image")
+        return squat_landmarks(angle)
+    detector.detect_landmarks = detect_landmarks
+
+    landmarks, summary = score_video(FakeCapture(len(knee_angles)), 'squat', detector)
+    assert landmarks.shape == (12, 33, 4)
+    assert np.isnan(landmarks[6]).all() and not np.isnan(landmarks[7]).any()
+    assert summary['frames'] == 12
+    assert summary['pose_frames'] == 11
+    assert summary['reps'] == 2
+    assert summary['duration_s'] == 1.2
+    assert 'Not in squat position' in summary['feedback']
+
+@pytest.fixture
+def video_path(tmp_path):
+    """Ten frames whose brightness encodes the frame index"""
+    path = str(tmp_path / 'clip.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (32, 24))
+    for i in range(10):
+        writer.write(np.full((24, 32, 3), i * 25, dtype=np.uint8))
+    writer.release()
+    return path
+
+def frame_indices(clip, frames_read):
+    return [int(round(frame.mean() / 25)) for frame in clip[:frames_read]]
+
+def test_clip_start():
+    """Test that windows stay inside the video"""
+    random.seed(0)
+    starts = {clip_start(10, length=4, stride=2) for _ in range(50)}
+    assert starts == {0, 1, 2, 3}
+    assert clip_start(10, length=4, stride=2, random_offset=False) == 1
+    assert clip_start(3, length=4) == 0
+
+def test_read_clip_decodes_window(video_path):
+    """Test that only the strided window is decoded into a uint8 buffer"""
+    cap = cv2.VideoCapture(video_path)
+    clip, frames_read = read_clip(cap, start=3, length=3, stride=2)
+    cap.release()
+    assert clip.shape == (3, 24, 32, 3) and clip.dtype == np.uint8
+    assert frames_read == 3
+    assert frame_indices(clip, frames_read) == [3, 5, 7]
+
+def test_read_clip_pads_short_video(video_path):
+    """Test that a window running past the end repeats the last frame"""
+    buffer = np.zeros((4, 24, 32, 3), dtype=np.uint8)
+    cap = cv2.VideoCapture(video_path)
+    clip, frames_read = read_clip(cap, start=6, length=4, stride=2, out=buffer)
+    cap.release()
+    assert clip is buffer
+    assert frames_read == 2
+    assert frame_indices(clip, 4) == [6, 8, 8, 8]